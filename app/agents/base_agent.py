@@ -2,21 +2,59 @@
 Base class for all AI agents
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence
+from app.agents.step_graph import Checkpoint, Step, StepGraph
+from app.agents.tools import ToolRegistry, build_travel_tools
+from app.core.config import settings
 from app.services.openai_service import OpenAIService
-from app.services.memory_service import MemoryService
+from app.services.memory_services import MemoryService
 
 class BaseAgent(ABC):
     def __init__(self, user_id: int = None):
         self.user_id = user_id
         self.ai = OpenAIService()
         self.memory = MemoryService(user_id)
+        # Set by the task runner so a retried task resumes where it stopped
+        self.checkpoint: Optional[Checkpoint] = None
+        self.tools: ToolRegistry = build_travel_tools(user_id, self.memory)
     
     @abstractmethod
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the agent's main task"""
         pass
     
+    async def run_steps(self, steps: Sequence[Step]) -> StepGraph:
+        """Run a step graph: independent steps concurrently, background steps detached"""
+        graph = StepGraph(steps, checkpoint=self.checkpoint)
+        await graph.run()
+        return graph
+    
+    async def run_with_tools(self, prompt: str, system_prompt: str = None, max_rounds: int = None) -> str:
+        """Let the model call tools until it answers; each round's calls run concurrently"""
+        messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        messages.append({"role": "user", "content": prompt})
+        specs = self.tools.specs()
+        
+        for _ in range(max_rounds or settings.agent_max_tool_rounds):
+            message = await self.ai.chat_with_tools(messages, specs)
+            if not message.tool_calls:
+                return message.content or ""
+            messages.append({
+                "role": "assistant",
+                "content": message.content,
+                "tool_calls": [
+                    {"id": call.id, "type": "function",
+                     "function": {"name": call.function.name, "arguments": call.function.arguments}}
+                    for call in message.tool_calls
+                ]
+            })
+            messages.extend(await self.tools.run_calls(message.tool_calls))
+        
+        # Out of rounds: ask for an answer from what the tools returned
+        messages.append({"role": "user", "content": "Answer now using the tool results above."})
+        message = await self.ai.chat_with_tools(messages, specs, tool_choice="none")
+        return message.content or ""
+    
     async def plan(self, goal: str) -> List[str]:
         """Break down goal into steps"""
         prompt = f"Break this goal into steps: {goal}"
@@ -2,9 +2,11 @@
 Calendar and scheduling agent
 """
 from app.agents.base_agent import BaseAgent
+from app.core.config import settings
 from app.services.calendar_service import CalendarService
-from datetime import datetime
-from typing import Dict, List
+from app.services.rescheduler import ConflictResolver
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
 class CalendarAgent(BaseAgent):
     def __init__(self, user_id: int = None):
@@ -20,18 +22,25 @@ class CalendarAgent(BaseAgent):
         elif action == "find_free_time":
             return await self.find_free_time(task)
         elif action == "reschedule_conflicts":
-            return await self.reschedule_conflicts()
+            return await self.reschedule_conflicts(task)
         else:
             return {"error": f"Unknown action: {action}"}
     
     async def schedule_meeting(self, task: Dict) -> Dict:
         """Schedule a meeting based on preferences"""
-        participants = task.get('participants', [])
+        invitees = task.get('participants', [])
+        # The organizer is on the event too, not just in the free-time search
+        participants = self._participants(invitees)
         duration = task.get('duration', 60)
         topic = task.get('topic', 'Meeting')
         
         # Find optimal time
         optimal_time = await self._find_optimal_time(participants, duration)
+        if optimal_time is None:
+            return {
+                "status": "no_time_found",
+                "error": f"No common free time in the next {settings.calendar_search_days} days"
+            }
         
         # Create event
         event = await self.calendar.create_event(
@@ -42,10 +51,90 @@ class CalendarAgent(BaseAgent):
         )
         
         # Send invites
-        await self.calendar.send_invites(event, participants)
+        await self.calendar.send_invites(event, invitees)
         
         return {
             "status": "scheduled",
             "event": event,
             "time": optimal_time.isoformat()
-        }
\ No newline at end of file
+        }
+    
+    async def find_free_time(self, task: Dict) -> Dict:
+        """Common free periods and the best meeting slots for the participants"""
+        participants = self._participants(task.get('participants', []))
+        duration = task.get('duration', 60)
+        start = self._parse_time(task.get('start')) or datetime.now()
+        end = self._parse_time(task.get('end')) or start + timedelta(days=settings.calendar_search_days)
+        
+        slots = self.calendar.engine.rank_slots(
+            participants, duration, start, end,
+            optional=task.get('optional', []),
+            work_hours=self._work_hours(),
+            limit=task.get('limit', 5)
+        )
+        free_periods = self.calendar.engine.free_slots(
+            participants, start, end, min_minutes=duration, work_hours=self._work_hours()
+        )
+        
+        return {
+            "status": "ok",
+            "slots": [
+                {**slot, "start": slot["start"].isoformat(), "end": slot["end"].isoformat()}
+                for slot in slots
+            ],
+            "free_periods": [
+                {"start": free_start.isoformat(), "end": free_end.isoformat()}
+                for free_start, free_end in free_periods
+            ]
+        }
+    
+    async def reschedule_conflicts(self, task: Dict) -> Dict:
+        """Move clashing events apart, starting from the given (or the user's upcoming) events"""
+        now = datetime.now()
+        resolver = ConflictResolver(
+            self.calendar,
+            horizon_days=settings.calendar_reschedule_horizon_days,
+            work_hours=self._work_hours(),
+            max_moves=settings.calendar_reschedule_max_moves,
+            not_before=now
+        )
+        event_ids = task.get('event_ids')
+        if not event_ids:
+            event_ids = resolver.find_conflicts(self.user_id, now, now + timedelta(days=settings.calendar_search_days))
+        
+        result = await resolver.resolve(event_ids)
+        
+        return {
+            "status": "partially_rescheduled" if result["unresolved"] else "rescheduled",
+            "moved": [
+                {**move, "from": move["from"].isoformat(), "to": move["to"].isoformat()}
+                for move in result["moved"]
+            ],
+            "unresolved": result["unresolved"]
+        }
+    
+    async def _find_optimal_time(self, participants: List, duration: int) -> Optional[datetime]:
+        """Start of the best-ranked slot in the search window, if any"""
+        start = datetime.now()
+        slots = self.calendar.engine.rank_slots(
+            self._participants(participants), duration, start,
+            start + timedelta(days=settings.calendar_search_days),
+            work_hours=self._work_hours(),
+            limit=1
+        )
+        return slots[0]["start"] if slots else None
+    
+    def _participants(self, participants: List) -> List:
+        """Requested participants plus the organizer"""
+        everyone = list(participants)
+        if self.user_id is not None and self.user_id not in everyone:
+            everyone.append(self.user_id)
+        return everyone
+    
+    def _work_hours(self) -> tuple:
+        return settings.calendar_work_start_hour, settings.calendar_work_end_hour
+    
+    def _parse_time(self, value) -> Optional[datetime]:
+        if value is None or isinstance(value, datetime):
+            return value
+        return datetime.fromisoformat(value)
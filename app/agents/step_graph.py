@@ -0,0 +1,146 @@
+"""
+Dependency-graph executor for agent steps
+
+An agent declares its work as steps that name the steps they depend on.
+Each step starts as soon as its dependencies finish, so independent steps
+(e.g. understanding the request and loading preferences) run concurrently.
+Steps can have a timeout. An optional step that fails or times out is
+skipped: its default value is passed on and the rest of the graph carries
+on. Background steps (e.g. writing memory) are started but not waited for.
+
+With a Checkpoint, each completed step's result is saved as it finishes
+and steps that already have a saved result are not run again, so a retry
+resumes after the last completed step.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+# Background steps outlive the request that started them; keep them referenced
+_background_tasks: Set[asyncio.Task] = set()
+
+
+@dataclass
+class Step:
+    name: str
+    func: Callable[..., Awaitable]  # called with the dependencies' results as keyword arguments
+    after: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    optional: bool = False  # on failure or timeout, pass `default` on instead of failing the run
+    default: Any = None
+    background: bool = False  # started when ready, never waited for
+
+
+class StepTimeout(asyncio.TimeoutError):
+    """A required step took longer than its timeout"""
+
+
+class Checkpoint:
+    """Results of completed steps; kept in memory here, subclasses persist them"""
+
+    def __init__(self, completed: Optional[Dict[str, Any]] = None):
+        self.completed: Dict[str, Any] = dict(completed or {})
+
+    async def save(self, name: str, result: Any, progress: int) -> None:
+        self.completed[name] = result
+
+
+class StepGraph:
+    def __init__(self, steps: Sequence[Step], checkpoint: Optional[Checkpoint] = None):
+        self.steps = {step.name: step for step in steps}
+        self.checkpoint = checkpoint
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}  # seconds per finished step
+        self.skipped: Dict[str, str] = {}  # optional step -> reason
+        self.resumed: List[str] = []  # steps taken from the checkpoint
+        self._validate()
+
+    def _validate(self) -> None:
+        for step in self.steps.values():
+            for dep in step.after:
+                if dep not in self.steps:
+                    raise ValueError(f"step '{step.name}' depends on unknown step '{dep}'")
+                if self.steps[dep].background:
+                    raise ValueError(f"step '{step.name}' can't depend on background step '{dep}'")
+
+        # Kahn's algorithm; anything left over is on a cycle
+        pending = {name: set(step.after) for name, step in self.steps.items()}
+        while True:
+            ready = [name for name, deps in pending.items() if not deps]
+            if not ready:
+                break
+            for name in ready:
+                del pending[name]
+            for deps in pending.values():
+                deps.difference_update(ready)
+        if pending:
+            raise ValueError(f"step graph has a cycle through: {', '.join(sorted(pending))}")
+
+    async def _run_step(self, step: Step, tasks: Dict[str, asyncio.Task]) -> Any:
+        inputs = {dep: await tasks[dep] for dep in step.after}
+        if self.checkpoint is not None and step.name in self.checkpoint.completed:
+            result = self.results[step.name] = self.checkpoint.completed[step.name]
+            self.resumed.append(step.name)
+            return result
+
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(step.func(**inputs), step.timeout)
+        except asyncio.TimeoutError:
+            if not step.optional:
+                raise StepTimeout(f"step '{step.name}' timed out after {step.timeout}s") from None
+            self.skipped[step.name] = f"timed out after {step.timeout}s"
+            result = step.default
+        except Exception as e:
+            if not step.optional:
+                raise
+            print(f"⚠️ Optional step '{step.name}' skipped: {e}")
+            self.skipped[step.name] = str(e) or type(e).__name__
+            result = step.default
+        self.timings[step.name] = time.perf_counter() - started
+        self.results[step.name] = result
+
+        # Skipped optional steps are retried next time, so they aren't saved
+        if self.checkpoint is not None and not step.background and step.name not in self.skipped:
+            await self.checkpoint.save(step.name, result, self._progress())
+        return result
+
+    def _progress(self) -> int:
+        """Percentage of foreground steps that have finished"""
+        foreground = [name for name, step in self.steps.items() if not step.background]
+        done = sum(1 for name in foreground if name in self.results)
+        return int(100 * done / len(foreground)) if foreground else 100
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every step; returns the results of the foreground steps"""
+        tasks: Dict[str, asyncio.Task] = {}
+        for step in self.steps.values():
+            tasks[step.name] = asyncio.create_task(self._run_step(step, tasks), name=f"step:{step.name}")
+
+        foreground = [task for name, task in tasks.items() if not self.steps[name].background]
+        try:
+            await asyncio.gather(*foreground)
+        except BaseException:
+            # A required step failed: nothing else is worth finishing
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        for name, task in tasks.items():
+            if self.steps[name].background:
+                _background_tasks.add(task)
+                task.add_done_callback(_background_done)
+        return self.results
+
+
+def _background_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"❌ Background {task.get_name()} failed: {task.exception()}")
+
+
+async def wait_for_background(timeout: Optional[float] = None) -> None:
+    """Wait for pending background steps (e.g. on shutdown, or in tests)"""
+    if _background_tasks:
+        await asyncio.wait(list(_background_tasks), timeout=timeout)
@@ -0,0 +1,249 @@
+"""
+Tool registry and parallel tool-calling runtime for agents
+
+Tools are described to the model as OpenAI function-calling specs. When
+the model asks for several tools in one turn, they are run concurrently,
+each with its own timeout, so a multi-tool turn costs the slowest tool
+rather than the sum. Results of cacheable tools are kept for a TTL, and
+identical calls that overlap share one execution. A failed or timed-out
+tool returns {"error": ...} to the model instead of failing the turn.
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.trip import Trip
+from app.services.flight_service import FlightService
+from app.services.hotel_service import HotelService
+
+
+@dataclass
+class Tool:
+    name: str
+    description: str
+    parameters: Dict[str, Any]  # JSON schema of the arguments
+    func: Callable[..., Awaitable[Any]]
+    timeout: Optional[float] = None  # defaults to settings.agent_io_step_timeout
+    cache_ttl: float = 0.0  # seconds; only for results that don't depend on the user
+
+    def spec(self) -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {"name": self.name, "description": self.description, "parameters": self.parameters}
+        }
+
+
+class ToolResultCache:
+    """LRU of tool results with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def set(self, key: Tuple[str, str], value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_tool_cache: Optional[ToolResultCache] = None
+
+
+def get_tool_cache() -> ToolResultCache:
+    """Cache shared by every agent's registry"""
+    global _tool_cache
+    if _tool_cache is None:
+        _tool_cache = ToolResultCache(settings.tool_cache_max_entries)
+    return _tool_cache
+
+
+def _call_parts(call: Any) -> Tuple[str, str, Union[str, Dict]]:
+    """(id, name, arguments) of an SDK tool call object or its dict form"""
+    if isinstance(call, dict):
+        function = call.get("function") or {}
+        return call.get("id", ""), function.get("name", ""), function.get("arguments") or "{}"
+    return call.id, call.function.name, call.function.arguments or "{}"
+
+
+class ToolRegistry:
+    def __init__(self, cache: Optional[ToolResultCache] = None):
+        self.tools: Dict[str, Tool] = {}
+        self.cache = cache if cache is not None else get_tool_cache()
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def register(self, tool: Tool) -> Tool:
+        self.tools[tool.name] = tool
+        return tool
+
+    def specs(self) -> List[Dict[str, Any]]:
+        return [tool.spec() for tool in self.tools.values()]
+
+    async def call(self, name: str, arguments: Union[str, Dict, None] = None) -> Any:
+        """Run one tool; errors come back as {"error": ...}"""
+        tool = self.tools.get(name)
+        if tool is None:
+            return {"error": f"Unknown tool: {name}"}
+        try:
+            args = json.loads(arguments) if isinstance(arguments, str) else dict(arguments or {})
+        except ValueError:
+            return {"error": f"Arguments for {name} are not valid JSON"}
+
+        if not tool.cache_ttl:
+            return await self._run(tool, args)
+
+        key = (name, json.dumps(args, sort_keys=True, default=str))
+        found, value = self.cache.get(key)
+        if found:
+            return value
+        # An identical call already running: wait for it instead of repeating it
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._run(tool, args)
+            if not (isinstance(result, dict) and "error" in result):
+                self.cache.set(key, result, tool.cache_ttl)
+            future.set_result(result)
+            return result
+        except BaseException:
+            # _run reports errors as results, so only cancellation gets here
+            future.cancel()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _run(self, tool: Tool, args: Dict) -> Any:
+        timeout = tool.timeout if tool.timeout is not None else settings.agent_io_step_timeout
+        try:
+            return await asyncio.wait_for(tool.func(**args), timeout)
+        except asyncio.TimeoutError:
+            return {"error": f"{tool.name} timed out after {timeout}s"}
+        except TypeError as e:
+            return {"error": f"Bad arguments for {tool.name}: {e}"}
+        except Exception as e:
+            print(f"❌ Tool {tool.name} failed: {e}")
+            return {"error": f"{tool.name} failed: {e}"}
+
+    async def run_calls(self, tool_calls: List[Any]) -> List[Dict[str, Any]]:
+        """Run every requested call concurrently; returns the "tool" messages in order"""
+        parts = [_call_parts(call) for call in tool_calls]
+        results = await asyncio.gather(*(self.call(name, arguments) for _, name, arguments in parts))
+        return [
+            {"role": "tool", "tool_call_id": call_id, "content": json.dumps(result, default=str)}
+            for (call_id, _, _), result in zip(parts, results)
+        ]
+
+
+def build_travel_tools(user_id: Optional[int], memory) -> ToolRegistry:
+    """Flight search, hotel search, memory lookup and trip save"""
+    registry = ToolRegistry()
+    flights = FlightService()
+    hotels = HotelService()
+
+    registry.register(Tool(
+        name="search_flights",
+        description="Search flights between two airports (IATA codes) on a date",
+        parameters={
+            "type": "object",
+            "properties": {
+                "origin": {"type": "string", "description": "IATA code, e.g. JFK"},
+                "destination": {"type": "string", "description": "IATA code, e.g. CDG"},
+                "departure_date": {"type": "string", "description": "YYYY-MM-DD"},
+                "return_date": {"type": "string", "description": "YYYY-MM-DD"},
+                "adults": {"type": "integer", "minimum": 1}
+            },
+            "required": ["origin", "destination", "departure_date"]
+        },
+        func=flights.search_flights,
+        cache_ttl=300
+    ))
+
+    registry.register(Tool(
+        name="search_hotels",
+        description="Search hotels in a city for the given dates",
+        parameters={
+            "type": "object",
+            "properties": {
+                "location": {"type": "string"},
+                "check_in": {"type": "string", "description": "YYYY-MM-DD"},
+                "check_out": {"type": "string", "description": "YYYY-MM-DD"},
+                "guests": {"type": "integer", "minimum": 1}
+            },
+            "required": ["location", "check_in", "check_out"]
+        },
+        func=hotels.search_hotels,
+        cache_ttl=300
+    ))
+
+    async def lookup_memory(query: str, limit: int = 5) -> List[Dict]:
+        return await memory.retrieve(query, limit=limit)
+
+    registry.register(Tool(
+        name="lookup_memory",
+        description="Look up what is remembered about the user (preferences, past trips)",
+        parameters={
+            "type": "object",
+            "properties": {"query": {"type": "string"}, "limit": {"type": "integer", "minimum": 1}},
+            "required": ["query"]
+        },
+        func=lookup_memory
+    ))
+
+    async def save_trip(destination: str, days: int, budget: float, itinerary: Any = None,
+                        preferences: Optional[Dict] = None) -> Dict:
+        db = SessionLocal()
+        try:
+            trip = Trip(
+                user_id=user_id,
+                destination=destination,
+                days=days,
+                budget=budget,
+                itinerary=json.dumps(itinerary or []),
+                preferences=preferences or {}
+            )
+            db.add(trip)
+            db.commit()
+            db.refresh(trip)
+            return {"saved": True, "trip_id": trip.id}
+        finally:
+            db.close()
+
+    registry.register(Tool(
+        name="save_trip",
+        description="Save a planned trip to the user's trips",
+        parameters={
+            "type": "object",
+            "properties": {
+                "destination": {"type": "string"},
+                "days": {"type": "integer", "minimum": 1},
+                "budget": {"type": "number"},
+                "itinerary": {"type": "array", "items": {"type": "object"}},
+                "preferences": {"type": "object"}
+            },
+            "required": ["destination", "days", "budget"]
+        },
+        func=save_trip
+    ))
+    return registry
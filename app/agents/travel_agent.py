@@ -1,7 +1,10 @@
 """
 Travel planning agent
 """
+import asyncio
 from app.agents.base_agent import BaseAgent
+from app.agents.step_graph import Step
+from app.core.config import settings
 from app.services.travel_service import TravelService
 from typing import Dict, Any, List
 
@@ -13,25 +16,25 @@ class TravelAgent(BaseAgent):
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute travel planning task"""
         try:
-            # Step 1: Understand request
-            requirements = await self._understand_request(task)
-            
-            # Step 2: Check memory for preferences
-            preferences = await self.memory.get_travel_preferences()
-            
-            # Step 3: Plan itinerary
-            itinerary = await self._plan_itinerary(requirements, preferences)
-            
-            # Step 4: Book components
-            bookings = await self._book_components(itinerary)
-            
-            # Step 5: Save to memory
-            await self._save_travel_memory(itinerary)
+            # Understanding the request and loading preferences don't depend on
+            # each other; booking and the memory write both wait for the plan
+            run = await self.run_steps([
+                Step("requirements", lambda: self._understand_request(task),
+                     timeout=settings.agent_llm_step_timeout),
+                Step("preferences", self.memory.get_travel_preferences,
+                     timeout=settings.agent_io_step_timeout, optional=True, default={}),
+                Step("itinerary", self._plan_itinerary, after=("requirements", "preferences"),
+                     timeout=settings.agent_llm_step_timeout),
+                Step("bookings", self._book_components, after=("itinerary",),
+                     timeout=settings.agent_io_step_timeout, optional=True, default=[]),
+                Step("memory", self._save_travel_memory, after=("itinerary",), background=True)
+            ])
             
             return {
                 "status": "success",
-                "itinerary": itinerary,
-                "bookings": bookings,
+                "itinerary": run.results["itinerary"],
+                "bookings": run.results["bookings"],
+                "skipped": run.skipped,
                 "summary": f"Trip to {task.get('destination')} planned successfully"
             }
             
@@ -72,26 +75,29 @@ class TravelAgent(BaseAgent):
         return await self.ai.structured_response(prompt)
     
     async def _book_components(self, itinerary: Dict) -> List[Dict]:
-        bookings = []
+        searches = []
         
-        # Book flights
+        # Flight and hotel searches are independent; run them together
         if itinerary.get('flights'):
-            flights = await self.travel_service.search_flights(
+            searches.append(("flight", self.travel_service.search_flights(
                 origin=itinerary['origin'],
                 destination=itinerary['destination'],
                 dates=itinerary['dates']
-            )
-            bookings.append({"type": "flight", "data": flights})
+            )))
         
-        # Book hotels
         if itinerary.get('accommodation'):
-            hotels = await self.travel_service.search_hotels(
+            searches.append(("hotel", self.travel_service.search_hotels(
                 location=itinerary['destination'],
                 dates=itinerary['dates']
-            )
-            bookings.append({"type": "hotel", "data": hotels})
+            )))
         
-        return bookings
+        # A failed hotel search shouldn't throw away the flights we already found
+        results = await asyncio.gather(*(search for _, search in searches), return_exceptions=True)
+        return [
+            {"type": kind, "status": "error", "error": str(result)} if isinstance(result, Exception)
+            else {"type": kind, "status": "ok", "data": result}
+            for (kind, _), result in zip(searches, results)
+        ]
     
     async def _save_travel_memory(self, itinerary: Dict):
         await self.memory.store({
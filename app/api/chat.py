@@ -1,29 +1,113 @@
 # app/api/chat.py
-from fastapi import APIRouter
+import json
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from app.schemas.chat import SentimentBatchRequest, SentimentBatchResponse
 from app.services.ai_service import AIService
+from app.services.context_manager import ConversationContext
+from app.services.openai_service import OpenAIService
 
 router = APIRouter()
 ai_service = AIService()
+openai_service = OpenAIService()
+
+
+def _sse(data: dict, event: str = None) -> str:
+    """Format one Server-Sent Event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
 
 
 @router.get("/")
-def chat(message: str = "Hello"):
+async def chat(message: str = "Hello"):
     """Chat with AI"""
-    response = ai_service.chat(message)
-    sentiment = ai_service.analyze_sentiment(message)
+    reply = await ai_service.reply(message)
+    sentiment = await ai_service.analyze_sentiment(message)
 
     return {
         "message": message,
-        "response": response,
+        "response": reply["response"],
+        "intent": reply.get("intent"),
+        "action": reply.get("action"),
         "sentiment": sentiment
     }
 
 
+@router.get("/router/stats")
+def router_stats():
+    """How much chat traffic the intent router answers without the LLM"""
+    return ai_service.router.stats()
+
+
+@router.get("/stream")
+async def chat_stream(message: str = "Hello"):
+    """Chat with AI, streaming tokens as Server-Sent Events"""
+
+    async def events():
+        parts = []
+        try:
+            async for token in openai_service.stream_chat(message):
+                parts.append(token)
+                yield _sse({"token": token})
+        except Exception as e:
+            yield _sse({"error": str(e)}, event="error")
+            return
+        yield _sse({"response": "".join(parts)}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws")
+async def chat_websocket(websocket: WebSocket):
+    """Persistent chat session: one socket, many messages"""
+    await websocket.accept()
+    history = ConversationContext()
+
+    try:
+        while True:
+            data = await websocket.receive_json()
+            message = (data.get("message") or "").strip()
+            if not message:
+                await websocket.send_json({"type": "error", "error": "Empty message"})
+                continue
+
+            parts = []
+            try:
+                async for token in openai_service.stream_chat(message, history):
+                    parts.append(token)
+                    await websocket.send_json({"type": "token", "content": token})
+            except Exception as e:
+                await websocket.send_json({"type": "error", "error": str(e)})
+                continue
+
+            await websocket.send_json({"type": "done", "response": "".join(parts)})
+
+    except WebSocketDisconnect:
+        pass
+
+
 @router.get("/sentiment")
-def analyze_sentiment(text: str):
+async def analyze_sentiment(text: str):
     """Analyze text sentiment"""
-    sentiment = ai_service.analyze_sentiment(text)
+    sentiment = await ai_service.analyze_sentiment(text)
     return {
         "text": text,
         "sentiment": sentiment
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/sentiment/batch", response_model=SentimentBatchResponse)
+async def analyze_sentiment_batch(request: SentimentBatchRequest):
+    """Analyze many texts; only low-confidence ones reach the LLM"""
+    results = await ai_service.analyze_sentiment_batch(request.texts)
+    return {
+        "count": len(results),
+        "results": [
+            {"text": text, "sentiment": sentiment}
+            for text, sentiment in zip(request.texts, results)
+        ]
+    }
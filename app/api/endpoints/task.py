@@ -5,7 +5,8 @@ from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from typing import List
 from app.schemas.task import TaskCreate, TaskResponse
 from app.services.task_service import TaskService
-from app.core.auth import get_current_user
+from app.core.dependencies import get_current_user
+from app.services.llm_scheduler import Priority, with_llm_priority
 
 router = APIRouter()
 
@@ -21,13 +22,13 @@ async def create_task(
     # Start task in background
     task_id = await service.create_task(task)
     
-    # Queue for processing
+    # Queue for processing; its LLM calls never delay interactive ones
     background_tasks.add_task(
-        service.process_task,
+        with_llm_priority(service.process_task, Priority.BACKGROUND, user_id=current_user.id),
         task_id=task_id
     )
     
-    return {"task_id": task_id, "status": "queued"}
+    return await service.get_task(task_id)
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
@@ -41,4 +42,27 @@ async def get_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return task
\ No newline at end of file
+    return task
+
+@router.post("/{task_id}/retry", response_model=TaskResponse)
+async def retry_task(
+    task_id: int,
+    background_tasks: BackgroundTasks,
+    current_user = Depends(get_current_user)
+):
+    """Re-run a failed task; completed steps are resumed from their checkpoints"""
+    service = TaskService(current_user.id)
+    task = await service.get_task(task_id)
+    
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if task["status"] in ("processing", "completed"):
+        raise HTTPException(status_code=409, detail=f"Task is already {task['status']}")
+    
+    task = await service.requeue_task(task_id)
+    background_tasks.add_task(
+        with_llm_priority(service.process_task, Priority.BACKGROUND, user_id=current_user.id),
+        task_id=task_id
+    )
+    
+    return task
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from app.schemas.travel import TravelRequest, TravelResponse
 from app.agents.travel_agent import TravelAgent
 from app.core.auth import get_current_user
+from app.services.llm_scheduler import Priority, llm_context
 
 router = APIRouter()
 
@@ -27,7 +28,9 @@ async def plan_trip(
         "preferences": request.preferences
     }
     
-    result = await agent.execute(task)
+    # Someone is waiting on this response, but chat replies still go first
+    with llm_context(Priority.AGENT, user_id=current_user.id):
+        result = await agent.execute(task)
     
     if result.get('status') == 'error':
         raise HTTPException(
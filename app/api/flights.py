@@ -43,6 +43,8 @@ async def search_flights(
             }
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Flight search error: {str(e)}")
 
@@ -50,7 +52,7 @@ async def search_flights(
 @router.get("/airports")
 async def search_airports(query: str = Query(..., min_length=2, description="Search by city, airport name, or code")):
     """Search airports by name, city, or code"""
-    airports = await flight_service.get_airports(query)
+    airports = await flight_service.get_airports(query, limit=10)
 
     return {
         "success": True,
@@ -74,4 +76,10 @@ async def get_popular_routes():
     return {
         "success": True,
         "routes": popular_routes
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/cache/stats")
+async def get_search_cache_stats():
+    """Hit, miss and coalescing counts of the flight search cache"""
+    return flight_service.cache.stats()
@@ -41,6 +41,8 @@ async def search_hotels(
             }
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Hotel search error: {str(e)}")
 
@@ -73,4 +75,10 @@ async def get_popular_hotel_destinations():
     return {
         "success": True,
         "destinations": popular_destinations
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/cache/stats")
+async def get_search_cache_stats():
+    """Fresh, stale and miss counts of the hotel search cache"""
+    return hotel_service.cache.stats()
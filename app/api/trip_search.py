@@ -0,0 +1,39 @@
+# app/api/trip_search.py
+import json
+from typing import Optional
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from app.services.trip_search import TripSearch
+
+router = APIRouter()
+trip_search = TripSearch()
+
+
+def _sse(data: dict, event: str = None) -> str:
+    """Format one Server-Sent Event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/stream")
+async def search_trip_stream(
+        destination: str = Query(..., description="Destination city"),
+        check_in: str = Query(..., description="Arrival / check-in date (YYYY-MM-DD)"),
+        check_out: str = Query(..., description="Departure / check-out date (YYYY-MM-DD)"),
+        origin: Optional[str] = Query(None, description="Departure airport code; flights are skipped without it"),
+        travelers: int = Query(1, ge=1, le=9)
+):
+    """Flights, hotels and a trip plan in one request, each sent as an SSE event when ready"""
+
+    async def events():
+        sections = []
+        async for section in trip_search.stream(destination, check_in, check_out, origin, travelers):
+            sections.append(section["source"])
+            yield _sse(section, event=section["source"])
+        yield _sse({"sources": sections}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -21,6 +21,93 @@ class Settings(BaseSettings):
     openai_api_key: Optional[str] = None
     google_api_key: Optional[str] = None
 
+    # LLM client
+    openai_model: str = "gpt-3.5-turbo"
+    openai_base_url: Optional[str] = None  # e.g. http://localhost:8001/v1 for app.dev.fake_openai
+    openai_max_concurrency: int = 32  # max in-flight completions per worker
+    openai_timeout: float = 60.0  # seconds per completion call
+    # LLM scheduling (interactive chat > agent runs > background tasks)
+    llm_interactive_reserved: int = 8  # slots only interactive calls may use
+    llm_interactive_max_wait: float = 10.0  # seconds queued before a call is dropped
+    llm_agent_limit: int = 16
+    llm_agent_max_wait: float = 30.0
+    llm_background_limit: int = 4
+    llm_background_max_wait: float = 300.0
+    chat_context_token_budget: int = 3000  # history tokens sent per chat call
+    chat_summary_token_budget: int = 500  # part of the budget kept for the summary
+
+    # LLM response cache
+    llm_cache_enabled: bool = True
+    llm_cache_path: Optional[str] = "./llm_cache.db"  # disk tier, created on first use; empty for memory only
+    llm_cache_max_entries: int = 1024
+    llm_cache_ttl: float = 86400  # seconds
+    semantic_cache_enabled: bool = True
+    semantic_cache_max_entries: int = 2048
+    semantic_cache_threshold: float = 0.9  # weighted cosine similarity
+
+    # Sentiment/intent micro-batching
+    sentiment_batch_size: int = 32
+    sentiment_batch_wait_ms: float = 5.0
+    sentiment_llm_threshold: float = 0.6  # lexicon confidence below this asks the LLM
+
+    # Itinerary generation
+    itinerary_parallel_min_days: int = 5  # trips this long are generated day-block by day-block
+    itinerary_days_per_block: int = 2
+    budget_optimizer_resolution: int = 400  # budget buckets for the itinerary knapsack
+
+    # Agent step timeouts (seconds)
+    agent_llm_step_timeout: float = 60.0
+    agent_io_step_timeout: float = 10.0
+    agent_max_tool_rounds: int = 5
+    tool_cache_max_entries: int = 512
+
+    # Provider endpoints; point both at app.dev.fake_providers for load tests
+    flight_api_base_url: str = "https://skyscanner-api.p.rapidapi.com"
+    hotel_api_base_url: str = "https://booking-com.p.rapidapi.com"
+
+    # Shared HTTP clients for flight/hotel providers (one pool per host)
+    http_max_connections: int = 50
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 60.0  # seconds an idle connection is kept open
+    http_timeout: float = 30.0
+    http_connect_timeout: float = 5.0
+
+    # Provider circuit breakers and hedged requests
+    provider_call_timeout: float = 10.0  # seconds per search, hedges included
+    breaker_window: int = 50  # recent calls the breaker looks at
+    breaker_min_calls: int = 10
+    breaker_failure_rate: float = 0.5
+    breaker_slow_call_seconds: float = 5.0
+    breaker_slow_call_rate: float = 0.8
+    breaker_open_seconds: float = 30.0
+    hedge_enabled: bool = True  # second request once the first passes the provider's p95
+    hedge_max_rate: float = 0.1  # at most this fraction of calls are hedged
+    hedge_burst: float = 5.0  # hedges that can be saved up for a burst of slow calls
+    hedge_max_slow_rate: float = 0.2  # no hedging while more of the breaker's recent calls were slow
+
+    # Provider search caches
+    flight_cache_ttl: float = 300.0  # seconds; 0 only coalesces concurrent identical searches
+    flight_cache_max_entries: int = 2048
+    hotel_cache_ttl: float = 600.0  # fresh for this long, then served stale while refreshing
+    hotel_cache_hard_ttl: float = 3600.0  # past this, callers wait for the provider
+    hotel_cache_max_entries: int = 2048
+    search_cache_fallback_ttl: float = 21600.0  # expired results kept this long for outages
+
+    # Per-source time budgets (seconds) for the combined trip search
+    trip_search_flights_budget: float = 8.0
+    trip_search_hotels_budget: float = 8.0
+    trip_search_plan_budget: float = 5.0
+
+    # CSV in the OurAirports layout (e.g. the full airports.csv); defaults to the bundled list
+    airports_data_path: Optional[str] = None
+
+    # Calendar scheduling
+    calendar_search_days: int = 14
+    calendar_work_start_hour: int = 9
+    calendar_work_end_hour: int = 17
+    calendar_reschedule_horizon_days: int = 7
+    calendar_reschedule_max_moves: int = 50
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,2 @@
+# app/dev/__init__.py
+# Local stand-in servers for load testing (never used in production)
@@ -0,0 +1,245 @@
+"""
+OpenAI-compatible stand-in server for load testing the AI code paths
+
+Implements POST /v1/chat/completions (plain, streamed and tool calls) with
+configurable latency, streaming speed and error/timeout injection, and answers the
+prompts sent by TravelAgent, BaseAgent, EnhancedTravelService and the
+sentiment analysis with canned JSON of the right shape.
+
+Run it and point OpenAIService at it:
+
+    FAKE_LLM_PROFILE=typical python -m app.dev.fake_openai --port 8001
+    OPENAI_BASE_URL=http://localhost:8001/v1 python main.py
+
+Profiles and overrides are read from FAKE_LLM_* environment variables
+(see app/dev/latency.py), e.g. FAKE_LLM_MEAN_MS=200 FAKE_LLM_ERROR_RATE=0.05.
+"""
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import time
+from typing import Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.dev.latency import LatencyProfile, profile_from_env
+
+_CHUNK = re.compile(r"\S+\s*|\s+")
+_ITINERARY = re.compile(r"create a detailed (\d+)-day itinerary for (.+?)\.", re.IGNORECASE)
+_OUTLINE = re.compile(r"outline a (\d+)-day trip to (.+?)\.", re.IGNORECASE)
+_DAY_BLOCK = re.compile(r"plan days (\d+)-(\d+) of a \d+-day trip to (.+?)\.", re.IGNORECASE)
+_NUMBERED = re.compile(r'^\s*(\d+)\. "(.*)"\s*$', re.MULTILINE)
+_DESTINATION = re.compile(r"'destination': '([^']+)'")
+
+
+def _day(day: int, destination: str) -> Dict:
+    return {
+        "day": day,
+        "theme": f"Day {day} in {destination}",
+        "morning": {"activity": f"Explore {destination} district {day}", "cost": 20},
+        "afternoon": {"activity": f"Museum visit {day} in {destination}", "cost": 25},
+        "evening": {"activity": f"Dinner at local restaurant {day}", "cost": 40},
+        "meals_cost": 35,
+        "transportation": {"mode": "metro", "cost": 8}
+    }
+
+
+def _itinerary(days: int, destination: str) -> Dict:
+    return {
+        "daily_itinerary": [_day(day, destination) for day in range(1, days + 1)],
+        "budget_breakdown": {
+            "accommodation": 120 * days, "food": 60 * days,
+            "activities": 45 * days, "transportation": 8 * days
+        },
+        "money_saving_tips": ["Buy a transit pass", "Eat where locals eat"],
+        "recommended_bookings": {"flights": [], "hotels": []}
+    }
+
+
+def canned_answer(prompt: str) -> str:
+    """Plausible answer for the prompts this codebase sends"""
+    if "Analyze each numbered text" in prompt:
+        results = [
+            {"index": int(index), "sentiment": "neutral", "urgency": "low",
+             "intent": "inquire", "key_details": {}}
+            for index, _ in _NUMBERED.findall(prompt)
+        ]
+        return json.dumps({"results": results})
+
+    if "Analyze:" in prompt:
+        return json.dumps({"sentiment": "neutral", "urgency": "low", "intent": "inquire", "key_details": {}})
+
+    match = _OUTLINE.search(prompt)
+    if match:
+        days, destination = int(match.group(1)), match.group(2).strip()
+        return json.dumps({
+            "days": [{"day": day, "theme": f"Day {day} in {destination}", "area": f"district {day}"}
+                     for day in range(1, days + 1)],
+            "accommodation_per_night": 120,
+            "money_saving_tips": ["Buy a transit pass", "Eat where locals eat"],
+            "recommended_bookings": {"flights": [], "hotels": []}
+        })
+
+    match = _DAY_BLOCK.search(prompt)
+    if match:
+        first, last, destination = int(match.group(1)), int(match.group(2)), match.group(3).strip()
+        return json.dumps({"daily_itinerary": [_day(day, destination) for day in range(first, last + 1)]})
+
+    match = _ITINERARY.search(prompt)
+    if match:
+        return json.dumps(_itinerary(int(match.group(1)), match.group(2).strip()))
+
+    if "Extract travel requirements" in prompt:
+        destination = _DESTINATION.search(prompt)
+        return json.dumps({
+            "destination": destination.group(1) if destination else "Paris",
+            "budget": 2000,
+            "dates": {"start": "2024-06-01", "end": "2024-06-07"},
+            "travelers": {"count": 2, "ages": []},
+            "preferences": {"activities": ["sightseeing"], "pace": "moderate"},
+            "constraints": []
+        })
+
+    if "Create detailed itinerary" in prompt:
+        destination = _DESTINATION.search(prompt)
+        return json.dumps({**_itinerary(3, destination.group(1) if destination else "Paris"),
+                           "accommodation": [{"name": "City Center Inn", "price_per_night": 150}],
+                           "transportation": ["metro"],
+                           "activities": ["sightseeing"],
+                           "estimated_cost": 1500})
+
+    if "Break this goal into steps" in prompt:
+        return "1. Understand the goal\n2. Gather information\n3. Make a plan\n4. Execute"
+
+    return f"(fake) You said: {prompt.strip()[:200]}"
+
+
+def canned_tool_calls(prompt: str, tools: List[Dict]) -> List[Dict]:
+    """Tool calls for the first turn of a function-calling conversation"""
+    names = {tool.get("function", {}).get("name") for tool in tools}
+    destination = _DESTINATION.search(prompt)
+    city = destination.group(1) if destination else "Paris"
+    wanted = []
+    if "search_flights" in names and "flight" in prompt.lower():
+        wanted.append(("search_flights", {"origin": "JFK", "destination": "CDG", "departure_date": "2024-06-01"}))
+    if "search_hotels" in names and "hotel" in prompt.lower():
+        wanted.append(("search_hotels", {"location": city, "check_in": "2024-06-01", "check_out": "2024-06-07"}))
+    if "lookup_memory" in names and "remember" in prompt.lower():
+        wanted.append(("lookup_memory", {"query": "travel"}))
+    return [
+        {"id": f"call_{i}", "type": "function", "function": {"name": name, "arguments": json.dumps(args)}}
+        for i, (name, args) in enumerate(wanted)
+    ]
+
+
+def create_app(profile: LatencyProfile = None, seed: int = None) -> FastAPI:
+    profile = profile or profile_from_env("FAKE_LLM")
+    rng = random.Random(seed)
+    ids = itertools.count(1)
+    app = FastAPI(title="Fake OpenAI")
+    app.state.profile = profile
+
+    def _error(outcome: str) -> JSONResponse:
+        if outcome == "rate_limit":
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached (fake)", "type": "rate_limit_error"}},
+                status_code=429, headers={"retry-after": "1"}
+            )
+        return JSONResponse(
+            {"error": {"message": "Injected failure (fake)", "type": "server_error"}},
+            status_code=500
+        )
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "fake-model", "object": "model", "owned_by": "dev"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages: List[Dict] = body.get("messages") or []
+        model = body.get("model", "fake-model")
+        prompt = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+
+        outcome = profile.outcome(rng)
+        if outcome == "timeout":
+            await asyncio.sleep(profile.hang_seconds)
+        await asyncio.sleep(profile.sample_ms(rng) / 1000)
+        if outcome in ("error", "rate_limit"):
+            return _error(outcome)
+
+        # Function calling: ask for tools first, answer once their results are in
+        tool_calls = []
+        if body.get("tools") and body.get("tool_choice") != "none":
+            if not any(m.get("role") == "tool" for m in messages):
+                tool_calls = canned_tool_calls(prompt, body["tools"])
+        tool_results = sum(1 for m in messages if m.get("role") == "tool")
+
+        content = canned_answer(prompt) if not tool_results else f"(fake) Plan based on {tool_results} tool results"
+        if tool_calls:
+            content = ""
+        chunks = _CHUNK.findall(content)
+        completion_id = f"chatcmpl-fake-{next(ids)}"
+        created = int(time.time())
+        delay = 1 / profile.tokens_per_second if profile.tokens_per_second > 0 else 0.0
+
+        if not body.get("stream"):
+            await asyncio.sleep(delay * len(chunks))
+            prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 4
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content or None,
+                                **({"tool_calls": tool_calls} if tool_calls else {})},
+                    "finish_reason": "tool_calls" if tool_calls else "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(chunks),
+                    "total_tokens": prompt_tokens + len(chunks)
+                }
+            }
+
+        async def events():
+            def chunk(delta: Dict, finish_reason=None) -> str:
+                payload = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                }
+                return f"data: {json.dumps(payload)}\n\n"
+
+            yield chunk({"role": "assistant", "content": ""})
+            for piece in chunks:
+                if delay:
+                    await asyncio.sleep(delay)
+                yield chunk({"content": piece})
+            yield chunk({}, finish_reason="stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8001)))
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(seed=args.seed), host=args.host, port=args.port)
@@ -0,0 +1,246 @@
+"""
+Flight and hotel provider stand-in server for load testing the search paths
+
+Implements the endpoints FlightService, FlightAPIService and HotelService
+call (Skyscanner live search, the simple flight search and Booking.com
+hotel search). Results come back in the shape the services' mock data
+has, so the rest of the app works unchanged against it. Results are
+generated from a seed and the query, so the same search always returns
+the same results. Each item is derived from its own index, so result
+sets can be arbitrarily large and a page costs only its own size. Prices
+rise with the index, so results are already sorted by price.
+
+Run it and point the services at it:
+
+    SIM_FLIGHTS_PROFILE=typical SIM_HOTELS_PROFILE=flaky python -m app.dev.fake_providers --port 8002
+    FLIGHT_API_BASE_URL=http://localhost:8002 HOTEL_API_BASE_URL=http://localhost:8002 python main.py
+
+Latency and failure injection come from SIM_FLIGHTS_* and SIM_HOTELS_*
+environment variables (see app/dev/latency.py). For example,
+SIM_HOTELS_RATE_LIMIT_RATE=0.1 answers 10% of hotel searches with a 429.
+Result counts per query come from SIM_FLIGHT_RESULTS and SIM_HOTEL_RESULTS.
+Every search accepts page and page_size.
+"""
+import asyncio
+import os
+import random
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.dev.latency import LatencyProfile, profile_from_env
+
+AIRLINES = ["Delta", "American Airlines", "United", "Southwest", "JetBlue", "Lufthansa", "Air France",
+            "British Airways", "Emirates", "Qatar Airways", "Singapore Airlines", "KLM", "Iberia", "ANA"]
+HOTEL_WORDS = ["Grand", "Plaza", "Central", "Harbour", "Garden", "Royal", "Park", "Boutique", "Heritage",
+               "Skyline", "Riverside", "Old Town", "Station", "Palace", "Courtyard"]
+HOTEL_KINDS = ["Hotel", "Inn", "Suites", "Lodge", "Residences", "Resort"]
+DISTRICTS = ["Downtown", "City Center", "Waterfront", "Business District", "Historic District", "Airport"]
+ROOM_TYPES = ["Deluxe King", "Standard Double", "Executive Suite", "Family Room", "Twin Room"]
+AMENITIES = ["Free WiFi", "Swimming Pool", "Fitness Center", "Restaurant", "Spa", "Parking", "Breakfast", "Bar"]
+
+
+def _page(request: Request, total: int) -> Dict[str, int]:
+    page = max(int(request.query_params.get("page", request.query_params.get("page_number", 0))), 0)
+    size = min(max(int(request.query_params.get("page_size", 20)), 1), 500)
+    start = min(page * size, total)
+    return {"page": page, "page_size": size, "start": start, "stop": min(start + size, total), "total": total}
+
+
+def _pagination(page: Dict[str, int]) -> Dict:
+    return {
+        "page": page["page"],
+        "page_size": page["page_size"],
+        "total_results": page["total"],
+        "next_page": page["page"] + 1 if page["stop"] < page["total"] else None
+    }
+
+
+def _flight(seed: str, i: int, origin: str, destination: str, departure_date: str, cabin: str) -> Dict:
+    rng = random.Random(f"{seed}:{i}")
+    airline = rng.choice(AIRLINES)
+    stops = rng.choices([0, 1, 2], [5, 3, 1])[0]
+    minutes = rng.randint(75, 720) + stops * rng.randint(50, 180)
+    departs = rng.randint(5 * 60, 23 * 60)
+    day = date.fromisoformat(departure_date) if _is_date(departure_date) else date.today()
+    departure = datetime.combine(day, time()) + timedelta(minutes=departs)
+    multiplier = {"economy": 1.0, "premium": 1.8, "business": 3.5, "first": 6.0}.get(cabin, 1.0)
+    return {
+        "id": f"FL{i + 1:05d}",
+        "airline": airline,
+        "flight_number": f"{airline[:2].upper()}{rng.randint(100, 9999)}",
+        "origin": origin,
+        "destination": destination,
+        "departure_time": departure.isoformat(),
+        "arrival_time": (departure + timedelta(minutes=minutes)).isoformat(),
+        "duration": f"{minutes // 60}h {minutes % 60:02d}m",
+        "stops": stops,
+        "cabin_class": cabin,
+        # Rises with the index so results come out sorted by price
+        "price": round((89 + i * 3.5 + rng.uniform(0, 3.4)) * multiplier, 2),
+        "currency": "USD",
+        "available_seats": rng.randint(1, 180),
+        "booking_link": f"https://example.com/book/flight/{seed}/{i + 1}"
+    }
+
+
+def _hotel(seed: str, i: int, location: str, check_in: str, check_out: str, guests: int) -> Dict:
+    rng = random.Random(f"{seed}:{i}")
+    nights = _nights(check_in, check_out)
+    price = round(55 + i * 2.5 + rng.uniform(0, 2.4))
+    return {
+        "id": f"HT{i + 1:05d}",
+        "name": f"{rng.choice(HOTEL_WORDS)} {rng.choice(HOTEL_KINDS)} {location}",
+        "location": f"{location}, {rng.choice(DISTRICTS)}",
+        "description": f"Hotel in {location} (simulated result {i + 1}).",
+        "rating": round(rng.uniform(2.5, 5.0), 1),
+        "review_count": rng.randint(5, 5000),
+        "price_per_night": price,
+        "total_price": price * nights,
+        "currency": "USD",
+        "amenities": rng.sample(AMENITIES, rng.randint(2, 6)),
+        "room_type": rng.choice(ROOM_TYPES),
+        "available_rooms": rng.randint(1, 30),
+        "check_in": check_in,
+        "check_out": check_out,
+        "guests": guests,
+        "images": [f"https://example.com/hotel/{seed}/{i + 1}_{n}.jpg" for n in (1, 2)],
+        "booking_link": f"https://example.com/book/hotel/{seed}/{i + 1}"
+    }
+
+
+def _is_date(value: str) -> bool:
+    try:
+        date.fromisoformat(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _nights(check_in: str, check_out: str) -> int:
+    if _is_date(check_in) and _is_date(check_out):
+        return max((date.fromisoformat(check_out) - date.fromisoformat(check_in)).days, 1)
+    return 1
+
+
+def _result_count(seed: str, configured: int) -> int:
+    # Popular queries have more results; never more than configured
+    return max(1, int(configured * random.Random(seed).uniform(0.6, 1.0)))
+
+
+def create_app(
+        flight_profile: Optional[LatencyProfile] = None,
+        hotel_profile: Optional[LatencyProfile] = None,
+        seed: int = 0,
+        flight_results: Optional[int] = None,
+        hotel_results: Optional[int] = None
+) -> FastAPI:
+    flight_profile = flight_profile or profile_from_env("SIM_FLIGHTS")
+    hotel_profile = hotel_profile or profile_from_env("SIM_HOTELS")
+    flight_results = flight_results or int(os.getenv("SIM_FLIGHT_RESULTS", "200"))
+    hotel_results = hotel_results or int(os.getenv("SIM_HOTEL_RESULTS", "300"))
+    rng = random.Random(seed)  # drives latency and failures, not result contents
+    app = FastAPI(title="Fake flight and hotel providers")
+    app.state.requests = Counter()
+
+    async def _delay(profile: LatencyProfile, provider: str) -> Optional[JSONResponse]:
+        """Sleep like the provider would; an error response if one is injected"""
+        outcome = profile.outcome(rng)
+        app.state.requests[f"{provider}:{outcome}"] += 1
+        if outcome == "timeout":
+            await asyncio.sleep(profile.hang_seconds)
+        await asyncio.sleep(profile.sample_ms(rng) / 1000)
+        if outcome == "rate_limit":
+            return JSONResponse({"message": "Too many requests (simulated)"}, status_code=429,
+                                headers={"retry-after": "1"})
+        if outcome == "error":
+            return JSONResponse({"message": "Provider error (simulated)"}, status_code=500)
+        return None
+
+    def _flights(request: Request, origin: str, destination: str, departure_date: str, cabin: str) -> Dict:
+        key = f"{seed}:{origin}:{destination}:{departure_date}:{cabin}"
+        page = _page(request, _result_count(key, flight_results))
+        flights: List[Dict] = [
+            _flight(key, i, origin, destination, departure_date, cabin) for i in range(page["start"], page["stop"])
+        ]
+        return {
+            "status": "success",
+            "origin": origin,
+            "destination": destination,
+            "departure_date": departure_date,
+            "total_flights": page["total"],
+            "cheapest_price": _flight(key, 0, origin, destination, departure_date, cabin)["price"],
+            "flights": flights,
+            **_pagination(page)
+        }
+
+    @app.post("/v3/flights/live/search")
+    async def skyscanner_live_search(request: Request):
+        error = await _delay(flight_profile, "flights")
+        if error:
+            return error
+        query = (await request.json()).get("query", {})
+        legs = query.get("queryLegs") or [{}]
+        leg = legs[0]
+        when = leg.get("date") or {}
+        departure_date = (f"{when['year']:04d}-{when['month']:02d}-{when['day']:02d}"
+                          if {"year", "month", "day"} <= set(when) else "")
+        return _flights(
+            request,
+            leg.get("originPlaceId", {}).get("iata", "").upper(),
+            leg.get("destinationPlaceId", {}).get("iata", "").upper(),
+            departure_date,
+            query.get("cabinClass", "economy")
+        )
+
+    @app.get("/flights/search")
+    async def simple_flight_search(request: Request, origin: str, destination: str, departure_date: str,
+                                   cabin_class: str = "economy"):
+        error = await _delay(flight_profile, "flights")
+        return error or _flights(request, origin.upper(), destination.upper(), departure_date, cabin_class)
+
+    @app.get("/v1/hotels/search")
+    async def booking_hotel_search(request: Request, dest_id: str, checkin_date: str, checkout_date: str,
+                                   adults_number: int = 2):
+        error = await _delay(hotel_profile, "hotels")
+        if error:
+            return error
+        key = f"{seed}:{dest_id}:{checkin_date}:{checkout_date}:{adults_number}"
+        page = _page(request, _result_count(key, hotel_results))
+        hotels = [
+            _hotel(key, i, dest_id, checkin_date, checkout_date, adults_number)
+            for i in range(page["start"], page["stop"])
+        ]
+        return {
+            "status": "success",
+            "location": dest_id,
+            "check_in": checkin_date,
+            "check_out": checkout_date,
+            "total_hotels": page["total"],
+            "lowest_price": _hotel(key, 0, dest_id, checkin_date, checkout_date, adults_number)["price_per_night"],
+            "hotels": hotels,
+            **_pagination(page)
+        }
+
+    @app.get("/stats")
+    async def stats():
+        """Requests served per provider and outcome"""
+        return dict(app.state.requests)
+
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake flight and hotel provider server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8002)))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(seed=args.seed), host=args.host, port=args.port)
@@ -0,0 +1,61 @@
+"""
+Latency and failure profiles for the local stand-in servers
+"""
+import os
+import random
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+
+@dataclass
+class LatencyProfile:
+    distribution: str = "lognormal"  # fixed | uniform | normal | lognormal
+    mean_ms: float = 800.0  # median for lognormal
+    spread: float = 0.5  # jitter fraction (uniform/normal) or sigma (lognormal)
+    error_rate: float = 0.0  # fraction of requests answered with a 500
+    rate_limit_rate: float = 0.0  # fraction of requests answered with a 429
+    timeout_rate: float = 0.0  # fraction of requests that hang
+    hang_seconds: float = 120.0
+    tokens_per_second: float = 50.0  # streaming speed (LLM server only)
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.distribution == "fixed":
+            value = self.mean_ms
+        elif self.distribution == "uniform":
+            value = rng.uniform(self.mean_ms * (1 - self.spread), self.mean_ms * (1 + self.spread))
+        elif self.distribution == "normal":
+            value = rng.gauss(self.mean_ms, self.mean_ms * self.spread)
+        else:
+            value = rng.lognormvariate(0.0, self.spread) * self.mean_ms
+        return max(value, 0.0)
+
+    def outcome(self, rng: random.Random) -> str:
+        """"ok", "error", "rate_limit" or "timeout" for one request"""
+        roll = rng.random()
+        for name, rate in (("timeout", self.timeout_rate),
+                           ("rate_limit", self.rate_limit_rate),
+                           ("error", self.error_rate)):
+            if roll < rate:
+                return name
+            roll -= rate
+        return "ok"
+
+
+PROFILES: Dict[str, LatencyProfile] = {
+    "instant": LatencyProfile(distribution="fixed", mean_ms=0.0, tokens_per_second=0.0),
+    "fast": LatencyProfile(distribution="fixed", mean_ms=50.0, tokens_per_second=500.0),
+    "typical": LatencyProfile(),
+    "slow": LatencyProfile(mean_ms=3000.0, spread=0.7, tokens_per_second=20.0),
+    "flaky": LatencyProfile(error_rate=0.1, rate_limit_rate=0.05, timeout_rate=0.02)
+}
+
+
+def profile_from_env(prefix: str, default: str = "typical") -> LatencyProfile:
+    """Preset from <PREFIX>_PROFILE, with any field overridden by <PREFIX>_<FIELD>"""
+    profile = PROFILES[os.getenv(f"{prefix}_PROFILE", default)]
+    overrides = {}
+    for name, value in vars(profile).items():
+        raw: Optional[str] = os.getenv(f"{prefix}_{name.upper()}")
+        if raw is not None:
+            overrides[name] = raw if isinstance(value, str) else float(raw)
+    return replace(profile, **overrides)
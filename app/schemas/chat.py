@@ -0,0 +1,14 @@
+"""
+Chat schemas
+"""
+from pydantic import BaseModel, Field
+from typing import List, Dict
+
+
+class SentimentBatchRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1, max_length=500)
+
+
+class SentimentBatchResponse(BaseModel):
+    count: int
+    results: List[Dict]
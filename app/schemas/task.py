@@ -18,5 +18,6 @@ class TaskResponse(TaskBase):
     status: str
     progress: int
     result_data: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
\ No newline at end of file
@@ -1,26 +1,167 @@
 """
 AI Service - Basic version
 """
+import re
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.services.intent_router import IntentMatch, IntentRouter
+from app.services.sentiment_engine import SentimentEngine
+
+_DAYS = re.compile(r" (\d+) (?:day|days|night|nights) ")
+# Words that end a destination name ("trip to new york for 5 days")
+_DESTINATION_STOP = {
+    "for", "in", "on", "next", "this", "with", "from", "under", "during", "at", "and", "please",
+    "was", "is", "are", "got", "has", "had", "be", "been", "now", "today", "tomorrow", "soon",
+    "but", "because", "so", "when", "if", "then", "again", "asap"
+}
+# Words besides the phrase a greeting or help message may have ("hi there", "can you help me")
+_CANNED_MAX_EXTRA_WORDS = 3
+# What follows "go to" / "visit" that is not a place ("i want to go to bed")
+_NOT_DESTINATION = {
+    "bed", "sleep", "work", "school", "class", "church", "home", "there", "here", "it",
+    "me", "you", "him", "her", "them", "us", "a", "an", "my", "your", "our", "their"
+}
+
+
 class AIService:
     def __init__(self):
         self.responses = {
             "hello": "Hi! I'm your AI assistant.",
-            "travel": "I can help plan trips!",
             "help": "Ask me anything!"
         }
+        self.sentiment_engine = SentimentEngine()
+        self.router = self._build_router()
+        self._openai_service = None
+
+    def _build_router(self) -> IntentRouter:
+        router = IntentRouter()
+        # Only explicit planning requests: an intent verb, then the destination.
+        # Bare "trip to" / "travel to" also appear in complaints and questions
+        # ("my trip to Rome was cancelled"), which need the LLM.
+        planning = [f"{verb} {what} {prep}" for verb in ("plan", "book", "organize")
+                    for what in ("a trip", "trip", "my trip", "a vacation", "a holiday", "a weekend")
+                    for prep in ("to", "in")]
+        wishes = [f"{who} {verb}" for who in ("i want to", "i d like to", "i would like to", "we want to",
+                                                "we d like to", "we would like to")
+                  for verb in ("go to", "travel to", "visit", "fly to")]
+        router.add("plan_trip", planning + wishes + [
+            "take me to", "itinerary for", "make an itinerary for", "plan an itinerary for"
+        ], priority=30)
+        router.add("help", ["help", "what can you do", "how does this work"], priority=20)
+        router.add("greeting", [
+            "hello", "hi", "hey", "good morning", "good afternoon", "good evening"
+        ], priority=10)
+        router.compile()
+        return router
+
+    @property
+    def openai_service(self):
+        # Created on first use; most messages never need the LLM
+        if self._openai_service is None:
+            from app.services.openai_service import OpenAIService
+            self._openai_service = OpenAIService()
+        return self._openai_service
 
     def chat(self, message: str) -> str:
         """Simple chat response"""
-        msg_lower = message.lower()
-        for key, response in self.responses.items():
-            if key in msg_lower:
-                return response
+        routed = self.route(message)
+        if routed:
+            return routed["response"]
         return f"I heard: '{message}'. How can I help?"
 
-    def analyze(self, text: str) -> dict:
-        """Simple sentiment analysis"""
+    def route(self, message: str) -> Optional[Dict]:
+        """Answer simple intents without the LLM; None when nothing matches"""
+        match = self.router.route(message)
+        if match is None:
+            return None
+
+        if match.intent == "plan_trip":
+            # Without a destination there is nothing to dispatch; let the LLM answer
+            routed = self._plan_trip_action(match)
+        elif len(match.text[:match.start].split()) + len(match.text[match.end:].split()) > _CANNED_MAX_EXTRA_WORDS:
+            # Canned greeting/help answers only for messages that are little more than the
+            # phrase itself; "hey, my flight got cancelled..." is a real request
+            routed = None
+        else:
+            key = {"greeting": "hello"}.get(match.intent, match.intent)
+            routed = {"intent": match.intent, "response": self.responses[key]}
+
+        if routed is None:
+            # Keep the router's stats honest about what actually skipped the LLM
+            self.router.reject(match)
+        return routed
+
+    def _plan_trip_action(self, match: IntentMatch) -> Optional[Dict]:
+        words = []
+        for word in match.text[match.end - 1:].split():
+            if word in _DESTINATION_STOP or word.isdigit() or len(words) == 3:
+                break
+            words.append(word)
+        if not words or words[0] in _NOT_DESTINATION:
+            return None
+
+        destination = " ".join(words).title()
+        days = _DAYS.search(match.text)
+        action = {"type": "plan_trip", "destination": destination}
+        if days:
+            action["days"] = int(days.group(1))
         return {
-            "text": text,
-            "sentiment": "positive",
-            "confidence": 0.8
+            "intent": "plan_trip",
+            "response": f"Let's plan your trip to {destination}!",
+            "action": action
         }
+
+    async def reply(self, message: str) -> Dict:
+        """Routed answer when possible, otherwise ask the LLM"""
+        routed = self.route(message)
+        if routed:
+            return {**routed, "source": "router"}
+
+        try:
+            response = await self.openai_service.chat(message)
+            return {"intent": None, "response": response, "source": "llm"}
+        except Exception as e:
+            print(f"Chat LLM error: {e}")
+            return {"intent": None, "response": f"I heard: '{message}'. How can I help?", "source": "fallback"}
+
+    def analyze(self, text: str) -> dict:
+        """Fast in-process sentiment analysis"""
+        result = self.sentiment_engine.score(text)
+        return {"text": text, **result}
+
+    async def analyze_sentiment(self, text: str) -> Dict:
+        """Sentiment and urgency; the LLM is only asked when the lexicon is unsure"""
+        result = dict(self.sentiment_engine.score(text), source="lexicon")
+        if result["confidence"] >= settings.sentiment_llm_threshold:
+            return result
+
+        # Single texts go through the batcher so concurrent requests share an LLM call
+        try:
+            analysis = await self.openai_service.analyze_sentiment(text)
+        except Exception as e:
+            print(f"Sentiment LLM fallback error: {e}")
+            return result
+        return self._prefer_llm(result, analysis)
+
+    async def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict]:
+        results = [dict(r, source="lexicon") for r in self.sentiment_engine.score_batch(texts)]
+
+        unsure = [i for i, r in enumerate(results) if r["confidence"] < settings.sentiment_llm_threshold]
+        if unsure:
+            try:
+                analyses = await self.openai_service.analyze_sentiment_batch([texts[i] for i in unsure])
+            except Exception as e:
+                # Keep the lexicon answer if the LLM is unavailable
+                print(f"Sentiment LLM fallback error: {e}")
+            else:
+                for i, analysis in zip(unsure, analyses):
+                    results[i] = self._prefer_llm(results[i], analysis)
+
+        return results
+
+    @staticmethod
+    def _prefer_llm(lexicon: Dict, analysis: Dict) -> Dict:
+        """The LLM's analysis when it has a sentiment, else the lexicon's"""
+        if analysis.get("sentiment"):
+            return {**analysis, "source": "llm"}
+        return lexicon
@@ -0,0 +1,169 @@
+"""
+Airport autocomplete index
+
+Airports are loaded once from a CSV in the OurAirports column layout
+(iata_code, name, municipality, iso_country, type). The bundled file covers
+the major airports; point settings.airports_data_path at the full
+OurAirports airports.csv for every IATA code. Rows without an IATA code
+are skipped.
+
+Every word of the code, city and name becomes a posting in sorted arrays,
+so a prefix is a pair of binary searches and the postings in between are
+scored with NumPy. With several query terms, every term must match. A term
+with no prefix match falls back to character-trigram similarity against
+the distinct words (for typos like "lndon").
+"""
+import bisect
+import csv
+import os
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "airports.csv")
+
+# How much a match in each field is worth, and how much airport size adds
+FIELD_SCORES = {"code": 4.0, "city": 3.0, "name": 2.0}
+TYPE_WEIGHTS = {"large_airport": 1.0, "medium_airport": 0.5, "small_airport": 0.2}
+EXACT_WORD_BONUS = 1.0
+EXACT_CODE_BONUS = 10.0
+FUZZY_MIN_SIMILARITY = 0.45
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Lowercase ASCII form used for matching (São Paulo -> sao paulo)"""
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+
+
+def words(text: str) -> List[str]:
+    return _WORD.findall(fold(text))
+
+
+def trigrams(word: str) -> set:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AirportIndex:
+    def __init__(self, airports: List[Dict[str, str]]):
+        airports = sorted(airports, key=lambda a: a["code"])  # ties are returned in code order
+        self.airports = airports
+        self.weights = np.array([TYPE_WEIGHTS.get(a.get("type", ""), 0.0) for a in airports], dtype=np.float32)
+        self.by_code = {a["code"].lower(): i for i, a in enumerate(airports)}
+
+        postings = []
+        for i, airport in enumerate(airports):
+            seen = {}
+            for field in ("code", "city", "name"):
+                for word in words(airport[field]):
+                    seen[word] = max(seen.get(word, 0.0), FIELD_SCORES[field])
+            postings.extend((word, i, score) for word, score in seen.items())
+        postings.sort()
+
+        self.tokens: List[str] = [word for word, _, _ in postings]
+        self.token_airport = np.array([i for _, i, _ in postings], dtype=np.int32)
+        self.token_score = np.array([score for _, _, score in postings], dtype=np.float32)
+
+        # Distinct words, the range of postings each one owns, and a trigram index over them
+        self.vocab = sorted(set(self.tokens))
+        self.word_start = np.array([bisect.bisect_left(self.tokens, w) for w in self.vocab] + [len(self.tokens)],
+                                   dtype=np.int32)
+        grams: Dict[str, List[int]] = {}
+        self.word_grams = np.zeros(len(self.vocab), dtype=np.int16)
+        for word_id, word in enumerate(self.vocab):
+            word_trigrams = trigrams(word)
+            self.word_grams[word_id] = len(word_trigrams)
+            for gram in word_trigrams:
+                grams.setdefault(gram, []).append(word_id)
+        self.grams = {gram: np.array(ids, dtype=np.int32) for gram, ids in grams.items()}
+
+    @classmethod
+    def from_csv(cls, path: str) -> "AirportIndex":
+        airports = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                code = (row.get("iata_code") or "").strip().upper()
+                if len(code) != 3 or row.get("type") == "closed":
+                    continue
+                airports.append({
+                    "code": code,
+                    "name": row.get("name", ""),
+                    "city": row.get("municipality", ""),
+                    "country": row.get("iso_country", ""),
+                    "type": row.get("type", "")
+                })
+        return cls(airports)
+
+    def __len__(self) -> int:
+        return len(self.airports)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """Best matches for an autocomplete query"""
+        terms = words(query)
+        if not terms:
+            return []
+
+        total = None
+        for term in terms:
+            scores = self._term_scores(term)
+            total = scores if total is None else total + scores  # -inf where any term missed
+
+        if len(terms) == 1 and terms[0] in self.by_code:
+            total[self.by_code[terms[0]]] += EXACT_CODE_BONUS
+        matched = np.flatnonzero(total > -np.inf)
+        if len(matched) > limit:
+            matched = matched[np.argpartition(-total[matched], limit - 1)[:limit]]
+        ranked = matched[np.lexsort((matched, -total[matched]))]
+        return [
+            {key: self.airports[i][key] for key in ("code", "name", "city", "country")}
+            for i in ranked
+        ]
+
+    def _term_scores(self, term: str) -> np.ndarray:
+        """Best score per airport for one query term (-inf if it doesn't match)"""
+        scores = np.full(len(self.airports), -np.inf, dtype=np.float32)
+        lo = bisect.bisect_left(self.tokens, term)
+        hi = bisect.bisect_left(self.tokens, term + "\x7f", lo)
+        if hi > lo:
+            exact_hi = bisect.bisect_right(self.tokens, term, lo, hi)
+            posting_scores = self.token_score[lo:hi] + self.weights[self.token_airport[lo:hi]]
+            posting_scores[:exact_hi - lo] += EXACT_WORD_BONUS
+            np.maximum.at(scores, self.token_airport[lo:hi], posting_scores)
+            return scores
+
+        for word_id, similarity in self._similar_words(term):
+            start, end = self.word_start[word_id], self.word_start[word_id + 1]
+            airports = self.token_airport[start:end]
+            np.maximum.at(scores, airports, self.token_score[start:end] * similarity + self.weights[airports])
+        return scores
+
+    def _similar_words(self, term: str, limit: int = 20):
+        """Distinct indexed words sharing enough trigrams with term (Dice coefficient)"""
+        term_grams = trigrams(term)
+        hits = [self.grams[gram] for gram in term_grams if gram in self.grams]
+        if len(term) < 3 or not hits:
+            return []
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.vocab))
+        candidates = np.flatnonzero(shared)
+        similarity = 2 * shared[candidates] / (len(term_grams) + self.word_grams[candidates])
+        keep = similarity >= FUZZY_MIN_SIMILARITY
+        candidates, similarity = candidates[keep], similarity[keep]
+        best = np.argsort(-similarity, kind="stable")[:limit]
+        return list(zip(candidates[best], similarity[best]))
+
+
+_index: Optional[AirportIndex] = None
+
+
+def get_airport_index() -> AirportIndex:
+    """Index over settings.airports_data_path (or the bundled list), built on first use"""
+    global _index
+    if _index is None:
+        _index = AirportIndex.from_csv(settings.airports_data_path or DEFAULT_PATH)
+    return _index
@@ -0,0 +1,289 @@
+"""
+Budget optimizer for itineraries
+
+Picks a lodging tier, one meal option per day and up to a few activities
+per day from candidate lists so that the total preference score is as high
+as possible without exceeding the total or per-day budget. Each day is a
+small knapsack over a discretized budget, solved with NumPy. The days are
+then combined with a max-plus convolution, once for each lodging tier.
+
+Day-bound candidates are solved exactly (to the budget resolution).
+Activities that fit any day are dealt out across the days and then traded
+in one improvement sweep, which is near-optimal but not exact.
+"""
+import heapq
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+
+_NEG = -np.inf
+
+
+@dataclass
+class Candidate:
+    category: str  # "activity", "meal" (a day's meals) or "lodging" (per night)
+    name: str
+    cost: float
+    rating: float = 0.0  # 0-5
+    tags: List[str] = field(default_factory=list)
+    day: Optional[int] = None  # None: any day (an activity is still used at most once)
+
+
+def score_candidates(
+        candidates: Sequence[Candidate],
+        preferences: Optional[Dict[str, Any]] = None,
+        budget_per_day: Optional[float] = None
+) -> np.ndarray:
+    """Preference score of every candidate, computed in one pass"""
+    preferences = preferences or {}
+    weights = {}
+    for tag in preferences.get("travel_style", []):
+        weights[tag.lower()] = 0.5
+    for tag in preferences.get("activities", []):
+        weights[tag.lower()] = 1.0
+    for tag in preferences.get("avoid", []):
+        weights[tag.lower()] = -1.0
+
+    n = len(candidates)
+    rows, cols = [], []
+    vocab: Dict[str, int] = {}
+    for i, candidate in enumerate(candidates):
+        for tag in candidate.tags:
+            rows.append(i)
+            cols.append(vocab.setdefault(tag.lower(), len(vocab)))
+
+    tags = np.zeros((n, len(vocab)), dtype=np.float32)
+    if rows:
+        tags[rows, cols] = 1.0
+    w = np.zeros(len(vocab), dtype=np.float32)
+    for tag, index in vocab.items():
+        w[index] = weights.get(tag, 0.0)
+
+    rating = np.fromiter((c.rating for c in candidates), dtype=np.float64, count=n)
+    cost = np.fromiter((c.cost for c in candidates), dtype=np.float64, count=n)
+    scores = 1.0 + rating / 5.0 + tags @ w
+    # Optional nudge towards cheaper options: price_sensitivity 1 costs one point per day's budget
+    sensitivity = float(preferences.get("price_sensitivity", 0.0))
+    if sensitivity and budget_per_day:
+        scores -= sensitivity * cost / budget_per_day
+    return scores
+
+
+def _prune(items: List[int], scores: np.ndarray, keep: int) -> List[int]:
+    """Drop items beaten on both cost and score by `keep` others; they can always be swapped out
+
+    `items` must be ordered by cost, then by descending score.
+    """
+    best: List[float] = []
+    kept = []
+    for i in items:
+        if len(best) < keep:
+            heapq.heappush(best, scores[i])
+        elif scores[i] > best[0]:
+            heapq.heapreplace(best, scores[i])
+        else:
+            continue
+        kept.append(i)
+    return kept
+
+
+class _Day:
+    """Knapsack for one day: one meal option plus up to `limit` activities"""
+
+    def __init__(self, meals: List[int], activities: List[int], units: np.ndarray,
+                 scores: np.ndarray, limit: int, size: int):
+        self.meals = meals
+        self.activities = activities
+        self.units = units
+        self.scores = scores
+        span = size + 1
+
+        # base[b]: best meal costing at most b (0 when the day has no meal options)
+        if meals:
+            base = np.full(span, _NEG)
+            for m in meals:
+                if units[m] <= size:
+                    base[units[m]:] = np.maximum(base[units[m]:], scores[m])
+        else:
+            base = np.zeros(span)
+        self.base = base
+
+        table = np.full((limit + 1, span), _NEG)
+        table[0] = base
+        self.taken = np.zeros((len(activities), limit + 1, span), dtype=bool)
+        for n, i in enumerate(activities):
+            c, s = units[i], scores[i]
+            for k in range(limit, 0, -1):
+                candidate = table[k - 1, :span - c] + s
+                row = table[k, c:]
+                np.greater(candidate, row, out=self.taken[n, k, c:])
+                np.maximum(row, candidate, out=row)
+        self.table = table
+        self.frontier = table.max(axis=0)
+
+    def choose(self, budget: int) -> Dict[str, Any]:
+        k = int(self.table[:, budget].argmax())
+        chosen = []
+        for n in range(len(self.activities) - 1, -1, -1):
+            if k and self.taken[n, k, budget]:
+                i = self.activities[n]
+                chosen.append(i)
+                budget -= self.units[i]
+                k -= 1
+        meal = None
+        if self.meals:
+            affordable = [m for m in self.meals if self.units[m] <= budget]
+            meal = max(affordable, key=lambda m: self.scores[m])
+        return {"meal": meal, "activities": chosen[::-1]}
+
+
+def optimize_budget(
+        candidates: Sequence[Candidate],
+        total_budget: float,
+        days: int,
+        per_day_budget: Optional[float] = None,
+        preferences: Optional[Dict[str, Any]] = None,
+        fixed_daily_costs: Optional[Sequence[float]] = None,
+        max_activities_per_day: int = 3,
+        resolution: Optional[int] = None
+) -> Dict[str, Any]:
+    """Highest-scoring plan within the budget (costs are rounded up to 1/resolution of it)"""
+    days = max(int(days), 1)
+    nights = max(days - 1, 1)
+    resolution = resolution or settings.budget_optimizer_resolution
+    fixed = list(fixed_daily_costs or [0.0] * days)[:days]
+    fixed += [0.0] * (days - len(fixed))
+
+    candidates = list(candidates)
+    scores = score_candidates(candidates, preferences, total_budget / days)
+    unit = max(total_budget / resolution, 1e-9)
+    costs = np.fromiter((c.cost for c in candidates), dtype=np.float64, count=len(candidates))
+    units = np.ceil(costs / unit - 1e-9).clip(min=0).astype(np.int64)
+    size = resolution
+
+    # A tier that is both pricier and worse than another is never worth solving for
+    lodging = sorted(
+        (i for i, c in enumerate(candidates) if c.category == "lodging"),
+        key=lambda i: (costs[i], -scores[i])
+    )
+    lodging = _prune(lodging, scores, 1)
+    meals = [i for i, c in enumerate(candidates) if c.category == "meal" and units[i] <= size]
+    activities = sorted(
+        (i for i, c in enumerate(candidates)
+         if c.category == "activity" and units[i] <= size and scores[i] > 0),
+        key=lambda i: (units[i], -scores[i])
+    )
+    bound: Dict[int, List[int]] = {}
+    for i in activities:
+        if candidates[i].day is not None:
+            bound.setdefault(candidates[i].day, []).append(i)
+    bound = {day: _prune(items, scores, max_activities_per_day) for day, items in bound.items()}
+
+    # Any-day activities are dealt out by score so each day gets a disjoint,
+    # comparable share; the sweep after the split lets days trade them
+    anyday = [i for i in activities if candidates[i].day is None]
+    ranked = sorted(anyday, key=lambda i: -scores[i])
+    dealt = [set(ranked[d::days]) for d in range(days)]
+
+    def solve_day(day: int, pool: List[int]) -> _Day:
+        day_meals = [i for i in meals if candidates[i].day in (None, day)]
+        day_activities = bound.get(day, []) + _prune(pool, scores, max_activities_per_day)
+        return _Day(day_meals, day_activities, units, scores, max_activities_per_day, size)
+
+    solved = [solve_day(d + 1, [i for i in anyday if i in dealt[d]]) for d in range(days)]
+    index = np.arange(size + 1)
+    padding = np.full(size, _NEG)
+
+    best = None
+    for tier in lodging or [None]:
+        nightly = costs[tier] if tier is not None else 0.0
+        remaining = total_budget - nightly * nights - sum(fixed)
+        if remaining < 0:
+            continue
+        capacity = min(int(math.floor(remaining / unit + 1e-9)), size)
+
+        total = None
+        splits, caps = [], []
+        for d, day in enumerate(solved):
+            cap = size if per_day_budget is None else per_day_budget - nightly - fixed[d]
+            if cap < 0:
+                total = None
+                break
+            cap = min(int(math.floor(cap / unit + 1e-9)), size)
+            caps.append(cap)
+            frontier = day.frontier[np.minimum(index, cap)]
+            if total is None:
+                total = frontier
+                continue
+            # combined[b, j] = total[j] + frontier[b - j], via a strided view
+            shifted = np.lib.stride_tricks.sliding_window_view(np.concatenate([padding, frontier]), size + 1)
+            combined = shifted + total[::-1][None, :]
+            split = size - combined.argmax(axis=1)
+            splits.append(split)
+            total = combined[index, size - split]
+        if total is None or not np.isfinite(total[capacity]):
+            continue
+
+        score = total[capacity] + (scores[tier] * nights if tier is not None else 0.0)
+        if best is None or score > best[0]:
+            best = (score, tier, capacity, splits, caps)
+
+    if best is None:
+        return {"feasible": False, "score": 0.0, "total_cost": 0.0, "lodging": None, "days": []}
+
+    _, tier, budget, splits, caps = best
+    # Walk the convolutions back to each day's share of the budget
+    shares = [0] * days
+    for d in range(days - 1, 0, -1):
+        j = int(splits[d - 1][budget])
+        shares[d] = budget - j
+        budget = j
+    shares[0] = budget
+
+    budgets = [min(shares[d], caps[d]) for d in range(days)]
+    choices = [solved[d].choose(budgets[d]) for d in range(days)]
+
+    # Improvement sweep: each day may swap in any any-day activity no other day uses
+    if anyday:
+        owner = {i: d for d, choice in enumerate(choices) for i in choice["activities"]}
+        for d in range(days):
+            pool = [i for i in anyday if owner.get(i, d) == d]
+            choice = solve_day(d + 1, pool).choose(budgets[d])
+            for i in choices[d]["activities"]:
+                del owner[i]
+            owner.update((i, d) for i in choice["activities"])
+            choices[d] = choice
+
+    nightly = costs[tier] if tier is not None else 0.0
+    score = scores[tier] * nights if tier is not None else 0.0
+    plan_days = []
+    total_cost = nightly * nights
+    for d, choice in enumerate(choices):
+        meal = candidates[choice["meal"]] if choice["meal"] is not None else None
+        picked = [candidates[i] for i in choice["activities"]]
+        score += sum(scores[i] for i in choice["activities"])
+        score += scores[choice["meal"]] if meal else 0.0
+        cost = sum(c.cost for c in picked) + (meal.cost if meal else 0.0) + fixed[d]
+        total_cost += cost
+        plan_days.append({
+            "day": d + 1,
+            "meal": meal.name if meal else None,
+            "meal_cost": meal.cost if meal else 0.0,
+            "activities": [{"name": c.name, "cost": c.cost} for c in picked],
+            "activities_cost": sum(c.cost for c in picked),
+            "fixed_cost": fixed[d],
+            "cost": round(cost + nightly, 2)
+        })
+
+    return {
+        "feasible": True,
+        "score": round(float(score), 3),
+        "total_cost": round(total_cost, 2),
+        "lodging": ({"name": candidates[tier].name, "per_night": nightly, "nights": nights}
+                    if tier is not None else None),
+        "days": plan_days
+    }
@@ -0,0 +1,82 @@
+"""
+Calendar events and free/busy queries
+
+Events are kept in memory in the array-backed EventStore (there is no
+calendar table yet). The store is shared by every CalendarService, so the
+agents and API endpoints all see the same calendar.
+"""
+import itertools
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+from app.services.freebusy import EventStore, FreeBusyEngine, to_epoch
+
+_store: Optional[EventStore] = None
+_events: Dict[int, Dict[str, Any]] = {}
+_ids = itertools.count(1)
+
+
+def get_event_store() -> EventStore:
+    global _store
+    if _store is None:
+        _store = EventStore()
+    return _store
+
+
+class CalendarService:
+    def __init__(self, store: Optional[EventStore] = None, events: Optional[Dict[int, Dict]] = None):
+        self.store = store if store is not None else get_event_store()
+        self.events = events if events is not None else _events
+        self.engine = FreeBusyEngine(self.store)
+
+    async def create_event(
+            self,
+            title: str,
+            start_time: datetime,
+            duration: int,
+            participants: Sequence[Hashable],
+            priority: int = 1,
+            movable: bool = True
+    ) -> Dict[str, Any]:
+        """Add an event (duration in minutes) to every participant's calendar"""
+        event = {
+            "id": next(_ids),
+            "title": title,
+            "start": start_time,
+            "end": start_time + timedelta(minutes=duration),
+            "participants": list(participants),
+            "priority": priority,  # higher stays put when events collide
+            "movable": movable,
+            "invited": []
+        }
+        self.events[event["id"]] = event
+        for participant in event["participants"]:
+            self.store.add(participant, event["id"], to_epoch(event["start"]), to_epoch(event["end"]))
+        return event
+
+    async def delete_event(self, event_id: int) -> bool:
+        event = self.events.pop(event_id, None)
+        if event is None:
+            return False
+        for participant in event["participants"]:
+            self.store.remove(participant, event_id)
+        return True
+
+    async def move_event(self, event_id: int, start_time: datetime) -> Optional[Dict[str, Any]]:
+        event = self.events.get(event_id)
+        if event is None:
+            return None
+        duration = event["end"] - event["start"]
+        for participant in event["participants"]:
+            self.store.remove(participant, event_id)
+            self.store.add(participant, event_id, to_epoch(start_time), to_epoch(start_time + duration))
+        event["start"], event["end"] = start_time, start_time + duration
+        return event
+
+    async def get_events(self, participant: Hashable, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        _, _, ids = self.store.window(participant, to_epoch(start), to_epoch(end))
+        return [self.events[int(i)] for i in ids if int(i) in self.events]
+
+    async def send_invites(self, event: Dict[str, Any], participants: Sequence[Hashable]) -> None:
+        # No mail transport for invites yet; record who was invited
+        event["invited"] = list(participants)
+        print(f"📅 Invites for '{event['title']}' sent to {len(event['invited'])} participant(s)")
@@ -0,0 +1,122 @@
+"""
+Token-aware conversation context
+
+Keeps a rolling window of recent turns under a token budget. Turns that
+fall out of the window are folded into a running summary, so the prompt
+sent for each message stays roughly the same size however long the chat.
+"""
+import inspect
+import re
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from app.core.config import settings
+
+MESSAGE_OVERHEAD = 4  # role/formatting tokens per chat message
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count (~4 characters per token for English)"""
+    return (len(text) + 3) // 4
+
+
+def count_message_tokens(message: Dict) -> int:
+    return count_tokens(message.get("content") or "") + MESSAGE_OVERHEAD
+
+
+def extractive_summary(previous: str, turns: List[Dict], budget: int) -> str:
+    """Cheap LLM-free summary: first sentence of each folded turn"""
+    lines = [previous] if previous else []
+    for turn in turns:
+        first = _SENTENCE_END.split((turn.get("content") or "").strip(), maxsplit=1)[0]
+        lines.append(f"{turn['role']}: {first[:200]}")
+
+    # Keep the most recent lines that fit the summary budget
+    kept, used = [], 0
+    for line in reversed("\n".join(lines).split("\n")):
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(reversed(kept))
+
+
+def fit_messages(messages: List[Dict], budget: int) -> List[Dict]:
+    """Drop the oldest non-system messages until the list fits the budget"""
+    costs = [count_message_tokens(m) for m in messages]
+    total = sum(costs)
+    keep = [True] * len(messages)
+    # Never drop the last message (the new prompt)
+    for i in range(len(messages) - 1):
+        if total <= budget:
+            break
+        if messages[i].get("role") != "system":
+            keep[i] = False
+            total -= costs[i]
+    return [m for m, k in zip(messages, keep) if k]
+
+
+class ConversationContext:
+    def __init__(
+            self,
+            budget: int = None,
+            summary_budget: int = None,
+            summarizer: Callable = None,
+            system_prompt: str = None
+    ):
+        self.budget = budget or settings.chat_context_token_budget
+        self.summary_budget = summary_budget or settings.chat_summary_token_budget
+        self.summarizer = summarizer
+        self.system_prompt = system_prompt
+
+        # Each turn is stored with its token count so it is only counted once
+        self._turns: Deque[Tuple[Dict, int]] = deque()
+        self._window_tokens = 0
+        self._folded: List[Dict] = []
+        self.summary = ""
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    @property
+    def window_tokens(self) -> int:
+        return self._window_tokens
+
+    def add(self, role: str, content: str) -> None:
+        message = {"role": role, "content": content}
+        tokens = count_message_tokens(message)
+        self._turns.append((message, tokens))
+        self._window_tokens += tokens
+
+        limit = self.budget - self.summary_budget
+        while self._window_tokens > limit and len(self._turns) > 1:
+            old, old_tokens = self._turns.popleft()
+            self._window_tokens -= old_tokens
+            self._folded.append(old)
+
+    async def _fold(self) -> None:
+        if not self._folded:
+            return
+        turns, self._folded = self._folded, []
+        if self.summarizer is None:
+            self.summary = extractive_summary(self.summary, turns, self.summary_budget)
+            return
+        summary = self.summarizer(self.summary, turns)
+        if inspect.isawaitable(summary):
+            summary = await summary
+        self.summary = summary
+
+    async def messages(self, prompt: Optional[str] = None) -> List[Dict]:
+        """Messages to send: system prompt, summary, recent window, new prompt"""
+        await self._fold()
+
+        messages = []
+        if self.system_prompt:
+            messages.append({"role": "system", "content": self.system_prompt})
+        if self.summary:
+            messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{self.summary}"})
+        messages.extend(message for message, _ in self._turns)
+        if prompt is not None:
+            messages.append({"role": "user", "content": prompt})
+        return messages
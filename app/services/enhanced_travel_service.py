@@ -1,8 +1,13 @@
 # backend/app/services/enhanced_travel_service.py
+import asyncio
 import json
-from typing import Dict, Any, List, Optional
+import re
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from datetime import datetime, timedelta
+from app.core.config import settings
+from app.services.budget_optimizer import Candidate, optimize_budget
 from app.services.openai_service import OpenAIService
+from app.services.stream_json import parse_json_response
 
 
 class EnhancedTravelService:
@@ -15,20 +20,20 @@ class EnhancedTravelService:
             days: int,
             budget: float,
             preferences: Dict[str, Any],
-            travel_dates: Optional[tuple] = None
+            travel_dates: Optional[tuple] = None,
+            parallel: Optional[bool] = None
     ) -> Dict[str, Any]:
         """Create AI-optimized itinerary considering multiple factors"""
 
         # Prepare context for AI
-        context = {
-            "destination": destination,
-            "duration_days": days,
-            "total_budget": budget,
-            "preferences": preferences,
-            "travel_dates": travel_dates,
-            "current_season": self._get_season(travel_dates[0] if travel_dates else datetime.now()),
-            "budget_per_day": budget / days if days > 0 else budget
-        }
+        context = self._build_context(destination, days, budget, preferences, travel_dates)
+
+        # Long trips: outline first, then generate the days concurrently
+        if parallel is None:
+            parallel = days >= settings.itinerary_parallel_min_days
+        if parallel:
+            itinerary = await self._create_itinerary_parallel(context)
+            return self._optimize_budget_allocation(itinerary, budget, preferences)
 
         # Use AI to create optimized itinerary
         prompt = self._build_itinerary_prompt(context)
@@ -38,8 +43,164 @@ class EnhancedTravelService:
         itinerary = self._parse_itinerary_response(response, context)
 
         # Optimize budget allocation
-        itinerary = self._optimize_budget_allocation(itinerary, budget)
+        itinerary = self._optimize_budget_allocation(itinerary, budget, preferences)
+
+        return itinerary
+
+    async def stream_intelligent_itinerary(
+            self,
+            destination: str,
+            days: int,
+            budget: float,
+            preferences: Dict[str, Any],
+            travel_dates: Optional[tuple] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield each day as soon as the model finishes it, then the full itinerary"""
+        context = self._build_context(destination, days, budget, preferences, travel_dates)
+        prompt = self._build_itinerary_prompt(context)
+
+        async for event in self.openai_service.stream_structured(prompt):
+            if event.kind == "item" and event.key == "daily_itinerary":
+                yield {"type": "day", "index": event.index, "day": event.value}
+            elif event.kind == "field" and event.key != "daily_itinerary":
+                yield {"type": "section", "name": event.key, "data": event.value}
+            elif event.kind == "done":
+                itinerary = self._parse_itinerary_response(event.value, context)
+                itinerary = self._optimize_budget_allocation(itinerary, budget, preferences)
+                yield {"type": "itinerary", "itinerary": itinerary}
+
+    async def _create_itinerary_parallel(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Skeleton + concurrent day blocks; wall time ~ skeleton + slowest block"""
+        semantic_key, semantic_scope = self._semantic_request(context)
+        skeleton = await self.openai_service.structured_response(
+            self._build_skeleton_prompt(context),
+            semantic_key=semantic_key,
+            semantic_scope=semantic_scope
+        )
+        outline = self._normalize_outline(skeleton, context)
+
+        size = max(settings.itinerary_days_per_block, 1)
+        blocks = [outline[i:i + size] for i in range(0, len(outline), size)]
+        results = await asyncio.gather(
+            *(self.openai_service.structured_response(self._build_day_block_prompt(context, outline, block))
+              for block in blocks),
+            return_exceptions=True
+        )
+
+        days = []
+        for block, result in zip(blocks, results):
+            generated = {}
+            if isinstance(result, dict):
+                for day in result.get("daily_itinerary") or []:
+                    if isinstance(day, dict) and day.get("day") is not None:
+                        generated[str(day["day"])] = day
+            # A failed block keeps its outline entries rather than failing the trip
+            days.extend(generated.get(str(entry["day"]), {**entry, "outline_only": True}) for entry in block)
+
+        itinerary = {
+            "daily_itinerary": self._merge_days(days),
+            "money_saving_tips": skeleton.get("money_saving_tips", []),
+            "recommended_bookings": skeleton.get("recommended_bookings", {})
+        }
+        itinerary["budget_breakdown"] = self._reconcile_budget(
+            itinerary["daily_itinerary"], context, skeleton.get("accommodation_per_night")
+        )
+        return self._parse_itinerary_response(itinerary, context)
+
+    def _normalize_outline(self, skeleton: Dict[str, Any], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """One outline entry per day, filling any the model skipped"""
+        by_day = {}
+        for entry in skeleton.get("days") or []:
+            if isinstance(entry, dict) and str(entry.get("day", "")).isdigit():
+                by_day[int(entry["day"])] = entry
+        return [
+            {**by_day.get(day, {}), "day": day,
+             "theme": by_day.get(day, {}).get("theme") or f"Explore {context['destination']}"}
+            for day in range(1, context["duration_days"] + 1)
+        ]
+
+    def _merge_days(self, days: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order days and replace activities already planned on an earlier day"""
+        seen = set()
+        merged = []
+        for day in sorted(days, key=lambda d: int(d.get("day", 0))):
+            day = dict(day)
+            for slot in ("morning", "afternoon", "evening"):
+                activity = day.get(slot)
+                name = activity.get("activity") if isinstance(activity, dict) else activity
+                if not isinstance(name, str) or not name.strip():
+                    continue
+                key = " ".join(re.findall(r"[a-z0-9]+", name.lower()))
+                if key in seen:
+                    day[slot] = {"activity": "Free time to explore", "cost": 0, "replaced_duplicate": name}
+                else:
+                    seen.add(key)
+            merged.append(day)
+        return merged
+
+    def _reconcile_budget(
+            self,
+            days: List[Dict[str, Any]],
+            context: Dict[str, Any],
+            accommodation_per_night: Any = None
+    ) -> Dict[str, Any]:
+        """Budget breakdown recomputed from the generated days' own costs"""
+        activities = sum(self._cost(day.get(slot)) for day in days for slot in ("morning", "afternoon", "evening"))
+        food = sum(self._cost(day.get("meals_cost")) for day in days)
+        transportation = sum(self._cost(day.get("transportation")) for day in days)
+        nightly = self._cost(accommodation_per_night)
+        accommodation = nightly * max(context["duration_days"] - 1, 1) if nightly else context["total_budget"] * 0.35
+
+        total = activities + food + transportation + accommodation
+        return {
+            "accommodation": round(accommodation, 2),
+            "food": round(food, 2),
+            "activities": round(activities, 2),
+            "transportation": round(transportation, 2),
+            "estimated_total": round(total, 2),
+            "remaining": round(context["total_budget"] - total, 2),
+            "over_budget": total > context["total_budget"]
+        }
+
+    @staticmethod
+    def _cost(value: Any) -> float:
+        """Cost from a number, a "$20"-style string or a {"cost": ...} dict"""
+        if isinstance(value, dict):
+            value = value.get("cost")
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        if isinstance(value, str):
+            match = re.search(r"\d+(?:\.\d+)?", value.replace(",", ""))
+            return float(match.group()) if match else 0.0
+        return 0.0
+
+    def _build_context(
+            self,
+            destination: str,
+            days: int,
+            budget: float,
+            preferences: Dict[str, Any],
+            travel_dates: Optional[tuple] = None
+    ) -> Dict[str, Any]:
+        return {
+            "destination": destination,
+            "duration_days": days,
+            "total_budget": budget,
+            "preferences": preferences,
+            "travel_dates": travel_dates,
+            "current_season": self._get_season(travel_dates[0] if travel_dates else datetime.now()),
+            "budget_per_day": budget / days if days > 0 else budget
+        }
 
+    def _parse_itinerary_response(self, response: Any, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn the model output (text or parsed JSON) into an itinerary dict"""
+        parsed = response if isinstance(response, dict) else parse_json_response(response or "")
+        itinerary = dict(parsed) if isinstance(parsed, dict) else {"raw_response": response}
+
+        itinerary.setdefault("daily_itinerary", [])
+        itinerary["destination"] = context["destination"]
+        itinerary["duration_days"] = context["duration_days"]
+        itinerary["season"] = context["current_season"]
         return itinerary
 
     def _build_itinerary_prompt(self, context: Dict[str, Any]) -> str:
@@ -68,37 +229,157 @@ class EnhancedTravelService:
         - recommended_bookings: flights, hotels if dates provided
         """
 
+    def _build_skeleton_prompt(self, context: Dict[str, Any]) -> str:
+        """Short outline prompt: one line per day, generated before the details"""
+        return f"""
+        As a travel planning expert, outline a {context['duration_days']}-day trip to {context['destination']}.
+
+        Constraints:
+        - Total budget: ${context['total_budget']} (${context['budget_per_day']:.2f} per day)
+        - Travel style: {', '.join(context['preferences'].get('travel_style', []))}
+        - Preferred activities: {', '.join(context['preferences'].get('activities', []))}
+        - Season: {context['current_season']}
+
+        Keep it short: one theme and area per day, no details.
+
+        Format as JSON with:
+        - days: array of {{day, theme, area}}
+        - accommodation_per_night: estimated cost
+        - money_saving_tips: array of tips
+        - recommended_bookings: flights, hotels if dates provided
+        """
+
+    @staticmethod
+    def _semantic_request(context: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        (key, scope) of the skeleton prompt for the semantic cache.
+
+        Travel style, activities and season are part of the scope, so they must
+        match exactly; only the free-text part (days, destination, budget) is
+        compared by similarity.
+        """
+        preferences = context["preferences"]
+        exact = [
+            ",".join(sorted(str(v).strip().lower() for v in preferences.get(field, [])))
+            for field in ("travel_style", "activities")
+        ]
+        scope = f"itinerary-skeleton|{exact[0]}|{exact[1]}|{context['current_season']}"
+        key = f"{context['duration_days']} days in {context['destination']} under ${context['total_budget']}"
+        return key, scope
+
+    def _build_day_block_prompt(
+            self,
+            context: Dict[str, Any],
+            outline: List[Dict[str, Any]],
+            block: List[Dict[str, Any]]
+    ) -> str:
+        """Detailed plan for a few days of the outline"""
+        first, last = block[0]["day"], block[-1]["day"]
+        trip_outline = "\n".join(f"        Day {d['day']}: {d['theme']} ({d.get('area', '')})" for d in outline)
+        return f"""
+        As a travel planning expert, plan days {first}-{last} of a {context['duration_days']}-day trip to {context['destination']}.
+
+        Trip outline:
+{trip_outline}
+
+        Constraints:
+        - Budget per day: ${context['budget_per_day']:.2f} including meals and local transport
+        - Preferred activities: {', '.join(context['preferences'].get('activities', []))}
+        - Season: {context['current_season']}
+        - Only plan days {first}-{last}; don't repeat activities from other days in the outline
+
+        Format as JSON with:
+        - daily_itinerary: array of days, each with day, theme, morning, afternoon, evening
+          (each {{activity, cost}}), meals_cost, transportation ({{mode, cost}})
+        """
+
     def _optimize_budget_allocation(
             self,
             itinerary: Dict[str, Any],
-            total_budget: float
+            total_budget: float,
+            preferences: Optional[Dict[str, Any]] = None,
+            candidates: Optional[List[Candidate]] = None
     ) -> Dict[str, Any]:
         """Optimize budget distribution"""
-        # Implement budget optimization logic
-        # This could use linear programming or rule-based allocation
-
-        categories = ["accommodation", "food", "activities", "transportation", "misc"]
-
-        # Simple rule-based allocation for now
-        allocation_rules = {
-            "accommodation": 0.35,  # 35% for lodging
-            "food": 0.25,  # 25% for meals
-            "activities": 0.20,  # 20% for activities
-            "transportation": 0.15,  # 15% for transport
-            "misc": 0.05  # 5% miscellaneous
-        }
+        preferences = preferences or {}
+        total_budget = max(float(total_budget or 0), 0.0)
+        days = itinerary.get("duration_days") or len(itinerary.get("daily_itinerary") or []) or 1
+        if total_budget <= 0:
+            candidates = []  # nothing to optimize against; default percentages below
+        elif candidates is None:
+            candidates = self._budget_candidates(itinerary, days)
+
+        # Keep a small reserve for misc spending, then let the optimizer choose
+        # the lodging tier, meals and activities with the best preference score
+        misc_share = 0.05
+        plan = None
+        if candidates:
+            plan = optimize_budget(
+                candidates,
+                total_budget * (1 - misc_share),
+                days,
+                per_day_budget=preferences.get("max_daily_budget"),
+                preferences=preferences,
+                fixed_daily_costs=[
+                    self._cost(day.get("transportation")) for day in itinerary.get("daily_itinerary") or []
+                ]
+            )
+
+        if plan and plan["feasible"]:
+            lodging = plan["lodging"]
+            totals = {
+                "accommodation": lodging["per_night"] * lodging["nights"] if lodging else 0.0,
+                "food": sum(day["meal_cost"] for day in plan["days"]),
+                "activities": sum(day["activities_cost"] for day in plan["days"]),
+                "transportation": sum(day["fixed_cost"] for day in plan["days"])
+            }
+            totals["misc"] = max(total_budget - sum(totals.values()), 0.0)
+            allocation_rules = {category: amount / total_budget for category, amount in totals.items()}
+            itinerary["optimized_plan"] = plan
+        else:
+            # No candidates to choose from (or nothing fits): rule-based allocation
+            allocation_rules = {
+                "accommodation": 0.35,  # 35% for lodging
+                "food": 0.25,  # 25% for meals
+                "activities": 0.20,  # 20% for activities
+                "transportation": 0.15,  # 15% for transport
+                "misc": 0.05  # 5% miscellaneous
+            }
 
         optimized_budget = {}
         for category, percentage in allocation_rules.items():
             optimized_budget[category] = {
-                "allocated": total_budget * percentage,
-                "suggested_min": total_budget * (percentage - 0.05),
-                "suggested_max": total_budget * (percentage + 0.05)
+                "allocated": round(total_budget * percentage, 2),
+                "suggested_min": round(max(total_budget * (percentage - 0.05), 0.0), 2),
+                "suggested_max": round(total_budget * (percentage + 0.05), 2)
             }
 
         itinerary["optimized_budget"] = optimized_budget
         return itinerary
 
+    def _budget_candidates(self, itinerary: Dict[str, Any], days: int) -> List[Candidate]:
+        """Optimizer candidates taken from the generated itinerary itself"""
+        candidates = []
+        for entry in itinerary.get("daily_itinerary") or []:
+            if not isinstance(entry, dict) or not str(entry.get("day", "")).isdigit():
+                continue
+            day = int(entry["day"])
+            for slot in ("morning", "afternoon", "evening"):
+                activity = entry.get(slot)
+                name = activity.get("activity") if isinstance(activity, dict) else activity
+                if isinstance(name, str) and name.strip():
+                    tags = re.findall(r"[a-z]+", name.lower())
+                    candidates.append(Candidate("activity", name, self._cost(activity), tags=tags, day=day))
+            if entry.get("meals_cost") is not None:
+                meals_cost = self._cost(entry.get("meals_cost"))
+                candidates.append(Candidate("meal", f"Day {day} meals", meals_cost, day=day))
+
+        accommodation = (itinerary.get("budget_breakdown") or {}).get("accommodation")
+        if candidates and accommodation:
+            nightly = self._cost(accommodation) / max(days - 1, 1)
+            candidates.append(Candidate("lodging", "Planned accommodation", nightly))
+        return candidates
+
     def _get_season(self, date: datetime) -> str:
         """Determine season from date"""
         month = date.month
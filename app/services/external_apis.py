@@ -1,14 +1,15 @@
 # backend/app/services/external_apis.py
-import aiohttp
 import os
 from typing import Optional, Dict, Any, List
 from datetime import datetime
+from app.core.config import settings
+from app.services.http_pool import get_http_client
 
 
 class FlightAPIService:
     def __init__(self):
         self.api_key = os.getenv("RAPIDAPI_KEY")
-        self.base_url = "https://skyscanner-api.p.rapidapi.com"
+        self.base_url = settings.flight_api_base_url.rstrip("/")
         self.headers = {
             "X-RapidAPI-Key": self.api_key,
             "X-RapidAPI-Host": "skyscanner-api.p.rapidapi.com"
@@ -23,26 +24,29 @@ class FlightAPIService:
             adults: int = 1
     ) -> List[Dict[str, Any]]:
         """Search for flights using Skyscanner API"""
-        async with aiohttp.ClientSession() as session:
-            params = {
-                "origin": origin,
-                "destination": destination,
-                "departure_date": departure_date,
-                "adults": adults
-            }
-            if return_date:
-                params["return_date"] = return_date
+        params = {
+            "origin": origin,
+            "destination": destination,
+            "departure_date": departure_date,
+            "adults": adults
+        }
+        if return_date:
+            params["return_date"] = return_date
+
+        response = await get_http_client(self.base_url).get(
+            f"{self.base_url}/flights/search",
+            headers=self.headers,
+            params=params
+        )
+        if response.status_code == 200:
+            return self._parse_flight_results(response.json())
+        else:
+            return []
 
-            async with session.get(
-                    f"{self.base_url}/flights/search",
-                    headers=self.headers,
-                    params=params
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._parse_flight_results(data)
-                else:
-                    return []
+    def _parse_flight_results(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Flight list from a search response"""
+        flights = data.get("flights", data.get("data", [])) if isinstance(data, dict) else data
+        return flights if isinstance(flights, list) else []
 
 
 class HotelAPIService:
@@ -1,14 +1,23 @@
-import httpx
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import os
 from app.core.config import settings
+from app.services.airport_index import get_airport_index
+from app.services.http_pool import get_http_client
+from app.services.resilience import ProviderGuard, get_provider_guard
+from app.services.search_cache import SearchCache, get_flight_search_cache
+
+SKYSCANNER_URL = "https://skyscanner-api.p.rapidapi.com"
 
 
 class FlightService:
-    def __init__(self):
+    def __init__(self, cache: Optional[SearchCache] = None, guard: Optional[ProviderGuard] = None):
         self.api_key = os.getenv("SKYSCANNER_API_KEY", "mock-key")
-        self.use_mock = self.api_key == "mock-key"
+        self.base_url = settings.flight_api_base_url.rstrip("/")
+        # Without a key, only a non-default (local stand-in) base URL gets real requests
+        self.use_mock = self.api_key == "mock-key" and self.base_url == SKYSCANNER_URL
+        self.cache = cache if cache is not None else get_flight_search_cache()
+        self.guard = guard if guard is not None else get_provider_guard("skyscanner")
 
     async def search_flights(
             self,
@@ -24,40 +33,73 @@ class FlightService:
         if self.use_mock:
             return self._mock_flight_search(origin, destination, departure_date, return_date)
 
-        # Real API implementation
+        # Same route, dates, cabin and party within the TTL share one provider call.
+        # Bad input is rejected here, before it can count against the provider's breaker.
         try:
-            url = "https://skyscanner-api.p.rapidapi.com/v3/flights/live/search"
-
-            headers = {
-                "X-RapidAPI-Key": self.api_key,
-                "X-RapidAPI-Host": "skyscanner-api.p.rapidapi.com"
-            }
+            key = self._search_key(origin, destination, departure_date, return_date, adults, cabin_class)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+        try:
+            return await self.cache.get_or_fetch(key, lambda: self.guard.call(lambda: self._search_provider(*key)))
+        except Exception as e:
+            print(f"Flight API error: {e}")
+            # Fail fast to the last known results, or to mock data, flagged as degraded
+            found, results, age = self.cache.fallback(key)
+            if not found:
+                results, age = self._mock_flight_search(origin, destination, departure_date, return_date), None
+            return {**results, "degraded": True, "cache": {"status": "fallback", "age_seconds": age}}
+
+    @staticmethod
+    def _search_key(origin, destination, departure_date, return_date, adults, cabin_class) -> tuple:
+        return (
+            origin.strip().upper(),
+            destination.strip().upper(),
+            _normalize_date(departure_date),
+            _normalize_date(return_date) if return_date else None,
+            int(adults),
+            cabin_class.strip().lower()
+        )
+
+    async def _search_provider(
+            self,
+            origin: str,
+            destination: str,
+            departure_date: str,
+            return_date: Optional[str],
+            adults: int,
+            cabin_class: str
+    ) -> Dict:
+        """Skyscanner live search (raises on failure)"""
+        url = f"{self.base_url}/v3/flights/live/search"
+        headers = {
+            "X-RapidAPI-Key": self.api_key,
+            "X-RapidAPI-Host": "skyscanner-api.p.rapidapi.com"
+        }
 
-            payload = {
-                "query": {
-                    "market": "US",
-                    "locale": "en-US",
-                    "currency": "USD",
-                    "queryLegs": [
-                        {
-                            "originPlaceId": {"iata": origin.upper()},
-                            "destinationPlaceId": {"iata": destination.upper()},
-                            "date": {"year": 2024, "month": 6, "day": 15}
-                        }
-                    ],
-                    "cabinClass": cabin_class.lower(),
-                    "adults": adults
-                }
+        legs = [(origin, destination, departure_date)]
+        if return_date:
+            legs.append((destination, origin, return_date))
+        payload = {
+            "query": {
+                "market": "US",
+                "locale": "en-US",
+                "currency": "USD",
+                "queryLegs": [
+                    {
+                        "originPlaceId": {"iata": leg_origin},
+                        "destinationPlaceId": {"iata": leg_destination},
+                        "date": _date_parts(leg_date)
+                    }
+                    for leg_origin, leg_destination, leg_date in legs
+                ],
+                "cabinClass": cabin_class,
+                "adults": adults
             }
+        }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload, headers=headers, timeout=30.0)
-                response.raise_for_status()
-                return response.json()
-
-        except Exception as e:
-            print(f"Flight API error: {e}")
-            return self._mock_flight_search(origin, destination, departure_date, return_date)
+        response = await get_http_client(url).post(url, json=payload, headers=headers)
+        response.raise_for_status()
+        return response.json()
 
     def _mock_flight_search(
             self,
@@ -103,20 +145,19 @@ class FlightService:
             "flights": flights
         }
 
-    async def get_airports(self, query: str) -> List[Dict]:
-        """Search airports by city/name"""
-        mock_airports = [
-            {"code": "JFK", "name": "John F Kennedy International", "city": "New York", "country": "USA"},
-            {"code": "LAX", "name": "Los Angeles International", "city": "Los Angeles", "country": "USA"},
-            {"code": "LHR", "name": "London Heathrow", "city": "London", "country": "UK"},
-            {"code": "CDG", "name": "Charles de Gaulle", "city": "Paris", "country": "France"},
-            {"code": "HND", "name": "Tokyo Haneda", "city": "Tokyo", "country": "Japan"},
-            {"code": "DXB", "name": "Dubai International", "city": "Dubai", "country": "UAE"},
-            {"code": "SYD", "name": "Sydney Kingsford Smith", "city": "Sydney", "country": "Australia"},
-        ]
-
-        query_lower = query.lower()
-        return [ap for ap in mock_airports
-                if query_lower in ap["city"].lower()
-                or query_lower in ap["name"].lower()
-                or query_lower in ap["code"].lower()]
\ No newline at end of file
+    async def get_airports(self, query: str, limit: int = 10) -> List[Dict]:
+        """Search airports by code, city or name (prefix and typo-tolerant)"""
+        return get_airport_index().search(query, limit)
+
+
+def _normalize_date(value: str) -> str:
+    """YYYY-MM-DD for any ISO date or datetime string (ValueError otherwise)"""
+    try:
+        return datetime.fromisoformat(value.strip()).date().isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid date {value!r}; expected YYYY-MM-DD") from None
+
+
+def _date_parts(value: str) -> Dict[str, int]:
+    parsed = datetime.fromisoformat(value)
+    return {"year": parsed.year, "month": parsed.month, "day": parsed.day}
@@ -0,0 +1,247 @@
+"""
+Free/busy engine for scheduling
+
+Each participant's events are kept in start-sorted NumPy arrays, so a
+window query is two binary searches. Free time for a group is the
+complement of the union of everyone's busy intervals (the same thing as
+intersecting their free slots). Off-hours and weekends are added as one
+more busy participant, and the union is computed with a sort and a running
+maximum. Candidate slots are produced on a fixed step and ranked by how
+many optional attendees can make it, how soon they are, and how much gap
+they leave around neighbouring meetings.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Intervals = Tuple[np.ndarray, np.ndarray]  # (starts, ends) in epoch seconds
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def to_epoch(value: datetime) -> int:
+    return int(value.timestamp())
+
+
+def from_epoch(seconds: int, tzinfo=None) -> datetime:
+    return datetime.fromtimestamp(int(seconds), tzinfo) if tzinfo else datetime.fromtimestamp(int(seconds))
+
+
+def merge_intervals(starts: np.ndarray, ends: np.ndarray) -> Intervals:
+    """Union of intervals as sorted, disjoint intervals (touching ones are joined)"""
+    if len(starts) == 0:
+        return _EMPTY, _EMPTY
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    reach = np.maximum.accumulate(ends)
+    first = np.empty(len(starts), dtype=bool)
+    first[0] = True
+    first[1:] = starts[1:] > reach[:-1]
+    heads = np.flatnonzero(first)
+    tails = np.append(heads[1:] - 1, len(starts) - 1)
+    return starts[heads], reach[tails]
+
+
+def complement(starts: np.ndarray, ends: np.ndarray, lo: int, hi: int) -> Intervals:
+    """Gaps between sorted disjoint intervals within [lo, hi)"""
+    starts = np.clip(starts, lo, hi)
+    ends = np.clip(ends, lo, hi)
+    gap_starts = np.concatenate(([lo], ends))
+    gap_ends = np.concatenate((starts, [hi]))
+    keep = gap_ends > gap_starts
+    return gap_starts[keep], gap_ends[keep]
+
+
+class _Timeline:
+    """One participant's events, sorted by start; appends are buffered until the next read"""
+
+    def __init__(self):
+        self.starts = _EMPTY
+        self.ends = _EMPTY
+        self.ids = _EMPTY
+        self.longest = 0  # bounds how far before a window an overlapping event can start
+        self._pending: List[Tuple[int, int, int]] = []
+        self._chunks: List[np.ndarray] = []  # bulk adds, rows of (start, end, id)
+
+    def add(self, event_id: int, start: int, end: int) -> None:
+        self._pending.append((start, end, event_id))
+        self.longest = max(self.longest, end - start)
+
+    def add_many(self, event_ids: Sequence[int], starts: Sequence[int], ends: Sequence[int]) -> None:
+        chunk = np.column_stack((starts, ends, event_ids)).astype(np.int64)
+        if len(chunk):
+            self._chunks.append(chunk)
+            self.longest = max(self.longest, int((chunk[:, 1] - chunk[:, 0]).max()))
+
+    def _flush(self) -> None:
+        if not self._pending and not self._chunks:
+            return
+        if self._pending:
+            self._chunks.append(np.array(self._pending, dtype=np.int64))
+        pending = np.concatenate(self._chunks)
+        self._pending, self._chunks = [], []
+        starts = np.concatenate((self.starts, pending[:, 0]))
+        ends = np.concatenate((self.ends, pending[:, 1]))
+        ids = np.concatenate((self.ids, pending[:, 2]))
+        order = np.argsort(starts, kind="stable")
+        self.starts, self.ends, self.ids = starts[order], ends[order], ids[order]
+
+    def remove(self, event_id: int) -> bool:
+        self._flush()
+        keep = self.ids != event_id
+        if keep.all():
+            return False
+        self.starts, self.ends, self.ids = self.starts[keep], self.ends[keep], self.ids[keep]
+        return True
+
+    def window(self, lo: int, hi: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Events overlapping [lo, hi)"""
+        self._flush()
+        left = np.searchsorted(self.starts, lo - self.longest, side="left")
+        right = np.searchsorted(self.starts, hi, side="left")
+        starts, ends, ids = self.starts[left:right], self.ends[left:right], self.ids[left:right]
+        overlapping = ends > lo
+        return starts[overlapping], ends[overlapping], ids[overlapping]
+
+    def __len__(self) -> int:
+        return len(self.starts) + len(self._pending) + sum(len(chunk) for chunk in self._chunks)
+
+
+class EventStore:
+    """Array-backed events per participant (times in epoch seconds)"""
+
+    def __init__(self):
+        self._timelines: Dict[Hashable, _Timeline] = {}
+
+    def add(self, participant: Hashable, event_id: int, start: int, end: int) -> None:
+        self._timelines.setdefault(participant, _Timeline()).add(event_id, start, end)
+
+    def add_many(self, participant: Hashable, event_ids: Sequence[int], starts: Sequence[int],
+                 ends: Sequence[int]) -> None:
+        self._timelines.setdefault(participant, _Timeline()).add_many(event_ids, starts, ends)
+
+    def remove(self, participant: Hashable, event_id: int) -> bool:
+        timeline = self._timelines.get(participant)
+        return timeline.remove(event_id) if timeline else False
+
+    def window(self, participant: Hashable, lo: int, hi: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        timeline = self._timelines.get(participant)
+        if timeline is None:
+            return _EMPTY, _EMPTY, _EMPTY
+        return timeline.window(lo, hi)
+
+    def busy(self, participants: Iterable[Hashable], lo: int, hi: int) -> Intervals:
+        """Merged busy intervals of all the participants within [lo, hi)"""
+        parts = [self.window(p, lo, hi)[:2] for p in participants]
+        if not parts:
+            return _EMPTY, _EMPTY
+        return merge_intervals(np.concatenate([s for s, _ in parts]), np.concatenate([e for _, e in parts]))
+
+    def count(self, participant: Hashable) -> int:
+        timeline = self._timelines.get(participant)
+        return len(timeline) if timeline else 0
+
+
+def off_hours(start: datetime, end: datetime, work_hours: Tuple[int, int] = (9, 17),
+              weekdays_only: bool = True) -> Intervals:
+    """Everything outside working hours between start and end, as busy intervals"""
+    lo, hi = to_epoch(start), to_epoch(end)
+    work_starts, work_ends = [], []
+    day: date = start.date() - timedelta(days=1)
+    while day <= end.date():
+        if not weekdays_only or day.weekday() < 5:
+            work_starts.append(to_epoch(datetime.combine(day, time(work_hours[0]), start.tzinfo)))
+            work_ends.append(to_epoch(datetime.combine(day, time(work_hours[1]), start.tzinfo)))
+        day += timedelta(days=1)
+    return complement(np.array(work_starts, dtype=np.int64), np.array(work_ends, dtype=np.int64), lo, hi)
+
+
+class FreeBusyEngine:
+    def __init__(self, store: EventStore):
+        self.store = store
+
+    def free_slots(
+            self,
+            participants: Sequence[Hashable],
+            start: datetime,
+            end: datetime,
+            min_minutes: int = 0,
+            work_hours: Optional[Tuple[int, int]] = (9, 17),
+            weekdays_only: bool = True
+    ) -> List[Tuple[datetime, datetime]]:
+        """Periods when every participant is free (within working hours if given)"""
+        starts, ends = self._free(participants, start, end, work_hours, weekdays_only)
+        long_enough = (ends - starts) >= min_minutes * 60
+        return [
+            (from_epoch(s, start.tzinfo), from_epoch(e, start.tzinfo))
+            for s, e in zip(starts[long_enough], ends[long_enough])
+        ]
+
+    def _free(self, participants, start, end, work_hours, weekdays_only) -> Intervals:
+        lo, hi = to_epoch(start), to_epoch(end)
+        busy_starts, busy_ends = self.store.busy(participants, lo, hi)
+        if work_hours:
+            off_starts, off_ends = off_hours(start, end, work_hours, weekdays_only)
+            busy_starts, busy_ends = merge_intervals(
+                np.concatenate((busy_starts, off_starts)), np.concatenate((busy_ends, off_ends))
+            )
+        return complement(busy_starts, busy_ends, lo, hi)
+
+    def rank_slots(
+            self,
+            participants: Sequence[Hashable],
+            duration_minutes: int,
+            start: datetime,
+            end: datetime,
+            optional: Sequence[Hashable] = (),
+            work_hours: Optional[Tuple[int, int]] = (9, 17),
+            weekdays_only: bool = True,
+            step_minutes: int = 30,
+            limit: int = 5,
+            max_candidates: int = 20000
+    ) -> List[Dict[str, Any]]:
+        """Best meeting slots where all required participants are free"""
+        duration, step = duration_minutes * 60, step_minutes * 60
+        free_starts, free_ends = self._free(participants, start, end, work_hours, weekdays_only)
+
+        # Step-aligned slot starts inside each free period, built without a Python loop
+        first = -(-free_starts // step) * step
+        counts = np.maximum((free_ends - duration - first) // step + 1, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return []
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        slots = (np.repeat(first, counts) + offsets * step)[:max_candidates]
+        slot_ends = slots + duration
+
+        # How many optional attendees are busy during each slot
+        optional_busy = np.zeros(len(slots))
+        lo, hi = to_epoch(start), to_epoch(end)
+        for person in optional:
+            starts, ends = merge_intervals(*self.store.window(person, lo, hi)[:2])
+            nxt = np.searchsorted(ends, slots, side="right")
+            busy = nxt < len(starts)
+            busy[busy] = starts[nxt[busy]] < slot_ends[busy]
+            optional_busy += busy
+
+        # Gap to the nearest meeting before and after (only real events count)
+        busy_starts, busy_ends = self.store.busy(participants, lo - 86400, hi + 86400)
+        previous_end = np.concatenate(([-np.inf], busy_ends))[np.searchsorted(busy_ends, slots, side="right")]
+        next_start = np.concatenate((busy_starts, [np.inf]))[np.searchsorted(busy_starts, slot_ends, side="left")]
+        gap_before, gap_after = slots - previous_end, next_start - slot_ends
+        buffer = np.minimum(np.minimum(gap_before, gap_after), 1800) / 1800
+
+        days_out = (slots - lo) / 86400
+        attendance = 1 - optional_busy / len(optional) if optional else np.ones(len(slots))
+        scores = 2.0 * attendance + np.exp(-days_out / 7) + 0.5 * buffer
+
+        best = np.lexsort((slots, -scores))[:limit]
+        return [
+            {
+                "start": from_epoch(slots[i], start.tzinfo),
+                "end": from_epoch(slot_ends[i], start.tzinfo),
+                "score": round(float(scores[i]), 3),
+                "optional_available": len(optional) - int(optional_busy[i])
+            }
+            for i in best
+        ]
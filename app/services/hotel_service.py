@@ -1,14 +1,23 @@
-import httpx
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import os
 import random
+from app.core.config import settings
+from app.services.http_pool import get_http_client
+from app.services.resilience import ProviderGuard, get_provider_guard
+from app.services.search_cache import SearchCache, get_hotel_search_cache
+
+BOOKING_URL = "https://booking-com.p.rapidapi.com"
 
 
 class HotelService:
-    def __init__(self):
+    def __init__(self, cache: Optional[SearchCache] = None, guard: Optional[ProviderGuard] = None):
         self.api_key = os.getenv("BOOKING_API_KEY", "mock-key")
-        self.use_mock = self.api_key == "mock-key"
+        self.base_url = settings.hotel_api_base_url.rstrip("/")
+        # Without a key, only a non-default (local stand-in) base URL gets real requests
+        self.use_mock = self.api_key == "mock-key" and self.base_url == BOOKING_URL
+        self.cache = cache if cache is not None else get_hotel_search_cache()
+        self.guard = guard if guard is not None else get_provider_guard("booking")
 
     async def search_hotels(
             self,
@@ -24,36 +33,55 @@ class HotelService:
         if self.use_mock:
             return self._mock_hotel_search(location, check_in, check_out, guests)
 
-        # Real API implementation
+        # Served from cache when possible, and stale (refreshing in the background) for a while after that
+        key = (location.strip(), check_in.strip(), check_out.strip(), int(guests), int(rooms), sort_by)
         try:
-            url = "https://booking-com.p.rapidapi.com/v1/hotels/search"
+            results, freshness = await self.cache.lookup(
+                key, lambda: self.guard.call(lambda: self._search_provider(*key))
+            )
+            return {**results, "cache": freshness}
+        except Exception as e:
+            print(f"Hotel API error: {e}")
+            # Fail fast to the last known results, or to mock data, flagged as degraded
+            found, results, age = self.cache.fallback(key)
+            if not found:
+                results, age = self._mock_hotel_search(location, check_in, check_out, guests), None
+            return {**results, "degraded": True, "cache": {"status": "fallback", "age_seconds": age}}
 
-            headers = {
-                "X-RapidAPI-Key": self.api_key,
-                "X-RapidAPI-Host": "booking-com.p.rapidapi.com"
-            }
+    async def _search_provider(
+            self,
+            location: str,
+            check_in: str,
+            check_out: str,
+            guests: int,
+            rooms: int,
+            sort_by: str
+    ) -> Dict:
+        """Booking.com hotel search (raises on failure)"""
+        url = f"{self.base_url}/v1/hotels/search"
 
-            params = {
-                "checkin_date": check_in,
-                "checkout_date": check_out,
-                "units": "metric",
-                "dest_id": location,
-                "dest_type": "city",
-                "adults_number": str(guests),
-                "order_by": sort_by,
-                "filter_by_currency": "USD",
-                "locale": "en-us",
-                "room_number": str(rooms)
-            }
+        headers = {
+            "X-RapidAPI-Key": self.api_key,
+            "X-RapidAPI-Host": "booking-com.p.rapidapi.com"
+        }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=headers, params=params, timeout=30.0)
-                response.raise_for_status()
-                return response.json()
+        params = {
+            "checkin_date": check_in,
+            "checkout_date": check_out,
+            "units": "metric",
+            "dest_id": location,
+            "dest_type": "city",
+            "adults_number": str(guests),
+            "order_by": sort_by,
+            "filter_by_currency": "USD",
+            "locale": "en-us",
+            "room_number": str(rooms),
+            "page_number": "0"
+        }
 
-        except Exception as e:
-            print(f"Hotel API error: {e}")
-            return self._mock_hotel_search(location, check_in, check_out, guests)
+        response = await get_http_client(url).get(url, headers=headers, params=params)
+        response.raise_for_status()
+        return response.json()
 
     def _mock_hotel_search(
             self,
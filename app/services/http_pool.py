@@ -0,0 +1,119 @@
+"""
+Shared HTTP clients for upstream providers
+
+One keep-alive httpx client per upstream host, created lazily and closed
+from the app lifespan, so searches reuse warm connections instead of paying
+a TCP+TLS handshake every time. HTTP/2 is used when the h2 package is
+installed. Each client's transport counts in-flight requests so pool
+utilization can be reported.
+"""
+import importlib.util
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_meters: Dict[str, "_MeteredTransport"] = {}
+
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    """Wraps the pooled transport and records how busy the pool is"""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, max_connections: int):
+        self.transport = transport
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.total_ms = 0.0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        started = time.perf_counter()
+        try:
+            return await self.transport.handle_async_request(request)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.total_ms += (time.perf_counter() - started) * 1000
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def stats(self) -> Dict:
+        # httpcore's pool is internal to httpx; report connection counts when it is reachable
+        connections = getattr(getattr(self.transport, "_pool", None), "connections", [])
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "max_connections": self.max_connections,
+            "utilization": round(self.in_flight / self.max_connections, 3),
+            "peak_utilization": round(self.peak_in_flight / self.max_connections, 3),
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "avg_latency_ms": round(self.total_ms / self.requests, 2) if self.requests else 0.0
+        }
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_http_client(url: str) -> httpx.AsyncClient:
+    """Shared client for the host of the given URL"""
+    key = _host_key(url)
+    client = _clients.get(key)
+    if client is None or client.is_closed:
+        limit = settings.http_max_connections
+        meter = _MeteredTransport(
+            httpx.AsyncHTTPTransport(
+                http2=http2_available(),
+                limits=httpx.Limits(
+                    max_connections=limit,
+                    max_keepalive_connections=settings.http_max_keepalive_connections,
+                    keepalive_expiry=settings.http_keepalive_expiry
+                ),
+                retries=1  # retry connection failures only (e.g. a keep-alive socket the server dropped)
+            ),
+            limit
+        )
+        client = httpx.AsyncClient(
+            base_url=key,
+            transport=meter,
+            timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout)
+        )
+        _clients[key], _meters[key] = client, meter
+    return client
+
+
+def pool_stats(url: Optional[str] = None) -> Dict:
+    """Utilization of every host pool (or just the one for url)"""
+    if url is not None:
+        meter = _meters.get(_host_key(url))
+        return meter.stats() if meter else {}
+    return {key: meter.stats() for key, meter in _meters.items()}
+
+
+async def close_http_clients() -> None:
+    """Close every shared client (call on application shutdown)"""
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
+    _meters.clear()
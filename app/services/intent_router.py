@@ -0,0 +1,139 @@
+"""
+Compiled intent routing
+
+All trigger phrases are compiled into one Aho-Corasick automaton, so routing
+a message is a single pass over its characters no matter how many intents
+are registered. Phrases are matched on whole words only.
+"""
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, collapse punctuation to single spaces and pad both ends"""
+    return f" {_NON_WORD.sub(' ', text.lower()).strip()} "
+
+
+@dataclass
+class IntentMatch:
+    intent: str
+    phrase: str
+    priority: int
+    start: int  # offsets into the normalized text
+    end: int
+    text: str
+
+
+class AhoCorasick:
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._lengths: List[int] = []
+
+    def add(self, pattern: str) -> int:
+        """Add a pattern and return its id"""
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        pattern_id = len(self._lengths)
+        self._lengths.append(len(pattern))
+        self._out[state].append(pattern_id)
+        return pattern_id
+
+    def build(self) -> None:
+        """Compute failure links breadth-first"""
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        """All (pattern_id, start, end) occurrences in the text"""
+        matches = []
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern_id in self._out[state]:
+                matches.append((pattern_id, i + 1 - self._lengths[pattern_id], i + 1))
+        return matches
+
+
+class IntentRouter:
+    def __init__(self):
+        self._automaton = AhoCorasick()
+        self._patterns: List[Tuple[str, str, int]] = []  # (intent, phrase, priority)
+        self._compiled = False
+
+        self.hits: Dict[str, int] = {}
+        self.misses = 0
+
+    def add(self, intent: str, phrases: List[str], priority: int = 0) -> None:
+        for phrase in phrases:
+            pattern_id = self._automaton.add(normalize(phrase))
+            assert pattern_id == len(self._patterns)
+            self._patterns.append((intent, phrase, priority))
+        self._compiled = False
+
+    def compile(self) -> None:
+        self._automaton.build()
+        self._compiled = True
+
+    def route(self, message: str) -> Optional[IntentMatch]:
+        """Best match: highest priority, then longest phrase, then earliest"""
+        if not self._compiled:
+            self.compile()
+
+        text = normalize(message)
+        best = None
+        best_key = None
+        for pattern_id, start, end in self._automaton.find(text):
+            intent, phrase, priority = self._patterns[pattern_id]
+            key = (priority, end - start, -start)
+            if best_key is None or key > best_key:
+                best_key = key
+                best = IntentMatch(intent, phrase, priority, start, end, text)
+
+        if best is None:
+            self.misses += 1
+        else:
+            self.hits[best.intent] = self.hits.get(best.intent, 0) + 1
+        return best
+
+    def reject(self, match: IntentMatch) -> None:
+        """The caller didn't use a match after all (counted as a fallthrough instead)"""
+        self.hits[match.intent] -= 1
+        if not self.hits[match.intent]:
+            del self.hits[match.intent]
+        self.misses += 1
+
+    def stats(self) -> Dict:
+        routed = sum(self.hits.values())
+        total = routed + self.misses
+        return {
+            "routed": routed,
+            "fallthrough": self.misses,
+            "hit_rate": routed / total if total else 0.0,
+            "by_intent": dict(self.hits)
+        }
@@ -0,0 +1,150 @@
+"""
+Exact-match cache for LLM responses
+
+Two tiers: a bounded in-memory LRU in front of a SQLite table with TTL,
+so repeated prompts survive restarts and are shared by workers on one host.
+The SQLite file (settings.llm_cache_path) is only created on first use.
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so indentation differences don't miss the cache"""
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+class LLMResponseCache:
+    def __init__(self, path: str = None, max_entries: int = 1024, ttl: float = 86400):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.path = path
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self.bytes_stored = 0
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Disk tier, opened (and the file created) on first use"""
+        if self._db is None and self.path:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float) -> str:
+        raw = f"{model}\x00{temperature:.3f}\x00{normalize_prompt(prompt)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                response, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    self.bytes_served += len(response)
+                    return response
+                del self._memory[key]
+
+            db = self._connection()
+            if db is not None:
+                row = db.execute(
+                    "SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[1] > now:
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    self.bytes_served += len(row[0])
+                    return row[0]
+                if row:
+                    db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, response: str, ttl: float = None) -> None:
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl)
+        with self._lock:
+            self._remember(key, response, expires_at)
+            self.bytes_stored += len(response)
+            db = self._connection()
+            if db is not None:
+                db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, response, expires_at) VALUES (?, ?, ?)",
+                    (key, response, expires_at)
+                )
+                db.commit()
+
+    def _remember(self, key: str, response: str, expires_at: float) -> None:
+        self._memory[key] = (response, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Remove expired rows from the disk tier"""
+        with self._lock:
+            db = self._connection()
+            if db is None:
+                return 0
+            cursor = db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+            db.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "bytes_served": self.bytes_served,
+            "bytes_stored": self.bytes_stored
+        }
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """Shared cache configured from settings (None when disabled)"""
+    global _response_cache
+    if not settings.llm_cache_enabled:
+        return None
+    if _response_cache is None:
+        _response_cache = LLMResponseCache(
+            path=settings.llm_cache_path,
+            max_entries=settings.llm_cache_max_entries,
+            ttl=settings.llm_cache_ttl
+        )
+    return _response_cache
@@ -0,0 +1,224 @@
+"""
+Priority scheduling for LLM calls
+
+Every completion takes a slot from the scheduler before it is sent. Slots
+are granted by priority class (interactive chat first, then synchronous
+agent runs, then background tasks), with a per-class concurrency limit and
+a number of slots only interactive calls may use, so background work never
+queues in front of someone waiting for a reply. Within a class, users are
+served round-robin, and a call that has waited past its deadline is dropped
+instead of being sent late.
+"""
+import asyncio
+import contextvars
+import enum
+import functools
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+from app.core.config import settings
+
+
+class Priority(enum.IntEnum):
+    INTERACTIVE = 0
+    AGENT = 1
+    BACKGROUND = 2
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """The call waited in the queue longer than its deadline allows"""
+
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("llm_priority", default=Priority.INTERACTIVE)
+_user: contextvars.ContextVar = contextvars.ContextVar("llm_user", default=None)
+
+
+@contextmanager
+def llm_context(priority: Priority, user_id: Any = None):
+    """Run the enclosed LLM calls with the given priority and user"""
+    priority_token = _priority.set(priority)
+    user_token = _user.set(user_id)
+    try:
+        yield
+    finally:
+        _priority.reset(priority_token)
+        _user.reset(user_token)
+
+
+def with_llm_priority(func: Callable, priority: Priority, user_id: Any = None) -> Callable:
+    """Wrap a (sync or async) callable, e.g. a background task, in llm_context"""
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with llm_context(priority, user_id):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with llm_context(priority, user_id):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@dataclass
+class _ClassConfig:
+    limit: int
+    max_wait: float
+    reserved: int = 0  # slots lower classes may not use
+
+
+class LLMScheduler:
+    def __init__(self, capacity: int, classes: Dict[Priority, _ClassConfig]):
+        self.capacity = capacity
+        self.classes = classes
+        self.in_flight: Dict[Priority, int] = {p: 0 for p in Priority}
+        # Per class: user -> FIFO of waiting futures; OrderedDict order is the round-robin
+        self._queues: Dict[Priority, "OrderedDict[Any, Deque[asyncio.Future]]"] = {
+            p: OrderedDict() for p in Priority
+        }
+
+        self.granted: Dict[Priority, int] = {p: 0 for p in Priority}
+        self.dropped: Dict[Priority, int] = {p: 0 for p in Priority}
+        self.wait_time: Dict[Priority, float] = {p: 0.0 for p in Priority}
+
+    @property
+    def total_in_flight(self) -> int:
+        return sum(self.in_flight.values())
+
+    def _can_admit(self, priority: Priority) -> bool:
+        if self.in_flight[priority] >= self.classes[priority].limit:
+            return False
+        reserved = sum(self.classes[p].reserved for p in Priority if p < priority)
+        return self.total_in_flight < self.capacity - reserved
+
+    def _queued(self, priority: Priority) -> int:
+        return sum(len(waiters) for waiters in self._queues[priority].values())
+
+    def _grant(self, priority: Priority, waited: float) -> None:
+        self.in_flight[priority] += 1
+        self.granted[priority] += 1
+        self.wait_time[priority] += waited
+
+    async def acquire(self, priority: Priority = None, user_id: Any = None, max_wait: float = None) -> Priority:
+        priority = Priority(_priority.get() if priority is None else priority)
+        user_id = _user.get() if user_id is None else user_id
+
+        queued_ahead = any(self._queued(p) for p in Priority if p <= priority)
+        if not queued_ahead and self._can_admit(priority):
+            self._grant(priority, 0.0)
+            return priority
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(user_id, deque()).append(future)
+        self._dispatch()
+        started = time.monotonic()
+        timeout = self.classes[priority].max_wait if max_wait is None else max_wait
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # Granted at the same moment; hand the slot straight back
+                self.release(priority)
+            else:
+                future.cancel()
+                self._discard(priority, user_id, future)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.dropped[priority] += 1
+            raise LLMDeadlineExceeded(
+                f"{priority.name.lower()} LLM call waited more than {timeout:.1f}s"
+            ) from None
+
+        self.wait_time[priority] += time.monotonic() - started
+        return priority
+
+    def _discard(self, priority: Priority, user_id: Any, future: asyncio.Future) -> None:
+        waiters = self._queues[priority].get(user_id)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(future)
+        except ValueError:
+            pass
+        if not waiters:
+            del self._queues[priority][user_id]
+
+    def release(self, priority: Priority) -> None:
+        self.in_flight[priority] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiters: by priority, then round-robin by user"""
+        for priority in Priority:
+            queues = self._queues[priority]
+            while queues and self._can_admit(priority):
+                user_id, waiters = next(iter(queues.items()))
+                future = waiters.popleft()
+                if waiters:
+                    queues.move_to_end(user_id)
+                else:
+                    del queues[user_id]
+                if future.done():
+                    continue
+                self._grant(priority, 0.0)
+                future.set_result(True)
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = None, user_id: Any = None, max_wait: float = None):
+        granted = await self.acquire(priority, user_id, max_wait)
+        try:
+            yield
+        finally:
+            self.release(granted)
+
+    def stats(self) -> Dict:
+        return {
+            "capacity": self.capacity,
+            "classes": {
+                p.name.lower(): {
+                    "in_flight": self.in_flight[p],
+                    "queued": self._queued(p),
+                    "granted": self.granted[p],
+                    "dropped": self.dropped[p],
+                    "avg_wait_ms": 1000 * self.wait_time[p] / self.granted[p] if self.granted[p] else 0.0
+                }
+                for p in Priority
+            }
+        }
+
+
+_scheduler: Optional[LLMScheduler] = None
+
+
+def get_scheduler() -> LLMScheduler:
+    """Shared scheduler configured from settings"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = LLMScheduler(
+            capacity=settings.openai_max_concurrency,
+            classes={
+                Priority.INTERACTIVE: _ClassConfig(
+                    limit=settings.openai_max_concurrency,
+                    max_wait=settings.llm_interactive_max_wait,
+                    reserved=settings.llm_interactive_reserved
+                ),
+                Priority.AGENT: _ClassConfig(
+                    limit=settings.llm_agent_limit,
+                    max_wait=settings.llm_agent_max_wait
+                ),
+                Priority.BACKGROUND: _ClassConfig(
+                    limit=settings.llm_background_limit,
+                    max_wait=settings.llm_background_max_wait
+                )
+            }
+        )
+    return _scheduler
+
+
+def reset_scheduler() -> None:
+    global _scheduler
+    _scheduler = None
@@ -1,55 +1,286 @@
 """
 OpenAI API service
 """
+import asyncio
+import httpx
 import openai
-from typing import Dict, Any, List
+from typing import Dict, AsyncIterator, List, Optional, Union
 from app.core.config import settings
+from app.services.batching import MicroBatcher
+from app.services.context_manager import ConversationContext, fit_messages
+from app.services.llm_cache import LLMResponseCache, get_response_cache
+from app.services.llm_scheduler import get_scheduler, reset_scheduler
+from app.services.semantic_cache import SemanticCache, get_semantic_cache
+from app.services.stream_json import IncrementalJSONParser, JSONEvent, parse_json_response
+
+# Shared per-process client; created lazily and closed from the app lifespan
+_async_client: Optional[openai.AsyncOpenAI] = None
+
+
+def get_async_client() -> openai.AsyncOpenAI:
+    """Return the shared async client (one connection pool per worker)"""
+    global _async_client
+    if _async_client is None:
+        limit = settings.openai_max_concurrency
+        _async_client = openai.AsyncOpenAI(
+            # Local stand-in servers don't check the key
+            api_key=settings.openai_api_key or ("local" if settings.openai_base_url else None),
+            base_url=settings.openai_base_url,
+            timeout=settings.openai_timeout,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+                timeout=settings.openai_timeout
+            )
+        )
+    return _async_client
+
+
+async def close_async_client() -> None:
+    """Close the shared client (call on application shutdown)"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+    _async_client = None
+    reset_scheduler()
+
 
 class OpenAIService:
-    def __init__(self):
-        openai.api_key = settings.openai_api_key
-        self.client = openai.OpenAI()
-    
-    async def chat(self, prompt: str, context: List[Dict] = None) -> str:
-        """Basic chat completion"""
-        messages = context or []
-        messages.append({"role": "user", "content": prompt})
-        
-        response = self.client.chat.completions.create(
-            model=settings.openai_model,
-            messages=messages,
-            temperature=0.7
+    def __init__(
+            self,
+            client=None,
+            timeout: Optional[float] = None,
+            cache: Optional[LLMResponseCache] = None,
+            semantic_cache: Optional[SemanticCache] = None
+    ):
+        # A custom client (e.g. a fake backend in benchmarks) can be injected
+        self._client = client
+        self.timeout = timeout or settings.openai_timeout
+        self.cache = cache if cache is not None else get_response_cache()
+        self.semantic_cache = semantic_cache if semantic_cache is not None else get_semantic_cache()
+        self._sentiment_batcher: Optional[MicroBatcher] = None
+
+    @property
+    def client(self):
+        return self._client or get_async_client()
+
+    async def _create(self, messages: List[Dict], temperature: float = 0.7, **kwargs):
+        return await asyncio.wait_for(
+            self.client.chat.completions.create(
+                model=settings.openai_model,
+                messages=messages,
+                temperature=temperature,
+                **kwargs
+            ),
+            timeout=self.timeout
         )
-        
-        return response.choices[0].message.content
-    
-    async def structured_response(self, prompt: str, schema: Dict = None) -> Dict:
-        """Get structured JSON response"""
+
+    async def _complete(self, messages: List[Dict], temperature: float = 0.7, **kwargs):
+        """Run one completion without blocking the event loop"""
+        async with get_scheduler().slot():
+            return await self._create(messages, temperature, **kwargs)
+
+    async def _messages(self, prompt: str, context: Union[List[Dict], ConversationContext, None]) -> List[Dict]:
+        """Build the request messages without mutating the caller's context"""
+        if isinstance(context, ConversationContext):
+            return await context.messages(prompt)
+        messages = list(context or [])
+        messages.append({"role": "user", "content": prompt})
+        return fit_messages(messages, settings.chat_context_token_budget)
+
+    async def chat(self, prompt: str, context: Union[List[Dict], ConversationContext] = None) -> str:
+        """Basic chat completion"""
+        messages = await self._messages(prompt, context)
+
+        response = await self._complete(messages)
+        content = response.choices[0].message.content
+
+        if isinstance(context, ConversationContext):
+            context.add("user", prompt)
+            context.add("assistant", content or "")
+        return content
+
+    async def chat_with_tools(
+            self,
+            messages: List[Dict],
+            tools: List[Dict],
+            temperature: float = 0.7,
+            tool_choice: Optional[str] = None
+    ):
+        """One function-calling turn; returns the assistant message (content and/or tool_calls)"""
+        kwargs = {"tool_choice": tool_choice} if tool_choice else {}
+        response = await self._complete(messages, temperature, tools=tools, **kwargs)
+        return response.choices[0].message
+
+    async def stream_chat(
+            self,
+            prompt: str,
+            context: Union[List[Dict], ConversationContext] = None
+    ) -> AsyncIterator[str]:
+        """Chat completion yielding content tokens as they arrive"""
+        messages = await self._messages(prompt, context)
+
+        # The slot stays taken until the stream is drained
+        parts = []
+        async with get_scheduler().slot():
+            stream = await self._create(messages, stream=True)
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+
+        # Only completed turns are recorded
+        if isinstance(context, ConversationContext):
+            context.add("user", prompt)
+            context.add("assistant", "".join(parts))
+
+    async def cached_chat(
+            self,
+            prompt: str,
+            temperature: float = 0.7,
+            semantic_key: Optional[str] = None,
+            semantic_scope: str = ""
+    ) -> str:
+        """
+        Context-free completion served from the response caches when possible.
+
+        The exact tier keys on the whole prompt. The semantic tier is only used
+        when the caller passes semantic_key: the variable, user-supplied part of
+        the prompt (destination, days, budget...). Embedding the full prompt
+        lets the shared template text dominate, so different requests look
+        alike. semantic_scope keeps different prompt templates apart.
+        """
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(prompt, settings.openai_model, temperature)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        # Paraphrases of an earlier request reuse its answer
+        semantic = self.semantic_cache if semantic_key else None
+        scope = f"{settings.openai_model}:{temperature:.3f}:{semantic_scope}"
+        if semantic is not None:
+            similar = semantic.lookup(semantic_key, scope=scope)
+            if similar is not None:
+                if key is not None:
+                    self.cache.set(key, similar)
+                return similar
+
+        response = (await self._complete(
+            [{"role": "user", "content": prompt}], temperature
+        )).choices[0].message.content
+        if response:
+            if key is not None:
+                self.cache.set(key, response)
+            if semantic is not None:
+                semantic.add(semantic_key, response, scope=scope)
+        return response
+
+    async def get_completion(self, prompt: str) -> str:
+        """Single-prompt completion without conversation context"""
+        return await self.chat(prompt)
+
+    async def structured_response(
+            self,
+            prompt: str,
+            schema: Dict = None,
+            semantic_key: Optional[str] = None,
+            semantic_scope: str = ""
+    ) -> Dict:
+        """Get structured JSON response (see cached_chat for semantic_key)"""
         if schema:
             prompt += f"\n\nReturn JSON matching schema: {schema}"
-        
-        response = await self.chat(prompt)
-        
-        # Parse JSON from response
-        import json
-        try:
-            # Find JSON in response
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            json_str = response[start:end]
-            return json.loads(json_str)
-        except:
+
+        response = await self.cached_chat(prompt, semantic_key=semantic_key, semantic_scope=semantic_scope)
+
+        # Parse JSON from response (repairs truncated output)
+        parsed = parse_json_response(response or "")
+        if not isinstance(parsed, dict):
             return {"raw_response": response}
-    
+        return parsed
+
+    async def stream_structured(self, prompt: str, schema: Dict = None) -> AsyncIterator[JSONEvent]:
+        """Structured response streamed field by field as the model writes it"""
+        if schema:
+            prompt += f"\n\nReturn JSON matching schema: {schema}"
+
+        parser = IncrementalJSONParser()
+        parts = []
+        async for token in self.stream_chat(prompt):
+            parts.append(token)
+            for event in parser.feed(token):
+                yield event
+
+        result = parser.close()
+        if not isinstance(result, dict):
+            result = {"raw_response": "".join(parts)}
+        yield JSONEvent("done", None, result)
+
     async def analyze_sentiment(self, text: str) -> Dict:
-        """Analyze sentiment and intent"""
-        prompt = f"""
-        Analyze: "{text}"
-        
+        """Analyze sentiment and intent (batched with concurrent callers)"""
+        return await self.sentiment_batcher.submit(text)
+
+    async def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict]:
+        """Analyze many texts with one LLM round trip per batch"""
+        unique = list(dict.fromkeys(texts))
+        size = settings.sentiment_batch_size
+        chunks = [unique[i:i + size] for i in range(0, len(unique), size)]
+
+        results = {}
+        for chunk, analyses in zip(chunks, await asyncio.gather(
+                *(self._analyze_chunk(chunk) for chunk in chunks))):
+            results.update(zip(chunk, analyses))
+        return [results[text] for text in texts]
+
+    async def _analyze_chunk(self, texts: List[str]) -> List[Dict]:
+        if len(texts) == 1:
+            prompt = f"""
+        Analyze: "{texts[0]}"
+
         Return JSON with:
         - sentiment (positive/negative/neutral)
         - urgency (high/medium/low)
         - intent (book, inquire, cancel, etc.)
         - key_details (extracted entities)
         """
-        return await self.structured_response(prompt)
\ No newline at end of file
+            return [await self.structured_response(prompt)]
+
+        numbered = "\n".join(f'{i + 1}. "{text}"' for i, text in enumerate(texts))
+        prompt = f"""
+        Analyze each numbered text:
+        {numbered}
+
+        Return JSON with:
+        - results: array with one object per text, in the same order, each with
+          - index (the text's number)
+          - sentiment (positive/negative/neutral)
+          - urgency (high/medium/low)
+          - intent (book, inquire, cancel, etc.)
+          - key_details (extracted entities)
+        """
+        response = await self.structured_response(prompt)
+
+        by_index = {}
+        for position, item in enumerate(response.get("results") or []):
+            if not isinstance(item, dict):
+                continue
+            try:
+                index = int(item.pop("index", position + 1))
+            except (TypeError, ValueError):
+                index = position + 1
+            by_index[index] = item
+        return [by_index.get(i + 1, {"raw_response": response.get("raw_response")})
+                for i in range(len(texts))]
+
+    @property
+    def sentiment_batcher(self) -> MicroBatcher:
+        if self._sentiment_batcher is None:
+            self._sentiment_batcher = MicroBatcher(
+                self.analyze_sentiment_batch,
+                max_batch=settings.sentiment_batch_size,
+                max_wait=settings.sentiment_batch_wait_ms / 1000
+            )
+        return self._sentiment_batcher
@@ -0,0 +1,162 @@
+"""
+Incremental conflict resolution for calendar events
+
+Only events that overlap the changed ones are looked at. The lower-priority
+(or immovable-vs-movable) event of each clashing pair is moved to the
+nearest start where all its participants are free, searched within a
+bounded horizon around where it was. If there is no such gap, it may take
+the place of strictly lower-priority movable events, which are then
+resolved the same way. Priorities strictly decrease along such a chain, and
+the total number of moves is capped, so a write never turns into a
+whole-calendar recomputation.
+"""
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.services.calendar_service import CalendarService
+from app.services.freebusy import _EMPTY, complement, from_epoch, merge_intervals, off_hours, to_epoch
+
+
+class ConflictResolver:
+    def __init__(
+            self,
+            calendar: CalendarService,
+            horizon_days: int = 7,
+            work_hours: Optional[Tuple[int, int]] = (9, 17),
+            max_moves: int = 50,
+            not_before: Optional[datetime] = None
+    ):
+        self.calendar = calendar
+        self.horizon = timedelta(days=horizon_days)
+        self.work_hours = work_hours
+        self.max_moves = max_moves
+        self.not_before = not_before
+
+    def overlapping(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Other events that share a participant with this one and overlap it"""
+        lo, hi = to_epoch(event["start"]), to_epoch(event["end"])
+        ids = set()
+        for participant in event["participants"]:
+            ids.update(int(i) for i in self.calendar.store.window(participant, lo, hi)[2])
+        ids.discard(event["id"])
+        return [self.calendar.events[i] for i in sorted(ids) if i in self.calendar.events]
+
+    def find_conflicts(self, participant, start: datetime, end: datetime) -> List[int]:
+        """Ids of the participant's events that overlap another of their events in [start, end)"""
+        starts, ends, ids = self.calendar.store.window(participant, to_epoch(start), to_epoch(end))
+        if len(starts) < 2:
+            return []
+        # Sorted by start: an event clashes with an earlier one if it starts before the latest end so far
+        reach = np.maximum.accumulate(ends)
+        clash = np.zeros(len(starts), dtype=bool)
+        clash[1:] = starts[1:] < reach[:-1]
+        # ...and with a later one if it ends after the next start
+        clash[:-1] |= ends[:-1] > starts[1:]
+        return [int(i) for i in ids[clash]]
+
+    async def resolve(self, event_ids: Iterable[int]) -> Dict[str, Any]:
+        """Move events until the given ones (and whatever they push aside) no longer clash"""
+        pinned: Set[int] = set(event_ids)
+        queue = deque(sorted(pinned))
+        moved: Dict[int, Dict[str, Any]] = {}
+        unresolved: List[Dict[str, Any]] = []
+
+        while queue:
+            event = self.calendar.events.get(queue.popleft())
+            if event is None:
+                continue
+            for other in self.overlapping(event):
+                if not self._overlaps(event, other):
+                    continue  # already moved out of the way
+                loser = self._loser(event, other, pinned)
+                if loser is None or len(moved) >= self.max_moves:
+                    unresolved.append({"events": [event["id"], other["id"]], "reason":
+                                       "neither event can move" if loser is None else "move limit reached"})
+                    continue
+                placement = self._place(loser)
+                if placement is None:
+                    unresolved.append({"events": [event["id"], other["id"]],
+                                       "reason": f"no free time for event {loser['id']} nearby"})
+                    continue
+                start, bumped = placement
+                original = loser["start"]
+                await self.calendar.move_event(loser["id"], start)
+                moved.setdefault(loser["id"], {"id": loser["id"], "title": loser["title"], "from": original})
+                moved[loser["id"]]["to"] = start
+                queue.extend(bumped)
+                if loser is event:
+                    break
+
+        return {"moved": list(moved.values()), "unresolved": unresolved}
+
+    @staticmethod
+    def _overlaps(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+        return a["start"] < b["end"] and b["start"] < a["end"]
+
+    @staticmethod
+    def _loser(a: Dict[str, Any], b: Dict[str, Any], pinned: Set[int]) -> Optional[Dict[str, Any]]:
+        """Which of two clashing events should move, or None if neither can"""
+        if not a["movable"] or not b["movable"]:
+            return b if b["movable"] else a if a["movable"] else None
+        if a["priority"] != b["priority"]:
+            return a if a["priority"] < b["priority"] else b
+        if (a["id"] in pinned) != (b["id"] in pinned):
+            return b if a["id"] in pinned else a  # the event that was just written stays put
+        return a if (a["start"], a["id"]) > (b["start"], b["id"]) else b
+
+    def _place(self, event: Dict[str, Any]) -> Optional[Tuple[datetime, List[int]]]:
+        """Nearest start with everyone free, else nearest one that only displaces lower-priority events"""
+        duration = event["end"] - event["start"]
+        start, end = event["start"] - self.horizon, event["end"] + self.horizon
+        if self.not_before is not None:
+            start = max(start, self.not_before)
+        if end - start < duration:
+            return None
+        lo, hi = to_epoch(start), to_epoch(end)
+
+        hard_starts, hard_ends, soft_starts, soft_ends, soft_ids = [], [], [], [], []
+        for participant in event["participants"]:
+            starts, ends, ids = self.calendar.store.window(participant, lo, hi)
+            soft = np.array([self._is_soft(int(i), event) for i in ids], dtype=bool)
+            own = ids == event["id"]
+            hard_starts.append(starts[~soft & ~own])
+            hard_ends.append(ends[~soft & ~own])
+            soft_starts.append(starts[soft])
+            soft_ends.append(ends[soft])
+            soft_ids.append(ids[soft])
+        if self.work_hours:
+            off_starts, off_ends = off_hours(start, end, self.work_hours)
+            hard_starts.append(off_starts)
+            hard_ends.append(off_ends)
+
+        hard = merge_intervals(np.concatenate(hard_starts), np.concatenate(hard_ends))
+        target, length = to_epoch(event["start"]), int(duration.total_seconds())
+        everything = merge_intervals(np.concatenate([hard[0], *soft_starts]), np.concatenate([hard[1], *soft_ends]))
+
+        for busy in (everything, hard):
+            best = self._nearest(*complement(*busy, lo, hi), target, length)
+            if best is not None:
+                break
+        else:
+            return None
+
+        starts, ends, ids = (np.concatenate(parts) if parts else _EMPTY
+                             for parts in (soft_starts, soft_ends, soft_ids))
+        bumped = ids[(starts < best + length) & (ends > best)]
+        return from_epoch(best, event["start"].tzinfo), sorted({int(i) for i in bumped})
+
+    def _is_soft(self, event_id: int, mover: Dict[str, Any]) -> bool:
+        other = self.calendar.events.get(event_id)
+        return other is not None and other["movable"] and other["priority"] < mover["priority"]
+
+    @staticmethod
+    def _nearest(free_starts: np.ndarray, free_ends: np.ndarray, target: int, length: int) -> Optional[int]:
+        """Start closest to target that fits entirely inside one of the free intervals"""
+        fits = (free_ends - free_starts) >= length
+        if not fits.any():
+            return None
+        candidates = np.clip(target, free_starts[fits], free_ends[fits] - length)
+        return int(candidates[np.argmin(np.abs(candidates - target))])
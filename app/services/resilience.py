@@ -0,0 +1,266 @@
+"""
+Circuit breakers and hedged requests for upstream providers
+
+Each provider gets a ProviderGuard. Its circuit breaker watches the last N
+calls and opens when too many failed or were slow. While open, calls
+fail immediately with CircuitOpenError, so callers can answer from cache
+or a degraded fallback instead of waiting on a sick provider. After a
+cool-down, a single trial call decides whether it closes again.
+
+Only provider faults count against the breaker: timeouts, transport
+errors and 5xx responses. Caller errors (bad input, 4xx responses) are
+raised as usual without touching the breaker, so one user's bad request
+can't cut everyone else off.
+
+Calls also get a hard deadline, and a hedged second request once the first
+has been running longer than the provider's recent p95. Whichever request
+answers first wins and the other is cancelled. Hedges come out of a small
+token bucket refilled by a fraction of each call, so a burst of slow calls
+can't all be hedged, and they stop entirely while many recent calls were
+slow: then the provider itself is struggling and a second request only
+adds to its load.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+import numpy as np
+
+from app.core.config import settings
+
+
+def is_provider_failure(error: BaseException) -> bool:
+    """Whether an error is the provider's fault (and should count against its breaker)"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, (asyncio.TimeoutError, httpx.TransportError))
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"{provider} circuit is open (retry in {retry_in:.0f}s)")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+            self,
+            window: int = 50,
+            min_calls: int = 10,
+            failure_rate: float = 0.5,
+            slow_call_seconds: float = 5.0,
+            slow_call_rate: float = 0.8,
+            open_seconds: float = 30.0
+    ):
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.calls: deque = deque(maxlen=window)  # (failed, slow) per call
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_running = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._trial_running:
+            self._trial_running = True  # one trial call at a time
+            return True
+        return False
+
+    def abandon(self) -> None:
+        """A call was cancelled before it finished; let another one be the trial"""
+        if self.state == self.HALF_OPEN:
+            self._trial_running = False
+
+    def retry_in(self) -> float:
+        return max(self.open_seconds - (time.monotonic() - self.opened_at), 0.0)
+
+    def record(self, ok: bool, seconds: float) -> None:
+        if self.state == self.HALF_OPEN:
+            self._trial_running = False
+            if ok and seconds < self.slow_call_seconds:
+                self.state = self.CLOSED
+                self.calls.clear()
+            else:
+                self._open()
+            return
+
+        self.calls.append((not ok, seconds >= self.slow_call_seconds))
+        if self.state == self.CLOSED and len(self.calls) >= self.min_calls:
+            failed = sum(f for f, _ in self.calls) / len(self.calls)
+            slow = sum(s for _, s in self.calls) / len(self.calls)
+            if failed >= self.failure_rate or slow >= self.slow_call_rate:
+                self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def slow_rate(self) -> float:
+        """Fraction of the recent calls that were slow"""
+        return sum(s for _, s in self.calls) / len(self.calls) if self.calls else 0.0
+
+    def stats(self) -> Dict:
+        calls = len(self.calls)
+        return {
+            "state": self.state,
+            "recent_calls": calls,
+            "failure_rate": round(sum(f for f, _ in self.calls) / calls, 3) if calls else 0.0,
+            "slow_rate": round(self.slow_rate(), 3),
+            "times_opened": self.times_opened
+        }
+
+
+class ProviderGuard:
+    def __init__(
+            self,
+            name: str,
+            breaker: Optional[CircuitBreaker] = None,
+            timeout: float = 10.0,
+            hedge: bool = True,
+            hedge_max_rate: float = 0.1,
+            hedge_burst: float = 5.0,
+            hedge_max_slow_rate: float = 0.2,
+            hedge_min_samples: int = 20,
+            is_failure: Callable[[BaseException], bool] = is_provider_failure
+    ):
+        self.name = name
+        self.is_failure = is_failure
+        self.breaker = breaker or CircuitBreaker()
+        self.timeout = timeout
+        self.hedge = hedge
+        self.hedge_max_rate = hedge_max_rate
+        self.hedge_burst = hedge_burst
+        self.hedge_max_slow_rate = hedge_max_slow_rate
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_tokens = 0.0  # each call adds hedge_max_rate, each hedge spends 1
+        self.latencies: deque = deque(maxlen=200)  # seconds, successful requests
+        self.calls = 0
+        self.short_circuited = 0
+        self.caller_errors = 0
+        self.hedges = 0
+        self.hedges_won = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Recent p95 latency, once there are enough samples to trust it"""
+        if not self.hedge or len(self.latencies) < self.hedge_min_samples:
+            return None
+        return float(np.percentile(self.latencies, 95))
+
+    async def call(self, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fetch() under the breaker, the deadline and hedging"""
+        if not self.breaker.allow():
+            self.short_circuited += 1
+            raise CircuitOpenError(self.name, self.breaker.retry_in())
+
+        self.calls += 1
+        self.hedge_tokens = min(self.hedge_tokens + self.hedge_max_rate, self.hedge_burst)
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self._hedged(fetch), self.timeout)
+        except asyncio.TimeoutError:
+            self.breaker.record(False, time.perf_counter() - started)
+            raise asyncio.TimeoutError(f"{self.name} did not answer within {self.timeout:g}s")
+        except asyncio.CancelledError:
+            # A caller giving up isn't the provider's fault
+            self.breaker.abandon()
+            raise
+        except Exception as e:
+            if self.is_failure(e):
+                self.breaker.record(False, time.perf_counter() - started)
+            else:
+                # The caller's fault: no verdict on the provider (frees a half-open trial)
+                self.caller_errors += 1
+                self.breaker.abandon()
+            raise
+        self.breaker.record(True, time.perf_counter() - started)
+        return result
+
+    async def _hedged(self, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        primary = asyncio.ensure_future(self._attempt(fetch))
+        pending = {primary}
+        try:
+            delay = self.hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done and self._may_hedge():
+                    self.hedge_tokens -= 1
+                    self.hedges += 1
+                    pending.add(asyncio.ensure_future(self._attempt(fetch)))
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _may_hedge(self) -> bool:
+        return self.hedge_tokens >= 1 and self.breaker.slow_rate() < self.hedge_max_slow_rate
+
+    async def _attempt(self, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.perf_counter()
+        result = await fetch()
+        self.latencies.append(time.perf_counter() - started)
+        return result
+
+    def stats(self) -> Dict:
+        delay = self.hedge_delay()
+        return {
+            **self.breaker.stats(),
+            "calls": self.calls,
+            "short_circuited": self.short_circuited,
+            "caller_errors": self.caller_errors,
+            "p95_ms": round(delay * 1000, 1) if delay is not None else None,
+            "hedges": self.hedges,
+            "hedges_won": self.hedges_won
+        }
+
+
+_guards: Dict[str, ProviderGuard] = {}
+
+
+def get_provider_guard(name: str) -> ProviderGuard:
+    """Guard shared by every caller of the named provider"""
+    guard = _guards.get(name)
+    if guard is None:
+        guard = _guards[name] = ProviderGuard(
+            name,
+            CircuitBreaker(
+                window=settings.breaker_window,
+                min_calls=settings.breaker_min_calls,
+                failure_rate=settings.breaker_failure_rate,
+                slow_call_seconds=settings.breaker_slow_call_seconds,
+                slow_call_rate=settings.breaker_slow_call_rate,
+                open_seconds=settings.breaker_open_seconds
+            ),
+            timeout=settings.provider_call_timeout,
+            hedge=settings.hedge_enabled,
+            hedge_max_rate=settings.hedge_max_rate,
+            hedge_burst=settings.hedge_burst,
+            hedge_max_slow_rate=settings.hedge_max_slow_rate
+        )
+    return guard
+
+
+def provider_stats() -> Dict[str, Dict]:
+    return {name: guard.stats() for name, guard in _guards.items()}
@@ -0,0 +1,155 @@
+"""
+Cache for provider search results
+
+Entries are fresh for a TTL and the least recently used ones are evicted
+beyond max_entries. With a longer hard TTL, an entry past its (soft) TTL
+is still served immediately while a background call refreshes it
+(stale-while-revalidate); only past the hard TTL do callers wait for the
+provider. Concurrent misses and refreshes for the same key share a single
+upstream call: the first caller starts it and the rest await the same
+task, which is shielded so one caller's cancellation doesn't fail the
+others. Failed calls are not cached. Expired entries are kept for a
+further fallback_ttl so callers can still answer (flagged as degraded)
+while the provider is down.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from app.core.config import settings
+
+
+class SearchCache:
+    def __init__(self, ttl: float = 300.0, max_entries: int = 2048, hard_ttl: Optional[float] = None,
+                 fallback_ttl: float = 0.0):
+        self.ttl = ttl
+        self.hard_ttl = max(ttl, hard_ttl or 0.0)
+        self.fallback_ttl = fallback_ttl
+        self.max_entries = max_entries
+        # key -> (stored at, fresh until, usable until, kept until, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, float, float, float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refresh_errors = 0
+
+    def _entry(self, key: Hashable) -> Optional[Tuple[float, float, float, float, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] < time.monotonic():
+            if entry[3] < time.monotonic():
+                del self._entries[key]
+            return None
+        return entry
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entry(key)
+        if entry is None:
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[4]
+
+    def fallback(self, key: Hashable) -> Tuple[bool, Any, float]:
+        """(found, value, age in seconds) for an entry kept past its TTLs, for use during outages"""
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None or entry[3] < now:
+            return False, None, 0.0
+        return True, entry[4], round(now - entry[0], 1)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.monotonic()
+        ttl = self.ttl if ttl is None else ttl
+        usable_until = now + max(ttl, self.hard_ttl)
+        self._entries[key] = (now, now + ttl, usable_until, usable_until + self.fallback_ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value for key, else the result of fetch() (shared with concurrent callers)"""
+        value, _ = await self.lookup(key, fetch)
+        return value
+
+    async def lookup(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Tuple[Any, Dict]:
+        """(value, freshness) where freshness says whether it was fresh, stale or fetched, and how old"""
+        entry = self._entry(key)
+        if entry is not None:
+            stored, fresh_until, _, _, value = entry
+            self._entries.move_to_end(key)
+            now = time.monotonic()
+            if now < fresh_until:
+                self.hits += 1
+                return value, {"status": "fresh", "age_seconds": round(now - stored, 1)}
+            # Past the soft TTL: answer now, refresh in the background
+            self.stale_hits += 1
+            if key not in self._inflight:
+                self._start(key, fetch)
+            return value, {"status": "stale", "age_seconds": round(now - stored, 1), "refreshing": True}
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = self._start(key, fetch)
+        return await asyncio.shield(task), {"status": "miss", "age_seconds": 0.0}
+
+    def _start(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = asyncio.ensure_future(fetch())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._store(key, done))
+        return task
+
+    def _store(self, key: Hashable, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            if self._entry(key) is not None:
+                # A failed background refresh keeps serving the stale entry until the hard TTL
+                self.refresh_errors += 1
+                print(f"⚠️ Background refresh failed: {task.exception()}")
+            return
+        if self.ttl > 0:
+            self.set(key, task.result())
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refresh_errors": self.refresh_errors
+        }
+
+
+_flight_cache: Optional[SearchCache] = None
+
+
+def get_flight_search_cache() -> SearchCache:
+    """Flight search cache shared by every FlightService"""
+    global _flight_cache
+    if _flight_cache is None:
+        _flight_cache = SearchCache(settings.flight_cache_ttl, settings.flight_cache_max_entries,
+                                    fallback_ttl=settings.search_cache_fallback_ttl)
+    return _flight_cache
+
+
+_hotel_cache: Optional[SearchCache] = None
+
+
+def get_hotel_search_cache() -> SearchCache:
+    """Hotel search cache shared by every HotelService (served stale while refreshing)"""
+    global _hotel_cache
+    if _hotel_cache is None:
+        _hotel_cache = SearchCache(settings.hotel_cache_ttl, settings.hotel_cache_max_entries,
+                                   hard_ttl=settings.hotel_cache_hard_ttl,
+                                   fallback_ttl=settings.search_cache_fallback_ttl)
+    return _hotel_cache
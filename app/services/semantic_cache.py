@@ -0,0 +1,202 @@
+"""
+Semantic cache for LLM responses
+
+Reuses answers for paraphrased requests ("5 days in Tokyo under $2000" vs
+"Tokyo, five days, max $2k"). Texts are embedded with a local hashing
+vectorizer and kept in one contiguous NumPy matrix; lookups are a single
+matrix-vector product plus a top-k selection.
+
+Entries should be keyed on the variable part of a prompt (the user's
+request), not the full prompt: a long shared template outweighs the few
+words that differ, and different requests end up above the threshold.
+"""
+import math
+import re
+import threading
+import zlib
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+_TOKEN = re.compile(r"\d+(?:[.,]\d+)*k?|[a-z]+")
+
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "at",
+    "by", "from", "is", "are", "be", "i", "me", "my", "we", "our", "you", "your",
+    "it", "this", "that", "please", "can", "could", "would", "want", "need",
+    "about", "around", "under", "over", "max", "maximum", "up", "usd", "dollars"
+}
+
+_WORD_NUMBERS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fourteen": 14,
+    "fifteen": 15, "twenty": 20, "thirty": 30
+}
+
+
+def _number(token: str) -> Optional[str]:
+    """Canonical form of a numeric token ("2k" and "2,000" -> "2000")"""
+    if token in _WORD_NUMBERS:
+        return str(_WORD_NUMBERS[token])
+    if not token[0].isdigit():
+        return None
+    scale = 1000 if token.endswith("k") else 1
+    token = token.rstrip("k").replace(",", "")
+    try:
+        value = float(token) * scale
+    except ValueError:
+        return None
+    return str(int(value)) if value.is_integer() else f"{value:g}"
+
+
+class PromptVectorizer:
+    """Hashed bag-of-words embedding with number normalization"""
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def tokens(self, text: str) -> Tuple[List[str], FrozenSet[str]]:
+        words, numbers = [], set()
+        for token in _TOKEN.findall(text.lower().replace("$", " ")):
+            number = _number(token)
+            if number is not None:
+                numbers.add(number)
+                words.append(number)
+            elif token not in _STOPWORDS:
+                # Light stemming so "days" and "day" share a feature
+                words.append(token[:-1] if len(token) > 3 and token.endswith("s") else token)
+        return words, frozenset(numbers)
+
+    def embed(self, text: str) -> Tuple[np.ndarray, FrozenSet[str]]:
+        """Term-frequency vector (un-normalized) and the prompt's numbers"""
+        words, numbers = self.tokens(text)
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in words:
+            vector[zlib.crc32(word.encode("utf-8")) % self.dim] += 1.0
+        return vector, numbers
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache over prompt embeddings.
+
+    Features are IDF-weighted at query time, so words that appear in every
+    cached prompt (shared template text) count for little and the parts that
+    vary (destination, dates, budget) decide the match. A candidate must also
+    contain exactly the same numbers as the query, so "5 days" never reuses a
+    "6 days" answer however similar the wording.
+    """
+
+    def __init__(self, max_entries: int = 2048, threshold: float = 0.9, dim: int = 512):
+        self.vectorizer = PromptVectorizer(dim)
+        self.max_entries = max_entries
+        self.threshold = threshold
+
+        self._matrix = np.zeros((max_entries, dim), dtype=np.float32)
+        self._squared = np.zeros((max_entries, dim), dtype=np.float32)
+        self._df = np.zeros(dim, dtype=np.float32)
+        self._responses: List[Optional[str]] = [None] * max_entries
+        self._numbers: List[FrozenSet[str]] = [frozenset()] * max_entries
+        self._scopes: List[Optional[str]] = [None] * max_entries
+        self._signatures = np.full(max_entries, -1, dtype=np.int64)
+        self._size = 0
+        self._next = 0  # ring-buffer write position once full
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _signature(numbers: FrozenSet[str], scope: Optional[str]) -> int:
+        """Cheap pre-filter so only entries with the same numbers are scored"""
+        return zlib.crc32(f"{scope}\x00{','.join(sorted(numbers))}".encode("utf-8"))
+
+    def _weights(self) -> np.ndarray:
+        return np.log((self._size + 1) / (self._df + 1)).astype(np.float32) + 1.0
+
+    def search(self, prompt: str, k: int = 5, scope: str = None) -> List[Tuple[float, str]]:
+        """Top-k (similarity, response) pairs among entries with the same numbers"""
+        query, numbers = self.vectorizer.embed(prompt)
+        with self._lock:
+            if self._size == 0 or not query.any():
+                return []
+
+            rows = np.flatnonzero(self._signatures[:self._size] == self._signature(numbers, scope))
+            if rows.size == 0:
+                return []
+
+            w2 = self._weights() ** 2
+            # Weighted cosine: (M * w) . (q * w) / (|M * w| |q * w|)
+            dots = self._matrix[rows] @ (query * w2)
+            norms = np.sqrt(self._squared[rows] @ w2) * math.sqrt(float((query * query) @ w2))
+            scores = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+            k = min(k, rows.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            return [
+                (float(scores[i]), self._responses[rows[i]])
+                for i in top
+                if self._numbers[rows[i]] == numbers and self._scopes[rows[i]] == scope
+            ]
+
+    def lookup(self, prompt: str, scope: str = None) -> Optional[str]:
+        """Best cached response above the similarity threshold"""
+        for score, response in self.search(prompt, k=5, scope=scope):
+            if score >= self.threshold:
+                self.hits += 1
+                return response
+            break
+        self.misses += 1
+        return None
+
+    def add(self, prompt: str, response: str, scope: str = None) -> None:
+        vector, numbers = self.vectorizer.embed(prompt)
+        if not vector.any():
+            return
+        with self._lock:
+            row = self._next
+            if self._size == self.max_entries:
+                # Overwrite the oldest entry
+                self._df -= self._matrix[row] > 0
+            else:
+                self._size += 1
+            self._matrix[row] = vector
+            self._squared[row] = vector * vector
+            self._df += vector > 0
+            self._responses[row] = response
+            self._numbers[row] = numbers
+            self._scopes[row] = scope
+            self._signatures[row] = self._signature(numbers, scope)
+            self._next = (row + 1) % self.max_entries
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+_semantic_cache: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Shared semantic cache configured from settings (None when disabled)"""
+    global _semantic_cache
+    if not settings.semantic_cache_enabled:
+        return None
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(
+            max_entries=settings.semantic_cache_max_entries,
+            threshold=settings.semantic_cache_threshold
+        )
+    return _semantic_cache
@@ -0,0 +1,174 @@
+"""
+Incremental JSON parsing for streamed LLM output
+
+Feeds on completion tokens as they arrive and reports each top-level field
+of the response object (and each element of a top-level array field, such
+as the days of "daily_itinerary") as soon as it closes. When the stream is
+cut short, close() repairs the text instead of requiring a retry.
+"""
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+@dataclass
+class JSONEvent:
+    kind: str  # "item" (element of a top-level array), "field" or "done"
+    key: Optional[str]
+    value: Any
+    index: Optional[int] = None
+
+
+def _closers(stack: Tuple[str, ...]) -> str:
+    return "".join("}" if c == "{" else "]" for c in reversed(stack))
+
+
+def _loads(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        # LLMs often leave a trailing comma before a closing bracket
+        return json.loads(_TRAILING_COMMA.sub(r"\1", text))
+
+
+class IncrementalJSONParser:
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._start = None  # index of the opening "{"
+        self._end = None
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+
+        self._key = None
+        self._field_start = 0
+        self._item_start = 0
+        self._item_index = 0
+        # Last point where the text can be cut and closed into valid JSON
+        self._safe: Tuple[int, Tuple[str, ...]] = (0, ())
+
+    @property
+    def complete(self) -> bool:
+        return self._end is not None
+
+    def feed(self, chunk: str) -> List[JSONEvent]:
+        """Consume more text; return the fields/items completed by it"""
+        self._text += chunk
+        events = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._end is not None:
+                break
+            if self._start is None:
+                # Skip any prose or code fence before the object
+                if c == "{":
+                    self._start = i
+                    self._stack = ["{"]
+                    self._field_start = i + 1
+                    self._safe = (i + 1, ("{",))
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                continue
+
+            depth = len(self._stack)
+            if c == '"':
+                self._in_string = True
+            elif c in "{[":
+                self._stack.append(c)
+                if depth == 1 and c == "[":
+                    self._item_start = i + 1
+                    self._item_index = 0
+                self._safe = (i + 1, tuple(self._stack))
+            elif c == ":" and depth == 1:
+                try:
+                    self._key = json.loads(text[self._field_start:i].strip())
+                except ValueError:
+                    self._key = None
+            elif c == ",":
+                if depth == 1:
+                    self._emit_field(text[self._field_start:i], events)
+                    self._field_start = i + 1
+                elif depth == 2 and self._stack[1] == "[":
+                    self._emit_item(text[self._item_start:i], events)
+                    self._item_start = i + 1
+                self._safe = (i, tuple(self._stack))
+            elif c in "}]":
+                if depth == 2 and self._stack[1] == "[":
+                    self._emit_item(text[self._item_start:i], events)
+                elif depth == 1:
+                    self._emit_field(text[self._field_start:i], events)
+                self._stack.pop()
+                self._safe = (i + 1, tuple(self._stack))
+                if not self._stack:
+                    self._end = i + 1
+
+        self._pos = len(text)
+        return events
+
+    def _emit_item(self, segment: str, events: List[JSONEvent]) -> None:
+        if not segment.strip():
+            return
+        try:
+            value = _loads(segment)
+        except ValueError:
+            return
+        events.append(JSONEvent("item", self._key, value, self._item_index))
+        self._item_index += 1
+
+    def _emit_field(self, segment: str, events: List[JSONEvent]) -> None:
+        if not segment.strip():
+            return
+        try:
+            field = _loads("{" + segment + "}")
+        except ValueError:
+            return
+        for key, value in field.items():
+            events.append(JSONEvent("field", key, value))
+
+    def close(self) -> Optional[dict]:
+        """The whole object, repairing truncated output where possible"""
+        if self._start is None:
+            return None
+        if self._end is not None:
+            try:
+                return _loads(self._text[self._start:self._end])
+            except ValueError:
+                return None
+
+        # Close the open string and brackets; failing that, cut back to the
+        # last complete value and close from there
+        head = self._text[self._start:]
+        if self._in_string:
+            # Drop a dangling escape so the added quote really closes the string
+            head = (head[:-1] if self._escape else head) + '"'
+        safe_pos, safe_stack = self._safe
+        candidates = [
+            head + _closers(tuple(self._stack)),
+            self._text[self._start:safe_pos] + _closers(safe_stack)
+        ]
+        for candidate in candidates:
+            try:
+                return _loads(candidate)
+            except ValueError:
+                continue
+        return None
+
+
+def parse_json_response(text: str) -> Optional[dict]:
+    """Parse the first JSON object in an LLM response, repairing truncation"""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.close()
@@ -0,0 +1,169 @@
+"""
+Background agent tasks with checkpointed, resumable execution
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.agents.step_graph import Checkpoint
+from app.core.database import SessionLocal
+from app.models.task import Task, TaskStatus
+from app.schemas.task import TaskCreate
+
+
+class TaskCheckpoint(Checkpoint):
+    """Step results saved to Task.result_data["checkpoints"], progress to Task.progress"""
+
+    def __init__(self, task_id: int, completed: Optional[Dict[str, Any]] = None):
+        super().__init__(completed)
+        self.task_id = task_id
+
+    @classmethod
+    def load(cls, task_id: int) -> "TaskCheckpoint":
+        db = SessionLocal()
+        try:
+            task = db.query(Task).filter(Task.id == task_id).first()
+            result_data = (task.result_data if task else None) or {}
+            return cls(task_id, result_data.get("checkpoints"))
+        finally:
+            db.close()
+
+    async def save(self, name: str, result: Any, progress: int) -> None:
+        try:
+            json.dumps(result)
+        except (TypeError, ValueError):
+            print(f"⚠️ Step '{name}' result is not JSON serializable; not checkpointed")
+            return
+        await super().save(name, result, progress)
+
+        db = SessionLocal()
+        try:
+            task = db.query(Task).filter(Task.id == self.task_id).first()
+            if task is None:
+                return
+            # Reassign rather than mutate so SQLAlchemy sees the JSON change
+            task.result_data = {**(task.result_data or {}), "checkpoints": dict(self.completed)}
+            task.progress = max(task.progress or 0, min(progress, 99))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Error saving checkpoint for task {self.task_id}: {e}")
+        finally:
+            db.close()
+
+
+class TaskService:
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+
+    async def create_task(self, task: TaskCreate) -> int:
+        """Store a new pending task"""
+        db = SessionLocal()
+        try:
+            record = Task(
+                user_id=self.user_id,
+                task_type=task.task_type,
+                description=task.description,
+                input_data=task.input_data or {},
+                status=TaskStatus.PENDING,
+                progress=0
+            )
+            db.add(record)
+            db.commit()
+            db.refresh(record)
+            return record.id
+        finally:
+            db.close()
+
+    async def get_task(self, task_id: int) -> Optional[Dict]:
+        db = SessionLocal()
+        try:
+            task = db.query(Task).filter(Task.id == task_id, Task.user_id == self.user_id).first()
+            return self._to_dict(task) if task else None
+        finally:
+            db.close()
+
+    async def requeue_task(self, task_id: int) -> Optional[Dict]:
+        """Mark a task pending again for a retry; its checkpoints are kept"""
+        db = SessionLocal()
+        try:
+            task = db.query(Task).filter(Task.id == task_id, Task.user_id == self.user_id).first()
+            if task is None:
+                return None
+            task.status = TaskStatus.PENDING
+            task.error_message = None
+            db.commit()
+            db.refresh(task)
+            return self._to_dict(task)
+        finally:
+            db.close()
+
+    async def process_task(self, task_id: int) -> None:
+        """Run the task's agent, resuming from its checkpoints if it ran before"""
+        db = SessionLocal()
+        try:
+            task = db.query(Task).filter(Task.id == task_id).first()
+            if task is None or task.status == TaskStatus.COMPLETED:
+                return
+            task_type, input_data = task.task_type, dict(task.input_data or {})
+            task.status = TaskStatus.PROCESSING
+            task.error_message = None
+            db.commit()
+        finally:
+            db.close()
+
+        try:
+            agent = self._agent_for(task_type)
+            agent.checkpoint = TaskCheckpoint.load(task_id)
+            result = await agent.execute(input_data)
+            error = result.get("error") if result.get("status") == "error" else None
+        except Exception as e:
+            result, error = None, str(e)
+
+        self._finish(task_id, result, error)
+
+    def _agent_for(self, task_type: str):
+        if task_type == "travel":
+            from app.agents.travel_agent import TravelAgent
+            return TravelAgent(self.user_id)
+        if task_type == "calendar":
+            from app.agents.calendar_agent import CalendarAgent
+            return CalendarAgent(self.user_id)
+        raise ValueError(f"Unknown task type: {task_type}")
+
+    def _finish(self, task_id: int, result: Optional[Dict], error: Optional[str]) -> None:
+        db = SessionLocal()
+        try:
+            task = db.query(Task).filter(Task.id == task_id).first()
+            if task is None:
+                return
+            result_data = dict(task.result_data or {})
+            if error:
+                # Checkpoints stay so the next run resumes after the last completed step
+                task.status = TaskStatus.FAILED
+                task.error_message = error
+            else:
+                result_data["result"] = result
+                task.status = TaskStatus.COMPLETED
+                task.progress = 100
+                task.completed_at = datetime.utcnow()
+            task.result_data = result_data
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Error finishing task {task_id}: {e}")
+        finally:
+            db.close()
+
+    def _to_dict(self, task: Task) -> Dict:
+        return {
+            "id": task.id,
+            "task_type": task.task_type,
+            "description": task.description,
+            "input_data": task.input_data,
+            "status": task.status.value if task.status else TaskStatus.PENDING.value,
+            "progress": task.progress or 0,
+            "result_data": task.result_data,
+            "error_message": task.error_message,
+            "created_at": task.created_at,
+            "completed_at": task.completed_at
+        }
@@ -1,5 +1,6 @@
 # app/services/travel_service.py - DATABASE VERSION
 import json
+import threading
 from typing import Dict, List, Optional
 from datetime import datetime
 from app.core.database import SessionLocal
@@ -15,11 +16,22 @@ class TravelService:
             "adventure": ["New Zealand", "Costa Rica", "Iceland", "Norway"]
         }
 
-    def plan_trip(self, destination: str, days: int, user_id: Optional[int] = None) -> Dict:
-        """Create and save trip plan to database"""
+    def plan_trip(
+            self,
+            destination: str,
+            days: int,
+            user_id: Optional[int] = None,
+            cancelled: Optional[threading.Event] = None
+    ) -> Dict:
+        """Create and save trip plan to database (not saved if `cancelled` is set by then)"""
         # 1. Create the plan
         plan = self._create_plan(destination, days)
 
+        # The caller gave up waiting (e.g. a timed-out trip search): don't store a trip nobody saw
+        if cancelled is not None and cancelled.is_set():
+            plan["saved"] = False
+            return plan
+
         # 2. Save to database
         db = SessionLocal()
         try:
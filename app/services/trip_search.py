@@ -0,0 +1,119 @@
+"""
+Combined trip search
+
+Flights, hotels and the trip plan are fetched concurrently, each under its
+own time budget, and yielded in the order they finish, so a client can
+show each section as soon as it is ready instead of waiting for the
+slowest one. A source that fails or runs out of time yields a section
+with status "error" or "timeout"; the others are unaffected.
+"""
+import asyncio
+import threading
+import time
+from datetime import date
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from app.core.config import settings
+from app.services.airport_index import get_airport_index
+from app.services.flight_service import FlightService
+from app.services.hotel_service import HotelService
+from app.services.travel_service import TravelService
+
+
+class TripSearch:
+    def __init__(
+            self,
+            flights: Optional[FlightService] = None,
+            hotels: Optional[HotelService] = None,
+            travel: Optional[TravelService] = None
+    ):
+        self.flights = flights or FlightService()
+        self.hotels = hotels or HotelService()
+        self.travel = travel or TravelService()
+
+    def budgets(self) -> Dict[str, float]:
+        return {
+            "flights": settings.trip_search_flights_budget,
+            "hotels": settings.trip_search_hotels_budget,
+            "plan": settings.trip_search_plan_budget
+        }
+
+    async def stream(
+            self,
+            destination: str,
+            check_in: str,
+            check_out: str,
+            origin: Optional[str] = None,
+            travelers: int = 1,
+            days: Optional[int] = None,
+            user_id: Optional[int] = None,
+            budgets: Optional[Dict[str, float]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """One section per source, as each one finishes"""
+        if days is None:
+            try:
+                days = max((date.fromisoformat(check_out) - date.fromisoformat(check_in)).days, 1)
+            except ValueError:
+                days = 3
+        sources: Dict[str, Callable[[], Awaitable[Any]]] = {
+            "hotels": lambda: self.hotels.search_hotels(destination, check_in, check_out, guests=travelers),
+            "plan": lambda: self._plan(destination, days, user_id)
+        }
+        if origin:
+            sources["flights"] = lambda: self.flights.search_flights(
+                _airport_code(origin), _airport_code(destination), check_in, check_out, adults=travelers
+            )
+        budgets = {**self.budgets(), **(budgets or {})}
+
+        started = time.perf_counter()
+        tasks = [
+            asyncio.ensure_future(self._section(name, fetch, budgets[name], started))
+            for name, fetch in sources.items()
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # The client went away (or the caller stopped early): stop the remaining searches
+            for task in tasks:
+                task.cancel()
+
+    async def _plan(self, destination: str, days: int, user_id: Optional[int]) -> Dict[str, Any]:
+        # plan_trip writes the trip with a blocking session, so keep it off the event loop.
+        # The thread can't be interrupted; once the section times out (or the client
+        # leaves) it is told not to save its result.
+        cancelled = threading.Event()
+        try:
+            return await asyncio.to_thread(self.travel.plan_trip, destination, days, user_id, cancelled)
+        finally:
+            cancelled.set()
+
+    @staticmethod
+    async def _section(name: str, fetch: Callable[[], Awaitable[Any]], budget: float,
+                       started: float) -> Dict[str, Any]:
+        section: Dict[str, Any] = {"source": name}
+        try:
+            section["data"] = await asyncio.wait_for(fetch(), budget)
+            section["status"] = "ok"
+            # The services report some failures (e.g. bad input) in the payload rather than raising
+            if isinstance(section["data"], dict) and section["data"].get("status") == "error":
+                section["status"] = "error"
+                section["error"] = section.pop("data").get("message", f"{name} search failed")
+        except asyncio.TimeoutError:
+            section["status"] = "timeout"
+            section["error"] = f"{name} took longer than {budget:g}s"
+        except Exception as e:
+            print(f"❌ Trip search {name} error: {e}")
+            section["status"] = "error"
+            section["error"] = str(e)
+        section["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return section
+
+
+def _airport_code(place: str) -> str:
+    """IATA code for a code or a city name (best autocomplete match)"""
+    index = get_airport_index()
+    # Only a code the index knows; "Rio" is a place name, not a code
+    if place.strip().lower() in index.by_code:
+        return place.strip().upper()
+    matches = index.search(place, 1)
+    return matches[0]["code"] if matches else place
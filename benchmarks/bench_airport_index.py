@@ -0,0 +1,58 @@
+# benchmarks/bench_airport_index.py - airport autocomplete latency at full-dataset size
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.airport_index import DEFAULT_PATH, AirportIndex
+
+SIZE = int(os.getenv("BENCH_AIRPORTS", "10000"))
+RUNS = int(os.getenv("BENCH_RUNS", "2000"))
+QUERIES = ["l", "lo", "lon", "london", "heathrow", "JFK", "new york", "san fran", "lndon", "tokio", "int", "airport"]
+
+SYLLABLES = ["ka", "lo", "ma", "ri", "to", "sa", "ne", "po", "vi", "da", "ber", "gen", "ton", "ville", "burg", "an"]
+KINDS = ["International", "Regional", "Municipal", "County", "Field", "Airpark"]
+
+
+def synthetic(size, existing):
+    """Bundled airports plus generated ones with unused codes, up to size entries"""
+    rng = random.Random(7)
+    used = {a["code"] for a in existing}
+    codes = ["".join(c) for c in itertools.product("ABCDEFGHIJKLMNOPQRSTUVWXYZ", repeat=3) if "".join(c) not in used]
+    rng.shuffle(codes)
+    airports = list(existing)
+    for code in codes[:size - len(existing)]:
+        city = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+        airports.append({
+            "code": code, "city": city, "country": rng.choice(["US", "BR", "CA", "AU", "RU", "CN"]),
+            "name": f"{city} {rng.choice(KINDS)} Airport",
+            "type": rng.choices(["large_airport", "medium_airport", "small_airport"], [1, 4, 10])[0]
+        })
+    return airports
+
+
+def main():
+    airports = synthetic(SIZE, AirportIndex.from_csv(DEFAULT_PATH).airports)
+    started = time.perf_counter()
+    index = AirportIndex(airports)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    print(f"✈️  {len(index)} airports, {len(index.tokens)} postings, {len(index.vocab)} distinct words; "
+          f"built in {build_ms:.0f} ms")
+    for query in QUERIES:
+        timings = []
+        for _ in range(RUNS):
+            started = time.perf_counter()
+            results = index.search(query, 10)
+            timings.append((time.perf_counter() - started) * 1e6)
+        timings.sort()
+        print(f"   {query!r:12} median {statistics.median(timings):6.1f} µs   p99 {timings[int(RUNS * 0.99)]:6.1f} µs"
+              f"   -> {', '.join(a['code'] for a in results[:3])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/bench_budget_optimizer.py - solve time of the itinerary budget optimizer
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.budget_optimizer import Candidate, optimize_budget
+
+CANDIDATES = int(os.getenv("BENCH_CANDIDATES", "3000"))
+DAYS = int(os.getenv("BENCH_DAYS", "10"))
+RUNS = int(os.getenv("BENCH_RUNS", "20"))
+TAGS = ["museum", "food", "history", "nightlife", "nature", "art", "shopping", "beach"]
+
+
+def make_candidates(rng: random.Random, count: int, days: int):
+    candidates = [Candidate("lodging", f"Hotel tier {i}", rng.uniform(60, 400), rng.uniform(2, 5)) for i in range(5)]
+    candidates += [Candidate("meal", f"Meal plan {i}", rng.uniform(20, 120), rng.uniform(2, 5)) for i in range(20)]
+    candidates += [
+        Candidate(
+            "activity", f"Activity {i}", rng.uniform(0, 150), rng.uniform(1, 5), rng.sample(TAGS, 2),
+            # Half can be done on any day, the rest are tied to a specific day
+            day=rng.choice([None] * days + list(range(1, days + 1)))
+        )
+        for i in range(count)
+    ]
+    return candidates
+
+
+def main():
+    rng = random.Random(7)
+    candidates = make_candidates(rng, CANDIDATES, DAYS)
+    preferences = {"activities": ["food", "art"], "travel_style": ["history"]}
+    budget = 400 * DAYS
+
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        plan = optimize_budget(candidates, budget, DAYS, per_day_budget=budget / DAYS * 1.25, preferences=preferences)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    print(f"💰 {len(candidates)} candidates, {DAYS} days, budget ${budget:.0f}")
+    print(f"   median solve: {statistics.median(timings):8.1f} ms")
+    print(f"   worst solve:  {max(timings):8.1f} ms")
+    print(f"   plan cost:    ${plan['total_cost']:.2f}, score {plan['score']}, lodging {plan['lodging']['name']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# benchmarks/bench_freebusy.py - free/busy and slot ranking across many busy calendars
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.freebusy import EventStore, FreeBusyEngine, to_epoch
+
+PARTICIPANTS = int(os.getenv("BENCH_PARTICIPANTS", "50"))
+EVENTS = int(os.getenv("BENCH_EVENTS", "10000"))  # per participant
+RUNS = int(os.getenv("BENCH_RUNS", "20"))
+
+
+def timed(func, runs=RUNS):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    rng = np.random.default_rng(11)
+    origin = datetime(2024, 1, 1, 0, 0)
+    span = 2 * 365 * 86400  # two years of history and future
+
+    store = EventStore()
+    started = time.perf_counter()
+    for person in range(PARTICIPANTS):
+        starts = to_epoch(origin) + rng.integers(0, span // 900, EVENTS) * 900
+        ends = starts + rng.choice([1800, 3600, 5400], EVENTS)
+        store.add_many(person, np.arange(EVENTS) + person * EVENTS, starts, ends)
+    engine = FreeBusyEngine(store)
+    everyone = list(range(PARTICIPANTS))
+    # First query sorts the buffered events
+    engine.free_slots(everyone, origin, origin + timedelta(days=1))
+    load_ms = (time.perf_counter() - started) * 1000
+
+    week = origin + timedelta(days=300)
+    few, many = everyone[:5], everyone
+    rank_ms, slots = timed(lambda: engine.rank_slots(few, 30, week, week + timedelta(days=14), optional=everyone[5:10]))
+    group_ms, free = timed(lambda: engine.free_slots(many, week, week + timedelta(days=14), work_hours=None))
+    year_ms, _ = timed(lambda: engine.free_slots(many, origin, origin + timedelta(days=365), work_hours=None), runs=5)
+
+    print(f"📅 {PARTICIPANTS} participants x {EVENTS} events")
+    print(f"   load + sort:                     {load_ms:8.1f} ms")
+    print(f"   rank slots, 5+5 people, 2 weeks: {rank_ms:8.2f} ms (best {slots[0]['start'] if slots else None})")
+    print(f"   free time, all, 2 weeks:         {group_ms:8.2f} ms ({len(free)} periods)")
+    print(f"   free time, all, 1 year:          {year_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
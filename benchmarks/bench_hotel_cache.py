@@ -0,0 +1,59 @@
+# benchmarks/bench_hotel_cache.py - hotel search latency with and without the stale-while-revalidate cache
+import asyncio
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.hotel_service import HotelService
+from app.services.search_cache import SearchCache
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "2000"))
+CITIES = int(os.getenv("BENCH_CITIES", "20"))
+RATE = float(os.getenv("BENCH_RATE", "400"))  # requests per second
+PROVIDER_MS = float(os.getenv("BENCH_PROVIDER_MS", "300"))  # median; lognormal tail
+
+
+async def run(cache):
+    rng = random.Random(3)
+    service = HotelService(cache=cache)
+    service.use_mock = False
+
+    async def provider(*key):
+        await asyncio.sleep(rng.lognormvariate(0.0, 0.8) * PROVIDER_MS / 1000)
+        return {"status": "success", "hotels": []}
+
+    service._search_provider = provider
+    latencies = []
+
+    async def one(city):
+        started = time.perf_counter()
+        await service.search_hotels(f"city-{city}", "2025-06-15", "2025-06-18")
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    tasks = []
+    for _ in range(REQUESTS):
+        # Zipf-ish popularity across cities
+        tasks.append(asyncio.ensure_future(one(min(int(rng.paretovariate(1.2)) - 1, CITIES - 1))))
+        await asyncio.sleep(rng.expovariate(RATE))
+    await asyncio.gather(*tasks)
+    return np.percentile(latencies, [50, 99])
+
+
+async def main():
+    # TTLs scaled down so the run crosses them many times
+    uncached = await run(SearchCache(ttl=0))
+    coalesced = await run(SearchCache(ttl=0.5))
+    swr = await run(SearchCache(ttl=0.5, hard_ttl=60))
+    print(f"🏨 {REQUESTS} searches over {CITIES} cities at {RATE:.0f}/s, provider median {PROVIDER_MS:.0f} ms")
+    for name, (p50, p99) in (("no cache (coalescing only)", uncached), ("TTL cache", coalesced),
+                             ("stale-while-revalidate", swr)):
+        print(f"   {name:27s} p50 {p50:7.1f} ms   p99 {p99:7.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+# benchmarks/bench_http_pool.py - fresh client per request vs the shared keep-alive pool, over local TLS
+import asyncio
+import datetime
+import os
+import ssl
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "200"))
+BODY = b'{"flights": []}'
+
+
+def self_signed_cert(directory):
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+            .serial_number(x509.random_serial_number()).not_valid_before(now)
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False)
+            .sign(key, hashes.SHA256()))
+    cert_path, key_path = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                  serialization.NoEncryption()))
+    return cert_path, key_path
+
+
+async def serve(reader, writer):
+    try:
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: %d\r\n\r\n%s" % (len(BODY), BODY))
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError, ssl.SSLError):
+        writer.close()
+
+
+async def timed(call):
+    timings = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), sorted(timings)[int(len(timings) * 0.95)]
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = self_signed_cert(directory)
+        os.environ["SSL_CERT_FILE"] = cert_path  # httpx trusts it via trust_env
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(cert_path, key_path)
+        server = await asyncio.start_server(serve, "127.0.0.1", 0, ssl=context)
+        url = f"https://localhost:{server.sockets[0].getsockname()[1]}/search"
+
+        from app.services.http_pool import close_http_clients, get_http_client, pool_stats
+
+        async def fresh():
+            async with httpx.AsyncClient() as client:
+                (await client.get(url)).raise_for_status()
+
+        async def pooled():
+            (await get_http_client(url).get(url)).raise_for_status()
+
+        fresh_ms = await timed(fresh)
+        pooled_ms = await timed(pooled)
+        stats = pool_stats(url)
+        await close_http_clients()
+        server.close()
+
+    print(f"🔌 {REQUESTS} sequential GETs over TLS to a local server")
+    print(f"   new client per request: median {fresh_ms[0]:6.2f} ms, p95 {fresh_ms[1]:6.2f} ms")
+    print(f"   shared pool:            median {pooled_ms[0]:6.2f} ms, p95 {pooled_ms[1]:6.2f} ms "
+          f"({stats['open_connections']} connection(s) opened)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
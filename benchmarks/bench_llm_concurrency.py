@@ -0,0 +1,65 @@
+# benchmarks/bench_llm_concurrency.py - requests/sec of OpenAIService against a fake slow backend
+# Set OPENAI_BASE_URL to a running app.dev.fake_openai server to include the HTTP path.
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.openai_service import OpenAIService, close_async_client
+
+LATENCY = float(os.getenv("BENCH_LATENCY", "0.25"))  # seconds per fake completion
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "200"))
+
+
+def _response(text: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class _Completions:
+    def __init__(self, blocking: bool):
+        self.blocking = blocking
+
+    async def create(self, model, messages, **kwargs):
+        if self.blocking:
+            time.sleep(LATENCY)  # what the old synchronous client did to the loop
+        else:
+            await asyncio.sleep(LATENCY)
+        return _response(f"echo: {messages[-1]['content']}")
+
+
+class FakeClient:
+    def __init__(self, blocking: bool = False):
+        self.chat = SimpleNamespace(completions=_Completions(blocking))
+
+
+async def run(service: OpenAIService, count: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(service.chat(f"prompt {i}") for i in range(count)))
+    return count / (time.perf_counter() - start)
+
+
+async def main():
+    print(f"⏱️  Fake backend latency: {LATENCY * 1000:.0f}ms")
+
+    # Keep the blocking run short, it is serial by construction
+    blocking_count = min(REQUESTS, 10)
+    blocking_rps = await run(OpenAIService(client=FakeClient(blocking=True)), blocking_count)
+    print(f"   blocking client: {blocking_rps:8.1f} req/s ({blocking_count} requests)")
+
+    async_rps = await run(OpenAIService(client=FakeClient()), REQUESTS)
+    print(f"   async client:    {async_rps:8.1f} req/s ({REQUESTS} requests)")
+    print(f"   speedup:         {async_rps / blocking_rps:8.1f}x")
+
+    # Full HTTP path against the stand-in server (python -m app.dev.fake_openai)
+    if settings.openai_base_url:
+        http_rps = await run(OpenAIService(), REQUESTS)
+        print(f"   HTTP ({settings.openai_base_url}): {http_rps:8.1f} req/s ({REQUESTS} requests)")
+        await close_async_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
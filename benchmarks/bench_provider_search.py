@@ -0,0 +1,81 @@
+# benchmarks/bench_provider_search.py - flight and hotel searches against the local provider simulator
+# Runs app.dev.fake_providers in-process; SIM_FLIGHTS_* / SIM_HOTELS_* pick its latency and failure profile.
+import asyncio
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+
+from app.core.config import settings
+from app.dev.fake_providers import create_app
+from app.services.http_pool import close_http_clients, get_http_client, pool_stats
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "1000"))
+RATE = float(os.getenv("BENCH_RATE", "200"))  # searches per second
+ROUTES = [("JFK", "LAX"), ("LHR", "JFK"), ("CDG", "FCO"), ("HND", "ICN"), ("SYD", "AKL"), ("DXB", "BOM"),
+          ("SFO", "SEA"), ("AMS", "BCN"), ("ORD", "MIA"), ("SIN", "BKK")]
+CITIES = ["Paris", "Tokyo", "Lisbon", "Rome", "New York", "Bangkok", "Berlin", "Sydney"]
+
+
+async def start_simulator():
+    os.environ.setdefault("SIM_FLIGHTS_PROFILE", "typical")
+    os.environ.setdefault("SIM_HOTELS_PROFILE", "typical")
+    server = uvicorn.Server(uvicorn.Config(create_app(), host="127.0.0.1", port=0, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, task, f"http://127.0.0.1:{port}"
+
+
+async def main():
+    server, task, url = await start_simulator()
+    settings.flight_api_base_url = settings.hotel_api_base_url = url
+    from app.services.flight_service import FlightService
+    from app.services.hotel_service import HotelService
+    flights, hotels = FlightService(), HotelService()
+
+    rng = random.Random(1)
+    latencies = {"flights": [], "hotels": []}
+
+    async def one():
+        started = time.perf_counter()
+        if rng.random() < 0.5:
+            origin, destination = rng.choice(ROUTES)
+            await flights.search_flights(origin, destination, f"2025-07-{rng.randint(1, 5):02d}")
+            kind = "flights"
+        else:
+            await hotels.search_hotels(rng.choice(CITIES), "2025-07-01", f"2025-07-0{rng.randint(2, 6)}")
+            kind = "hotels"
+        latencies[kind].append((time.perf_counter() - started) * 1000)
+
+    tasks = []
+    for _ in range(REQUESTS):
+        tasks.append(asyncio.ensure_future(one()))
+        await asyncio.sleep(rng.expovariate(RATE))
+    await asyncio.gather(*tasks)
+
+    upstream = (await get_http_client(url).get(f"{url}/stats")).json()
+    print(f"🛫 {REQUESTS} searches at {RATE:.0f}/s against {url} "
+          f"(flights: {os.environ['SIM_FLIGHTS_PROFILE']}, hotels: {os.environ['SIM_HOTELS_PROFILE']})")
+    for kind, values in latencies.items():
+        p50, p99 = np.percentile(values, [50, 99])
+        print(f"   {kind:8s} p50 {p50:7.1f} ms   p99 {p99:7.1f} ms   ({len(values)} searches)")
+    print(f"   provider calls: {upstream}")
+    print(f"   flight cache: {flights.cache.stats()}")
+    print(f"   hotel cache:  {hotels.cache.stats()}")
+    print(f"   pool: {pool_stats(url)}")
+
+    await close_http_clients()
+    server.should_exit = True
+    await task
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+# benchmarks/bench_rescheduler.py - conflict resolution on each write to a calendar with years of history
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.calendar_service import CalendarService
+from app.services.freebusy import EventStore
+from app.services.rescheduler import ConflictResolver
+
+EVENTS = int(os.getenv("BENCH_EVENTS", "20000"))
+WRITES = int(os.getenv("BENCH_WRITES", "200"))
+
+
+async def main():
+    rng = np.random.default_rng(5)
+    origin = datetime(2022, 1, 3, 0, 0)
+    calendar = CalendarService(store=EventStore(), events={})
+    colleagues = [f"colleague-{i}" for i in range(20)]
+
+    # Weekday working-hour meetings on a half-hour grid, about 12 per day over ~7 years
+    days = rng.integers(0, EVENTS // 12 * 7 // 5, EVENTS)
+    for day, slot, length, other in zip(days, rng.integers(0, 14, EVENTS), rng.choice([1, 2], EVENTS),
+                                        rng.integers(0, len(colleagues), EVENTS)):
+        start = origin + timedelta(weeks=int(day) // 5, days=int(day) % 5, hours=9, minutes=30 * int(slot))
+        await calendar.create_event("Meeting", start, 30 * int(length), ["me", colleagues[other]],
+                                    priority=int(rng.integers(0, 3)))
+    resolver = ConflictResolver(calendar)
+    last_day = int(days.max())
+    resolver.find_conflicts("me", origin, origin + timedelta(days=1))  # sort the buffered events
+
+    timings, moved, unresolved = [], 0, 0
+    for day, slot in zip(rng.integers(0, last_day, WRITES), rng.integers(0, 14, WRITES)):
+        start = origin + timedelta(weeks=int(day) // 5, days=int(day) % 5, hours=9, minutes=30 * int(slot))
+        started = time.perf_counter()
+        event = await calendar.create_event("New", start, 60, ["me", colleagues[0]], priority=2)
+        result = await resolver.resolve([event["id"]])
+        timings.append((time.perf_counter() - started) * 1000)
+        moved += len(result["moved"])
+        unresolved += len(result["unresolved"])
+
+    started = time.perf_counter()
+    clashes = resolver.find_conflicts("me", origin, origin + timedelta(days=last_day * 7 // 5))
+    scan_ms = (time.perf_counter() - started) * 1000
+
+    print(f"📅 {len(calendar.events)} events on one calendar")
+    print(f"   write + resolve: median {statistics.median(timings):6.2f} ms, "
+          f"p95 {np.percentile(timings, 95):6.2f} ms ({moved} moves, {unresolved} unresolved in {WRITES} writes)")
+    print(f"   find all conflicts, full history: {scan_ms:6.2f} ms ({len(clashes)} events)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
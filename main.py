@@ -5,14 +5,24 @@ from contextlib import asynccontextmanager
 import uvicorn
 import os
 
+from app.api.chat import router as chat_router
+from app.api.trip_search import router as trip_search_router
+from app.services.airport_index import get_airport_index
+from app.services.http_pool import close_http_clients, pool_stats
+from app.services.openai_service import close_async_client
+from app.services.resilience import provider_stats
+
 
 # Create app with lifespan
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting AI Travel Assistant...")
+    print(f"✈️  Airport index: {len(get_airport_index())} airports")
     yield
     # Shutdown
+    await close_async_client()
+    await close_http_clients()
     print("👋 Shutting down...")
 
 
@@ -34,6 +44,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Streaming chat (SSE + WebSocket)
+app.include_router(chat_router, prefix="/api/chat", tags=["chat"])
+
+# Combined flights + hotels + plan search (SSE)
+app.include_router(trip_search_router, prefix="/api/trip-search", tags=["trip-search"])
+
 
 # Basic endpoints - NO IMPORTS NEEDED!
 @app.get("/")
@@ -45,6 +61,8 @@ def home():
         "docs": "/docs",
         "endpoints": {
             "chat": "GET /api/chat?message=hello",
+            "chat_stream": "GET /api/chat/stream?message=hello",
+            "chat_ws": "WS /api/chat/ws",
             "travel_plan": "GET /api/travel/plan?destination=Tokyo&days=5",
             "health": "GET /health"
         }
@@ -56,6 +74,18 @@ def health_check():
     return {"status": "healthy", "service": "AI Assistant"}
 
 
+@app.get("/health/http-pools")
+def http_pool_health():
+    """Connection pool utilization per upstream host"""
+    return pool_stats()
+
+
+@app.get("/health/providers")
+def provider_health():
+    """Circuit breaker state, p95 latency and hedging per upstream provider"""
+    return provider_stats()
+
+
 @app.get("/api/chat")
 def chat(message: str = "Hello"):
     return {
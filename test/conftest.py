@@ -0,0 +1,14 @@
+"""
+Shared test fixtures
+"""
+import pytest
+from app.services import llm_cache
+
+
+@pytest.fixture(autouse=True)
+def llm_cache_path(tmp_path, monkeypatch):
+    """Keep the LLM response cache's SQLite file out of the working directory"""
+    path = tmp_path / "llm_cache.db"
+    monkeypatch.setattr(llm_cache.settings, "llm_cache_path", str(path))
+    monkeypatch.setattr(llm_cache, "_response_cache", None)
+    return path
@@ -0,0 +1,42 @@
+"""
+Test the airport autocomplete index
+"""
+import pytest
+from app.services.airport_index import AirportIndex, get_airport_index
+from app.services.flight_service import FlightService
+
+
+def _codes(query, limit=10):
+    return [airport["code"] for airport in get_airport_index().search(query, limit)]
+
+
+def test_exact_code_ranks_first():
+    assert _codes("lhr")[0] == "LHR"
+    assert _codes("SFO", 1) == ["SFO"]
+
+
+def test_prefixes_match_city_and_name_words():
+    assert set(_codes("lond")) == {"LHR", "LGW", "STN", "LTN", "LCY"}
+    assert _codes("heath") == ["LHR"]
+    assert _codes("new york") == ["JFK", "LGA"]
+
+
+def test_typos_and_accents_still_match():
+    assert "LHR" in _codes("lndon")
+    assert _codes("Zürich") == ["ZRH"]
+    assert _codes("qqqq") == []
+
+
+def test_larger_airports_break_ties():
+    index = AirportIndex([
+        {"code": "AAA", "name": "Springfield Field", "city": "Springfield", "country": "US", "type": "small_airport"},
+        {"code": "BBB", "name": "Springfield Intl", "city": "Springfield", "country": "US", "type": "large_airport"}
+    ])
+    assert [a["code"] for a in index.search("spring")] == ["BBB", "AAA"]
+
+
+@pytest.mark.asyncio
+async def test_flight_service_uses_the_index():
+    airports = await FlightService().get_airports("tokyo")
+    assert {a["code"] for a in airports} == {"HND", "NRT"}
+    assert set(airports[0]) == {"code", "name", "city", "country"}
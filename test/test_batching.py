@@ -0,0 +1,32 @@
+"""
+Test micro-batching
+"""
+import asyncio
+import pytest
+from app.services.batching import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_a_batch():
+    seen = []
+
+    async def handler(items):
+        seen.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch=8, max_wait=0.01)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+
+    assert results == [i * 2 for i in range(20)]
+    assert [len(batch) for batch in seen] == [8, 8, 4]
+
+
+@pytest.mark.asyncio
+async def test_handler_error_reaches_every_caller():
+    async def handler(items):
+        raise ValueError("boom")
+
+    batcher = MicroBatcher(handler)
+    results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
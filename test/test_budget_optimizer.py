@@ -0,0 +1,93 @@
+"""
+Test the itinerary budget optimizer
+"""
+import itertools
+import random
+from app.services.budget_optimizer import Candidate, optimize_budget, score_candidates
+from app.services.enhanced_travel_service import EnhancedTravelService
+
+
+def _brute_force(candidates, budget, days, per_day_budget):
+    """Best score over every assignment of day-bound activities"""
+    scores = score_candidates(candidates, {}, budget / days)
+    nights = max(days - 1, 1)
+    lodging = [i for i, c in enumerate(candidates) if c.category == "lodging"]
+    meals = [i for i, c in enumerate(candidates) if c.category == "meal"]
+    activities = [i for i, c in enumerate(candidates) if c.category == "activity"]
+
+    best = None
+    for tier in lodging:
+        for meal_plan in itertools.product(meals, repeat=days):
+            for picks in itertools.product([False, True], repeat=len(activities)):
+                cost = candidates[tier].cost * nights
+                score = scores[tier] * nights
+                ok = True
+                for day in range(1, days + 1):
+                    chosen = [i for i, p in zip(activities, picks) if p and candidates[i].day == day]
+                    day_cost = candidates[meal_plan[day - 1]].cost + sum(candidates[i].cost for i in chosen)
+                    if len(chosen) > 3 or (per_day_budget and day_cost + candidates[tier].cost > per_day_budget):
+                        ok = False
+                        break
+                    cost += day_cost
+                    score += scores[meal_plan[day - 1]] + sum(scores[i] for i in chosen)
+                if ok and cost <= budget and (best is None or score > best):
+                    best = score
+    return best
+
+
+def test_matches_brute_force_for_day_bound_candidates():
+    rng = random.Random(3)
+    for _ in range(30):
+        days = rng.randint(1, 3)
+        candidates = [Candidate("lodging", f"L{i}", rng.randint(20, 80), rng.uniform(0, 5)) for i in range(2)]
+        candidates += [Candidate("meal", f"M{i}", rng.randint(10, 40), rng.uniform(0, 5)) for i in range(2)]
+        candidates += [
+            Candidate("activity", f"A{i}", rng.randint(0, 60), rng.uniform(0, 5), day=rng.randint(1, days))
+            for i in range(5)
+        ]
+        budget = rng.randint(50, 400)
+        per_day_budget = rng.choice([None, rng.randint(60, 200)])
+
+        expected = _brute_force(candidates, budget, days, per_day_budget)
+        # One budget unit per dollar makes integer costs exact
+        plan = optimize_budget(candidates, budget, days, per_day_budget=per_day_budget, resolution=budget)
+
+        if expected is None:
+            assert not plan["feasible"]
+        else:
+            assert plan["feasible"]
+            assert abs(plan["score"] - expected) < 1e-2
+            assert plan["total_cost"] <= budget
+
+
+def test_any_day_activities_are_used_once_and_budget_holds():
+    rng = random.Random(5)
+    candidates = [Candidate("lodging", "Hostel", 40, 2), Candidate("lodging", "Hotel", 150, 4)]
+    candidates += [Candidate("meal", "Street food", 25, 3), Candidate("meal", "Restaurants", 70, 4)]
+    candidates += [
+        Candidate("activity", f"Sight {i}", rng.uniform(5, 80), rng.uniform(1, 5), ["museum"] if i % 3 else ["beach"])
+        for i in range(200)
+    ]
+
+    plan = optimize_budget(candidates, 2000, 7, per_day_budget=320, preferences={"activities": ["museum"]})
+
+    names = [a["name"] for day in plan["days"] for a in day["activities"]]
+    assert plan["feasible"]
+    assert len(names) == len(set(names))
+    assert plan["total_cost"] <= 2000
+    assert all(day["cost"] <= 320 + 1e-6 for day in plan["days"])
+
+
+def test_infeasible_when_nothing_fits():
+    candidates = [Candidate("lodging", "Hotel", 500), Candidate("meal", "Meals", 50)]
+    assert not optimize_budget(candidates, 300, 3)["feasible"]
+
+
+def test_zero_or_missing_budget_uses_default_allocation():
+    service = EnhancedTravelService.__new__(EnhancedTravelService)
+    candidates = [Candidate("lodging", "Hotel", 100), Candidate("meal", "Meals", 30)]
+
+    for budget in (0, None):
+        itinerary = service._optimize_budget_allocation({"duration_days": 3}, budget, {}, candidates)
+        assert "optimized_plan" not in itinerary
+        assert itinerary["optimized_budget"]["accommodation"]["allocated"] == 0
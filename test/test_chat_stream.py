@@ -0,0 +1,78 @@
+"""
+Test the streaming chat endpoints (SSE and WebSocket)
+"""
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import chat
+from app.services.context_manager import ConversationContext
+
+
+@pytest.fixture
+def client(monkeypatch):
+    seen = []
+
+    async def stream_chat(prompt, context=None):
+        history = await context.messages() if isinstance(context, ConversationContext) else []
+        seen.append((prompt, [m["content"] for m in history]))
+        if prompt == "fail":
+            raise RuntimeError("model unavailable")
+        for token in ("Hello", ", ", prompt):
+            yield token
+        if isinstance(context, ConversationContext):
+            context.add("user", prompt)
+            context.add("assistant", f"Hello, {prompt}")
+
+    monkeypatch.setattr(chat.openai_service, "stream_chat", stream_chat)
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/api/chat")
+    client = TestClient(app)
+    client.seen = seen
+    return client
+
+
+def _events(body: str):
+    """(event, data) per Server-Sent Event"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines.get("event"), json.loads(lines["data"])))
+    return events
+
+
+def test_sse_streams_tokens_then_done(client):
+    response = client.get("/api/chat/stream", params={"message": "Tokyo"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.endswith("\n\n")
+    assert _events(response.text) == [
+        (None, {"token": "Hello"}),
+        (None, {"token": ", "}),
+        (None, {"token": "Tokyo"}),
+        ("done", {"response": "Hello, Tokyo"})
+    ]
+
+
+def test_sse_reports_errors_as_an_event(client):
+    response = client.get("/api/chat/stream", params={"message": "fail"})
+    assert _events(response.text) == [("error", {"error": "model unavailable"})]
+
+
+def test_websocket_round_trips_and_keeps_history(client):
+    with client.websocket_connect("/api/chat/ws") as ws:
+        ws.send_json({"message": "Paris"})
+        frames = [ws.receive_json() for _ in range(4)]
+        assert [f["type"] for f in frames] == ["token", "token", "token", "done"]
+        assert frames[-1]["response"] == "Hello, Paris"
+
+        ws.send_json({"message": " "})
+        assert ws.receive_json() == {"type": "error", "error": "Empty message"}
+
+        ws.send_json({"message": "Rome"})
+        while ws.receive_json()["type"] != "done":
+            pass
+
+    # The second turn sees the first one
+    assert client.seen[1] == ("Rome", ["Paris", "Hello, Paris"])
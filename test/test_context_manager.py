@@ -0,0 +1,71 @@
+"""
+Test token-budgeted conversation context
+"""
+import pytest
+from app.services.context_manager import ConversationContext, count_message_tokens, fit_messages
+
+
+def _message(role, name, tokens):
+    """A message costing exactly tokens (content plus overhead)"""
+    content = name.ljust((tokens - count_message_tokens({"content": ""})) * 4, ".")
+    message = {"role": role, "content": content}
+    assert count_message_tokens(message) == tokens
+    return message
+
+
+def test_fit_messages_budget_boundary():
+    messages = [_message("user", "a", 10), _message("assistant", "b", 10), _message("user", "c", 10)]
+
+    assert fit_messages(messages, 30) == messages
+    assert fit_messages(messages, 29) == messages[1:]
+    assert fit_messages(messages, 20) == messages[1:]
+    assert fit_messages(messages, 19) == messages[2:]
+
+
+def test_fit_messages_keeps_system_and_latest_in_order():
+    system = _message("system", "rules", 10)
+    messages = [system, _message("user", "a", 10), _message("assistant", "b", 10),
+                _message("user", "c", 10), _message("assistant", "d", 10), _message("user", "latest", 50)]
+
+    fitted = fit_messages(messages, 80)
+    assert fitted == [system, messages[3], messages[4], messages[5]]
+
+    # Over budget even alone: the system prompt and the new message still go out
+    assert fit_messages(messages, 5) == [system, messages[-1]]
+
+
+@pytest.mark.asyncio
+async def test_context_folds_old_turns_into_summary():
+    context = ConversationContext(budget=60, summary_budget=20, system_prompt="You plan trips.")
+    for i in range(8):
+        context.add("user" if i % 2 == 0 else "assistant", f"Turn {i}. " + "x" * 40)
+
+    assert context.window_tokens <= 60 - 20
+    messages = await context.messages("What next?")
+
+    assert messages[0] == {"role": "system", "content": "You plan trips."}
+    # The summary keeps the latest folded turns (first sentence only) within its budget
+    summary = messages[1]["content"].split("\n")[1:]
+    assert summary == ["assistant: Turn 3.", "user: Turn 4.", "assistant: Turn 5."]
+    assert [m["content"].split(".")[0] for m in messages[2:-1]] == ["Turn 6", "Turn 7"]
+    assert messages[-1] == {"role": "user", "content": "What next?"}
+
+
+@pytest.mark.asyncio
+async def test_custom_summarizer_sees_folded_turns_once():
+    calls = []
+
+    async def summarize(previous, turns):
+        calls.append([t["content"] for t in turns])
+        return f"{previous} +{len(turns)}".strip()
+
+    context = ConversationContext(budget=40, summary_budget=10, summarizer=summarize)
+    for i in range(6):
+        context.add("user", f"message {i} " + "y" * 40)
+    await context.messages()
+    await context.messages()
+
+    assert len(calls) == 1
+    assert calls[0][0].startswith("message 0")
+    assert context.summary == f"+{len(calls[0])}"
+    assert len(context) >= 1
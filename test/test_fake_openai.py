@@ -0,0 +1,49 @@
+"""
+Smoke test the OpenAI stand-in server against the real AsyncOpenAI client
+"""
+import httpx
+import openai
+import pytest
+from app.dev.fake_openai import create_app
+from app.dev.latency import PROFILES
+from app.services.enhanced_travel_service import EnhancedTravelService
+from app.services.llm_cache import LLMResponseCache
+from app.services.openai_service import OpenAIService
+from app.services.semantic_cache import SemanticCache
+
+
+@pytest.fixture
+def service():
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(PROFILES["instant"], seed=1)))
+    client = openai.AsyncOpenAI(api_key="local", base_url="http://fake/v1", http_client=http, max_retries=0)
+    return OpenAIService(client=client, cache=LLMResponseCache(), semantic_cache=SemanticCache())
+
+
+@pytest.mark.asyncio
+async def test_chat_and_streaming(service):
+    reply = await service.chat("Hello there")
+    tokens = [token async for token in service.stream_chat("Hello there")]
+
+    assert reply == "(fake) You said: Hello there"
+    assert len(tokens) > 1 and "".join(tokens) == reply
+
+
+@pytest.mark.asyncio
+async def test_batch_sentiment(service):
+    results = await service.analyze_sentiment_batch(["Where is my hotel?", "Book a flight", "Where is my hotel?"])
+
+    assert [r["sentiment"] for r in results] == ["neutral"] * 3
+    assert all("index" not in r for r in results)
+
+
+@pytest.mark.asyncio
+async def test_itineraries(service):
+    travel = EnhancedTravelService()
+    travel.openai_service = service
+
+    parallel = await travel.create_intelligent_itinerary("Lisbon", 6, 3000, {}, parallel=True)
+    single = await travel.create_intelligent_itinerary("Lisbon", 2, 1000, {}, parallel=False)
+
+    assert [d["day"] for d in parallel["daily_itinerary"]] == [1, 2, 3, 4, 5, 6]
+    assert not any(d.get("outline_only") for d in parallel["daily_itinerary"])
+    assert [d["day"] for d in single["daily_itinerary"]] == [1, 2]
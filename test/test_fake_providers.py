@@ -0,0 +1,61 @@
+"""
+Test the flight and hotel provider stand-in server
+"""
+import httpx
+import pytest
+from app.dev.fake_providers import create_app
+from app.dev.latency import PROFILES, LatencyProfile
+from app.services import flight_service as flight_module
+from app.services.flight_service import FlightService
+from app.services.search_cache import SearchCache
+
+HOTELS = {"dest_id": "Lisbon", "checkin_date": "2025-06-15", "checkout_date": "2025-06-18", "adults_number": 2}
+
+
+def _client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://sim")
+
+
+@pytest.mark.asyncio
+async def test_results_are_deterministic_and_paginated():
+    app = create_app(PROFILES["instant"], PROFILES["instant"], seed=1, hotel_results=1000)
+    async with _client(app) as client:
+        first = (await client.get("/v1/hotels/search", params={**HOTELS, "page_size": 50})).json()
+        again = (await client.get("/v1/hotels/search", params={**HOTELS, "page_size": 50})).json()
+        second = (await client.get("/v1/hotels/search", params={**HOTELS, "page_size": 50, "page": 1})).json()
+
+    assert first == again
+    assert len(first["hotels"]) == 50 and first["next_page"] == 1
+    assert 600 <= first["total_hotels"] <= 1000
+    prices = [h["price_per_night"] for h in first["hotels"] + second["hotels"]]
+    assert prices == sorted(prices)
+    assert first["hotels"][0]["id"] != second["hotels"][0]["id"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_and_failures_are_injected():
+    app = create_app(LatencyProfile(distribution="fixed", mean_ms=0, rate_limit_rate=1.0),
+                     LatencyProfile(distribution="fixed", mean_ms=0, error_rate=1.0))
+    async with _client(app) as client:
+        limited = await client.get("/flights/search", params={"origin": "JFK", "destination": "LAX",
+                                                              "departure_date": "2025-06-15"})
+        failed = await client.get("/v1/hotels/search", params=HOTELS)
+        stats = (await client.get("/stats")).json()
+
+    assert limited.status_code == 429 and limited.headers["retry-after"] == "1"
+    assert failed.status_code == 500
+    assert stats == {"flights:rate_limit": 1, "hotels:error": 1}
+
+
+@pytest.mark.asyncio
+async def test_flight_service_talks_to_the_simulator(monkeypatch):
+    app = create_app(PROFILES["instant"], PROFILES["instant"], seed=1)
+    monkeypatch.setattr(flight_module.settings, "flight_api_base_url", "http://sim")
+    monkeypatch.setattr(flight_module, "get_http_client", lambda url: _client(app))
+
+    service = FlightService(cache=SearchCache(ttl=60))
+    result = await service.search_flights("jfk", "cdg", "2025-06-15")
+
+    assert not service.use_mock
+    assert result["origin"] == "JFK" and result["destination"] == "CDG"
+    assert result["flights"][0]["departure_time"].startswith("2025-06-15")
@@ -0,0 +1,90 @@
+"""
+Test the free/busy engine
+"""
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from app.agents.calendar_agent import CalendarAgent
+from app.services.calendar_service import CalendarService
+from app.services.freebusy import EventStore, FreeBusyEngine, merge_intervals, to_epoch
+
+MONDAY = datetime(2024, 6, 3, 0, 0)
+
+
+def _at(day, hour, minute=0):
+    return MONDAY + timedelta(days=day, hours=hour, minutes=minute)
+
+
+def test_merge_matches_minute_grid():
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 1000, 200)
+    ends = starts + rng.integers(1, 60, 200)
+
+    merged_starts, merged_ends = merge_intervals(starts, ends)
+
+    grid = np.zeros(1100, dtype=bool)
+    for s, e in zip(starts, ends):
+        grid[s:e] = True
+    merged = np.zeros(1100, dtype=bool)
+    for s, e in zip(merged_starts, merged_ends):
+        merged[s:e] = True
+    assert (grid == merged).all()
+    assert (merged_starts[1:] > merged_ends[:-1]).all()
+
+
+def test_free_slots_intersect_participants_within_work_hours():
+    store = EventStore()
+    store.add("ana", 1, to_epoch(_at(0, 9)), to_epoch(_at(0, 11)))
+    store.add("ben", 2, to_epoch(_at(0, 10)), to_epoch(_at(0, 12)))
+    store.add("ben", 3, to_epoch(_at(0, 15)), to_epoch(_at(0, 16)))
+
+    free = FreeBusyEngine(store).free_slots(["ana", "ben"], _at(0, 0), _at(1, 0))
+
+    assert free == [(_at(0, 12), _at(0, 15)), (_at(0, 16), _at(0, 17))]
+
+
+def test_ranking_prefers_slots_optional_attendees_can_make():
+    store = EventStore()
+    store.add("cat", 1, to_epoch(_at(0, 9)), to_epoch(_at(0, 12)))
+    engine = FreeBusyEngine(store)
+
+    slots = engine.rank_slots(["ana"], 60, _at(0, 9), _at(0, 17), optional=["cat"], limit=3)
+
+    assert all(slot["start"] >= _at(0, 12) for slot in slots)
+    assert all(slot["optional_available"] == 1 for slot in slots)
+
+
+def test_weekends_are_skipped():
+    engine = FreeBusyEngine(EventStore())
+    slots = engine.rank_slots(["ana"], 30, _at(5, 0), _at(8, 0), limit=1)
+    assert slots[0]["start"] == _at(7, 9)
+
+
+@pytest.mark.asyncio
+async def test_agent_finds_time_around_existing_events():
+    agent = CalendarAgent(user_id=1)
+    agent.calendar = CalendarService(store=EventStore(), events={})
+    await agent.calendar.create_event("Standup", _at(0, 9), 180, [1, "dana"])
+
+    result = await agent.find_free_time({
+        "participants": ["dana"], "duration": 60, "start": _at(0, 9).isoformat(), "end": _at(0, 17).isoformat()
+    })
+
+    # Right after the standup is free, but a slot with some breathing room ranks first
+    assert result["slots"][0]["start"] == _at(0, 12, 30).isoformat()
+    assert result["free_periods"] == [{"start": _at(0, 12).isoformat(), "end": _at(0, 17).isoformat()}]
+
+
+@pytest.mark.asyncio
+async def test_scheduled_meeting_includes_the_organizer():
+    agent = CalendarAgent(user_id=1)
+    agent.calendar = CalendarService(store=EventStore(), events={})
+
+    result = await agent.schedule_meeting({"participants": ["dana"], "duration": 30, "topic": "Sync"})
+
+    assert result["status"] == "scheduled"
+    assert result["event"]["participants"] == ["dana", 1]
+    assert result["event"]["invited"] == ["dana"]
+    # The organizer's calendar is now busy at that time
+    start = result["event"]["start"]
+    assert agent.calendar.engine.free_slots([1], start, start + timedelta(minutes=30), work_hours=None) == []
@@ -0,0 +1,48 @@
+"""
+Test the shared upstream HTTP clients
+"""
+import asyncio
+import pytest
+from app.services.http_pool import close_http_clients, get_http_client, pool_stats
+
+BODY = b'{"ok": true}'
+
+
+async def _keepalive_server():
+    """Minimal HTTP/1.1 server that counts TCP connections"""
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 12\r\n\r\n" + BODY)
+            await writer.drain()
+
+    async def guarded(reader, writer):
+        try:
+            await handle(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(guarded, "127.0.0.1", 0)
+    return server, connections
+
+
+@pytest.mark.asyncio
+async def test_requests_to_a_host_reuse_one_connection():
+    server, connections = await _keepalive_server()
+    url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    try:
+        for _ in range(5):
+            response = await get_http_client(f"{url}/search").get(f"{url}/search")
+            assert response.json() == {"ok": True}
+
+        assert get_http_client(url) is get_http_client(f"{url}/other/path")
+        assert len(connections) == 1
+        stats = pool_stats(url)
+        assert stats["requests"] == 5 and stats["in_flight"] == 0
+        assert stats["open_connections"] == 1
+    finally:
+        await close_http_clients()
+        server.close()
+    assert pool_stats() == {}
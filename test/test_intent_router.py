@@ -0,0 +1,80 @@
+"""
+Test compiled intent router
+"""
+import pytest
+from app.services.intent_router import IntentRouter
+from app.services.ai_service import AIService
+
+
+def test_priority_and_whole_words():
+    router = IntentRouter()
+    router.add("greeting", ["hi", "hello"], priority=1)
+    router.add("help", ["help"], priority=2)
+
+    assert router.route("this is fine") is None  # "hi" inside "this"
+    assert router.route("Hi, I need help!").intent == "help"
+    assert router.route("hello there").intent == "greeting"
+    assert router.stats()["hit_rate"] == 2 / 3
+
+
+def test_plan_trip_is_dispatched_without_llm():
+    routed = AIService().route("Help me plan a trip to New York for 5 days")
+
+    assert routed["intent"] == "plan_trip"
+    assert routed["action"] == {"type": "plan_trip", "destination": "New York", "days": 5}
+
+
+@pytest.mark.parametrize("message", [
+    "my trip to Rome was cancelled",
+    "travel to Japan now",
+    "go to bed",
+    "I want to go to bed",
+    "Can you make an itinerary for 5 days?"
+])
+def test_non_trip_messages_are_not_planned(message):
+    assert AIService().route(message) is None
+
+
+@pytest.mark.parametrize("message, destination", [
+    ("I'd like to visit Lisbon next month", "Lisbon"),
+    ("Book a trip to Rome for 3 days", "Rome"),
+    ("We want to fly to Buenos Aires", "Buenos Aires")
+])
+def test_trip_requests_extract_the_destination(message, destination):
+    assert AIService().route(message)["action"]["destination"] == destination
+
+
+@pytest.mark.asyncio
+async def test_unplanned_messages_fall_back_to_the_llm():
+    class FakeLLM:
+        async def chat(self, message):
+            return "Sorry to hear that, let's find you a new flight."
+
+    service = AIService()
+    service._openai_service = FakeLLM()
+    reply = await service.reply("my trip to Rome was cancelled")
+
+    assert reply["source"] == "llm"
+    assert reply["intent"] is None
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("Hi there!", "greeting"),
+    ("Can you help me?", "help"),
+    ("Hey, my flight got cancelled and I am stuck in Rome", None),
+    ("I need help, my hotel booking has the wrong dates", None)
+])
+def test_canned_answers_only_for_short_greetings_and_help(message, intent):
+    routed = AIService().route(message)
+    assert (routed["intent"] if routed else None) == intent
+
+
+def test_rejected_matches_count_as_fallthrough():
+    service = AIService()
+    service.route("I want to go to bed")
+    service.route("Hey, my flight got cancelled and I am stuck in Rome")
+    service.route("Book a trip to Rome")
+
+    stats = service.router.stats()
+    assert stats["routed"] == 1 and stats["fallthrough"] == 2
+    assert stats["by_intent"] == {"plan_trip": 1}
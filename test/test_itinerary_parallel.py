@@ -0,0 +1,58 @@
+"""
+Test parallel itinerary generation
+"""
+import json
+import pytest
+from app.dev.fake_openai import canned_answer
+from app.services.enhanced_travel_service import EnhancedTravelService
+
+
+class FakeOpenAIService:
+    def __init__(self, fail_days=None):
+        self.fail_days = fail_days
+        self.prompts = []
+
+    async def structured_response(self, prompt, schema=None, **kwargs):
+        self.prompts.append(prompt)
+        if self.fail_days and f"plan days {self.fail_days}" in prompt:
+            raise TimeoutError("block timed out")
+        return json.loads(canned_answer(prompt))
+
+
+def _service(fake):
+    service = EnhancedTravelService()
+    service.openai_service = fake
+    return service
+
+
+@pytest.mark.asyncio
+async def test_long_trip_is_generated_in_blocks():
+    fake = FakeOpenAIService()
+    itinerary = await _service(fake).create_intelligent_itinerary("Rome", 6, 3000, {}, parallel=True)
+
+    assert [day["day"] for day in itinerary["daily_itinerary"]] == [1, 2, 3, 4, 5, 6]
+    assert sum("plan days" in prompt for prompt in fake.prompts) == 3
+    assert itinerary["budget_breakdown"]["estimated_total"] > 0
+    assert itinerary["destination"] == "Rome"
+
+
+@pytest.mark.asyncio
+async def test_failed_block_falls_back_to_outline():
+    fake = FakeOpenAIService(fail_days="3-4")
+    itinerary = await _service(fake).create_intelligent_itinerary("Rome", 6, 3000, {}, parallel=True)
+
+    days = {day["day"]: day for day in itinerary["daily_itinerary"]}
+    assert len(days) == 6
+    assert days[3].get("outline_only") and days[4].get("outline_only")
+    assert "morning" in days[5]
+
+
+def test_merge_replaces_repeated_activities():
+    days = [
+        {"day": 2, "morning": {"activity": "Colosseum tour", "cost": 30}},
+        {"day": 1, "morning": {"activity": "Colosseum Tour!", "cost": 30}},
+    ]
+    merged = EnhancedTravelService._merge_days(EnhancedTravelService.__new__(EnhancedTravelService), days)
+
+    assert merged[0]["morning"]["activity"] == "Colosseum Tour!"
+    assert merged[1]["morning"]["replaced_duplicate"] == "Colosseum tour"
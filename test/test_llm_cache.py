@@ -0,0 +1,48 @@
+"""
+Test LLM response cache
+"""
+from app.services.llm_cache import LLMResponseCache, get_response_cache
+
+
+def test_key_ignores_whitespace_but_not_model():
+    a = LLMResponseCache.make_key("Plan  a trip\n to Tokyo ", "gpt", 0.7)
+    b = LLMResponseCache.make_key("Plan a trip to Tokyo", "gpt", 0.7)
+    c = LLMResponseCache.make_key("Plan a trip to Tokyo", "other", 0.7)
+    assert a == b
+    assert a != c
+
+
+def test_disk_tier_survives_new_instance(llm_cache_path):
+    path = str(llm_cache_path)
+    cache = LLMResponseCache(path=path)
+    cache.set("k", '{"ok": true}')
+    cache.close()
+
+    cache = LLMResponseCache(path=path)
+    assert cache.get("k") == '{"ok": true}'
+    assert cache.stats()["hits"] == 1
+    assert cache.get("k") == '{"ok": true}'
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_lru_eviction_and_ttl():
+    cache = LLMResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+
+    cache.set("d", "4", ttl=-1)
+    assert cache.get("d") is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_shared_cache_uses_settings_path_and_creates_it_on_first_use(llm_cache_path):
+    cache = get_response_cache()
+    assert not llm_cache_path.exists()
+
+    cache.set("k", "v")
+    assert llm_cache_path.exists()
+    cache.close()
@@ -0,0 +1,43 @@
+"""
+Test LLM priority scheduler
+"""
+import asyncio
+import pytest
+from app.services.llm_scheduler import LLMDeadlineExceeded, LLMScheduler, Priority, _ClassConfig
+
+
+def _scheduler():
+    return LLMScheduler(4, {
+        Priority.INTERACTIVE: _ClassConfig(limit=4, max_wait=5, reserved=2),
+        Priority.AGENT: _ClassConfig(limit=4, max_wait=5),
+        Priority.BACKGROUND: _ClassConfig(limit=4, max_wait=0.05)
+    })
+
+
+@pytest.mark.asyncio
+async def test_background_cannot_take_reserved_slots():
+    scheduler = _scheduler()
+    for _ in range(2):
+        await scheduler.acquire(Priority.BACKGROUND)
+
+    with pytest.raises(LLMDeadlineExceeded):
+        await scheduler.acquire(Priority.BACKGROUND)
+
+    # Interactive calls still get a slot immediately
+    await asyncio.wait_for(scheduler.acquire(Priority.INTERACTIVE), 0.01)
+    assert scheduler.stats()["classes"]["background"]["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_users_are_served_round_robin():
+    scheduler = _scheduler()
+    scheduler.classes[Priority.AGENT].limit = 1
+    order = []
+
+    async def job(user, name):
+        async with scheduler.slot(Priority.AGENT, user):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[job("alice", f"a{i}") for i in range(4)], job("bob", "b0"))
+    assert order.index("b0") <= 2
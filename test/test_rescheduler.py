@@ -0,0 +1,78 @@
+"""
+Test the incremental conflict resolver
+"""
+from datetime import datetime, timedelta
+import pytest
+from app.agents.calendar_agent import CalendarAgent
+from app.services.calendar_service import CalendarService
+from app.services.freebusy import EventStore
+from app.services.rescheduler import ConflictResolver
+
+MONDAY = datetime(2024, 6, 3, 0, 0)
+
+
+def _at(day, hour, minute=0):
+    return MONDAY + timedelta(days=day, hours=hour, minutes=minute)
+
+
+def _calendar():
+    return CalendarService(store=EventStore(), events={})
+
+
+@pytest.mark.asyncio
+async def test_lower_priority_event_moves_to_nearest_free_time():
+    calendar = _calendar()
+    review = await calendar.create_event("Review", _at(0, 10), 60, ["ana", "ben"], priority=1)
+    await calendar.create_event("Lunch", _at(0, 11), 60, ["ben"])
+    board = await calendar.create_event("Board", _at(0, 10), 60, ["ana"], priority=3)
+
+    result = await ConflictResolver(calendar).resolve([board["id"]])
+
+    assert [move["id"] for move in result["moved"]] == [review["id"]]
+    assert review["start"] == _at(0, 9)
+    assert board["start"] == _at(0, 10)
+    assert result["unresolved"] == []
+
+
+@pytest.mark.asyncio
+async def test_moves_can_push_aside_lower_priority_events():
+    calendar = _calendar()
+    await calendar.create_event("Offsite", _at(0, 9), 60, ["ana"], movable=False)
+    await calendar.create_event("Offsite", _at(0, 11), 360, ["ana"], movable=False)
+    await calendar.create_event("Training", _at(1, 9), 480, ["ben"], movable=False)
+    focus = await calendar.create_event("Focus", _at(0, 10), 60, ["ana"], priority=0)
+    sync = await calendar.create_event("Sync", _at(0, 9), 60, ["ana", "ben"], priority=2)
+
+    result = await ConflictResolver(calendar, horizon_days=1).resolve([sync["id"]])
+
+    assert sync["start"] == _at(0, 10)
+    assert focus["start"] == _at(1, 9)
+    assert {move["id"] for move in result["moved"]} == {sync["id"], focus["id"]}
+
+
+@pytest.mark.asyncio
+async def test_immovable_clashes_are_reported():
+    calendar = _calendar()
+    first = await calendar.create_event("Flight", _at(0, 10), 120, ["ana"], movable=False)
+    second = await calendar.create_event("Train", _at(0, 11), 60, ["ana"], movable=False)
+    resolver = ConflictResolver(calendar)
+
+    assert sorted(resolver.find_conflicts("ana", _at(0, 0), _at(1, 0))) == [first["id"], second["id"]]
+    result = await resolver.resolve([second["id"]])
+    assert result["moved"] == []
+    assert result["unresolved"][0]["events"] == [second["id"], first["id"]]
+
+
+@pytest.mark.asyncio
+async def test_agent_reschedules_upcoming_conflicts():
+    agent = CalendarAgent(user_id=1)
+    agent.calendar = _calendar()
+    monday = datetime.combine(datetime.now().date() + timedelta(days=7 - datetime.now().weekday()), datetime.min.time())
+    keep = await agent.calendar.create_event("Interview", monday + timedelta(hours=14), 60, [1], priority=2)
+    clash = await agent.calendar.create_event("1:1", monday + timedelta(hours=14, minutes=30), 30, [1])
+
+    result = await agent.execute({"action": "reschedule_conflicts"})
+
+    assert result["status"] == "rescheduled"
+    assert keep["start"] == monday + timedelta(hours=14)
+    assert clash["start"] == monday + timedelta(hours=15)
@@ -0,0 +1,147 @@
+"""
+Test the provider circuit breaker, hedging and degraded fallbacks
+"""
+import asyncio
+import httpx
+import pytest
+from app.services.flight_service import FlightService
+from app.services.resilience import CircuitBreaker, CircuitOpenError, ProviderGuard
+from app.services.search_cache import SearchCache
+
+
+def _status_error(status):
+    request = httpx.Request("GET", "http://provider/search")
+    return httpx.HTTPStatusError(f"HTTP {status}", request=request, response=httpx.Response(status, request=request))
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_recovers():
+    guard = ProviderGuard("test", CircuitBreaker(min_calls=4, failure_rate=0.5, open_seconds=0.1), hedge=False)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        raise _status_error(503)
+
+    for _ in range(4):
+        with pytest.raises(httpx.HTTPStatusError):
+            await guard.call(failing)
+    assert guard.breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        await guard.call(failing)
+    assert len(calls) == 4 and guard.short_circuited == 1
+
+    async def healthy():
+        return "ok"
+
+    await asyncio.sleep(0.12)
+    assert await guard.call(healthy) == "ok"
+    assert guard.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_hedge_answers_when_the_first_request_is_slow():
+    guard = ProviderGuard("test", timeout=2.0, hedge_max_rate=1.0, hedge_min_samples=5)
+    guard.latencies.extend([0.01] * 5)
+    attempts = []
+
+    async def fetch():
+        attempts.append(1)
+        await asyncio.sleep(1.0 if len(attempts) == 1 else 0.01)
+        return len(attempts)
+
+    started = asyncio.get_running_loop().time()
+    assert await guard.call(fetch) == 2
+    assert asyncio.get_running_loop().time() - started < 0.5
+    assert guard.hedges == guard.hedges_won == 1
+
+
+@pytest.mark.asyncio
+async def test_hedges_are_capped_for_a_burst_of_slow_calls():
+    guard = ProviderGuard("test", timeout=2.0, hedge_max_rate=0.1, hedge_burst=5, hedge_min_samples=5)
+    guard.latencies.extend([0.01] * 5)
+
+    async def fast():
+        return "ok"
+
+    for _ in range(300):
+        await guard.call(fast)
+    assert guard.hedges == 0
+
+    attempts = []
+
+    async def slow():
+        attempts.append(1)
+        await asyncio.sleep(0.1)
+        return "ok"
+
+    # A long healthy history doesn't buy the whole burst a second request
+    await asyncio.gather(*(guard.call(slow) for _ in range(50)))
+    assert guard.hedges == 5 and len(attempts) == 55
+
+
+@pytest.mark.asyncio
+async def test_no_hedging_while_the_provider_is_slow():
+    guard = ProviderGuard("test", CircuitBreaker(slow_call_seconds=0.05, min_calls=100),
+                          timeout=2.0, hedge_max_rate=1.0, hedge_min_samples=5)
+    guard.latencies.extend([0.01] * 5)
+    attempts = []
+
+    async def slow():
+        attempts.append(1)
+        await asyncio.sleep(0.1)
+        return "ok"
+
+    await guard.call(slow)
+    assert guard.hedges == 1 and guard.breaker.slow_rate() == 1.0
+
+    await guard.call(slow)
+    assert guard.hedges == 1 and len(attempts) == 3
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_serves_last_known_results():
+    cache = SearchCache(ttl=0.05, fallback_ttl=60)
+    guard = ProviderGuard("test", CircuitBreaker(min_calls=1, open_seconds=60), hedge=False)
+    service = FlightService(cache=cache, guard=guard)
+    service.use_mock = False
+    outcomes = [{"status": "success", "flights": ["JFK-LAX"]}]
+
+    async def provider(*key):
+        if not outcomes:
+            raise httpx.ConnectError("provider down")
+        return outcomes.pop()
+
+    service._search_provider = provider
+    assert (await service.search_flights("JFK", "LAX", "2025-06-15"))["flights"] == ["JFK-LAX"]
+    await asyncio.sleep(0.06)
+
+    results = await service.search_flights("JFK", "LAX", "2025-06-15")
+    assert results["degraded"] and results["cache"]["status"] == "fallback"
+    assert results["flights"] == ["JFK-LAX"]
+    assert guard.breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_caller_errors_do_not_open_the_breaker():
+    guard = ProviderGuard("test", CircuitBreaker(min_calls=2), hedge=False)
+    service = FlightService(cache=SearchCache(ttl=60), guard=guard)
+    service.use_mock = False
+    searched = []
+
+    async def provider(*key):
+        searched.append(key)
+        raise _status_error(400)
+
+    service._search_provider = provider
+    for _ in range(5):
+        result = await service.search_flights("JFK", "LAX", "June 5")
+        assert result["status"] == "error" and "June 5" in result["message"]
+    assert searched == []  # rejected before reaching the provider
+
+    for _ in range(5):
+        await service.search_flights("JFK", "LAX", "2025-06-05")
+    assert len(searched) == 5
+    assert guard.breaker.state == "closed" and guard.breaker.stats()["recent_calls"] == 0
+    assert guard.caller_errors == 5
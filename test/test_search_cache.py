@@ -0,0 +1,110 @@
+"""
+Test the provider search cache
+"""
+import asyncio
+import time
+import pytest
+from app.services.flight_service import FlightService
+from app.services.hotel_service import HotelService
+from app.services.search_cache import SearchCache
+
+
+def _service(cache):
+    calls = []
+
+    async def provider(*key):
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return {"status": "success", "flights": [], "key": list(key)}
+
+    service = FlightService(cache=cache)
+    service.use_mock = False
+    service._search_provider = provider
+    return service, calls
+
+
+@pytest.mark.asyncio
+async def test_identical_searches_share_one_provider_call():
+    service, calls = _service(SearchCache(ttl=60))
+
+    results = await asyncio.gather(*[
+        service.search_flights("jfk", "LAX", "2025-06-15"),
+        service.search_flights(" JFK", "lax ", "2025-06-15T08:00:00"),
+        service.search_flights("JFK", "LAX", "2025-06-15", cabin_class="Economy")
+    ])
+    await service.search_flights("JFK", "LAX", "2025-06-15")
+    await service.search_flights("JFK", "LAX", "2025-06-15", adults=2)
+
+    assert len(calls) == 2
+    assert results[0] is results[1] is results[2]
+    assert service.cache.stats()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_failures_are_not_cached():
+    service, calls = _service(SearchCache(ttl=0.01))
+    await service.search_flights("JFK", "LAX", "2025-06-15")
+    await asyncio.sleep(0.02)
+    await service.search_flights("JFK", "LAX", "2025-06-15")
+    assert len(calls) == 2
+
+    cache = SearchCache(ttl=60)
+    attempts = []
+
+    async def failing():
+        attempts.append(1)
+        raise RuntimeError("429")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch("key", failing)
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_shared_call():
+    cache = SearchCache(ttl=60)
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    first = asyncio.ensure_future(cache.get_or_fetch("key", fetch))
+    second = asyncio.ensure_future(cache.get_or_fetch("key", fetch))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "result"
+    assert cache.get("key") == (True, "result")
+
+
+@pytest.mark.asyncio
+async def test_stale_hotel_results_are_served_while_refreshing():
+    service = HotelService(cache=SearchCache(ttl=0.05, hard_ttl=0.3))
+    service.use_mock = False
+    versions = []
+
+    async def provider(*key):
+        versions.append(len(versions) + 1)
+        await asyncio.sleep(0.05)
+        return {"status": "success", "version": versions[-1]}
+
+    service._search_provider = provider
+
+    first = await service.search_hotels("Lisbon", "2025-06-15", "2025-06-18")
+    fresh = await service.search_hotels("Lisbon", "2025-06-15", "2025-06-18")
+    await asyncio.sleep(0.06)
+    started = time.perf_counter()
+    stale = await service.search_hotels("Lisbon", "2025-06-15", "2025-06-18")
+    assert time.perf_counter() - started < 0.02
+    await asyncio.sleep(0.06)
+    refreshed = await service.search_hotels("Lisbon", "2025-06-15", "2025-06-18")
+
+    assert (first["cache"]["status"], first["version"]) == ("miss", 1)
+    assert (fresh["cache"]["status"], fresh["version"]) == ("fresh", 1)
+    assert (stale["cache"]["status"], stale["version"]) == ("stale", 1)
+    assert (refreshed["cache"]["status"], refreshed["version"]) == ("fresh", 2)
+
+    await asyncio.sleep(0.35)
+    expired = await service.search_hotels("Lisbon", "2025-06-15", "2025-06-18")
+    assert (expired["cache"]["status"], expired["version"]) == ("miss", 3)
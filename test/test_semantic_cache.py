@@ -0,0 +1,107 @@
+"""
+Test semantic prompt cache
+"""
+import json
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from app.services.enhanced_travel_service import EnhancedTravelService
+from app.services.llm_cache import LLMResponseCache
+from app.services.openai_service import OpenAIService
+from app.services.semantic_cache import SemanticCache
+
+
+def test_paraphrase_hits_and_numbers_must_match():
+    cache = SemanticCache(max_entries=16)
+    cache.add("5 days in Tokyo under $2000", "tokyo-5")
+    cache.add("3 days in Paris under $1000", "paris-3")
+
+    assert cache.lookup("Tokyo, five days, max $2k") == "tokyo-5"
+    assert cache.lookup("6 days in Tokyo under $2000") is None
+    assert cache.lookup("5 days in Paris under $2000") is None
+
+
+def test_scope_and_ring_buffer():
+    cache = SemanticCache(max_entries=2)
+    cache.add("weekend in Rome", "rome", scope="model-a")
+    assert cache.lookup("weekend in Rome", scope="model-b") is None
+
+    cache.add("weekend in Oslo", "oslo", scope="model-a")
+    cache.add("weekend in Lima", "lima", scope="model-a")
+    assert len(cache) == 2
+    assert cache.lookup("weekend in Rome", scope="model-a") is None
+    assert cache.lookup("weekend in Lima", scope="model-a") == "lima"
+
+
+class FakeClient:
+    """Counts completions; answers with the prompt's first line"""
+
+    def __init__(self):
+        self.prompts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, temperature, **kwargs):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        answer = prompt.strip().split("\n")[0]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=answer))])
+
+
+def _openai(client):
+    return OpenAIService(client=client, cache=LLMResponseCache(), semantic_cache=SemanticCache(max_entries=64))
+
+
+async def _plan_skeleton(service, destination, days=7, budget=3000, preferences=None):
+    travel = EnhancedTravelService.__new__(EnhancedTravelService)
+    context = travel._build_context(destination, days, budget, preferences or {"activities": ["museums"]},
+                                    (datetime(2025, 6, 1),))
+    key, scope = travel._semantic_request(context)
+    await service.structured_response(travel._build_skeleton_prompt(context), semantic_key=key, semantic_scope=scope)
+
+
+@pytest.mark.asyncio
+async def test_full_template_prompts_for_different_destinations_miss():
+    client = FakeClient()
+    service = _openai(client)
+
+    for destination in ("Tokyo", "Paris", "Rome", "Lisbon"):
+        await _plan_skeleton(service, destination)
+    assert len(client.prompts) == 4
+
+    # Same request, reworded in the user's fields only: reused
+    await _plan_skeleton(service, "tokyo")
+    assert len(client.prompts) == 4
+
+
+@pytest.mark.asyncio
+async def test_style_and_activities_must_match_exactly():
+    client = FakeClient()
+    service = _openai(client)
+
+    await _plan_skeleton(service, "Rome", preferences={"travel_style": ["luxury"], "activities": ["museums"]})
+    await _plan_skeleton(service, "Rome", preferences={"travel_style": ["budget"], "activities": ["museums"]})
+    await _plan_skeleton(service, "Rome", preferences={"travel_style": ["luxury"],
+                                                       "activities": ["museums", "hiking"]})
+    assert len(client.prompts) == 3
+
+    await _plan_skeleton(service, "rome", preferences={"travel_style": ["Luxury"],
+                                                       "activities": ["hiking", "museums"]})
+    assert len(client.prompts) == 3
+
+
+def test_trip_words_are_not_stopwords():
+    words, _ = SemanticCache().vectorizer.tokens("budget trip plan")
+    assert words == ["budget", "trip", "plan"]
+
+
+@pytest.mark.asyncio
+async def test_sentiment_prompts_skip_the_semantic_tier():
+    client = FakeClient()
+    service = _openai(client)
+    texts = ["Book flight Madrid", "Cancel my flight to Paris", "Book hotel Rome", "Cancel the hotel in Rome"]
+
+    results = [await service.analyze_sentiment_batch([text]) for text in texts]
+
+    assert len(client.prompts) == 4
+    assert len(service.semantic_cache) == 0
+    assert len({json.dumps(r, sort_keys=True) for r in results}) == 4
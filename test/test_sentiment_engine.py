@@ -0,0 +1,52 @@
+"""
+Test in-process sentiment engine
+"""
+import asyncio
+import pytest
+from app.core.config import settings
+from app.services.ai_service import AIService
+from app.services.openai_service import OpenAIService
+from app.services.sentiment_engine import SentimentEngine
+
+
+def test_negation_and_urgency():
+    engine = SentimentEngine()
+    results = engine.score_batch([
+        "I love this hotel, it's amazing",
+        "The flight was not good",
+        "My flight got cancelled and I'm stuck, need help ASAP!",
+        "I want to go to Paris"
+    ])
+
+    assert [r["sentiment"] for r in results] == ["positive", "negative", "negative", "neutral"]
+    assert results[2]["urgency"] == "high"
+    assert results[0]["urgency"] == "low"
+
+
+def test_mixed_signals_have_low_confidence():
+    engine = SentimentEngine()
+    mixed = engine.score("Great location but really dirty room")
+    clear = engine.score("Great location and a really clean room")
+
+    assert mixed["confidence"] < clear["confidence"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_single_texts_share_one_llm_batch(monkeypatch):
+    monkeypatch.setattr(settings, "sentiment_llm_threshold", 1.01)  # send everything to the LLM
+    batches = []
+
+    async def analyze_batch(texts):
+        batches.append(list(texts))
+        return [{"sentiment": "neutral", "urgency": "low", "intent": "inquire"} for _ in texts]
+
+    openai = OpenAIService(client=object())
+    openai.analyze_sentiment_batch = analyze_batch
+    service = AIService()
+    service._openai_service = openai
+
+    texts = ["Flights to Rome?", "Is breakfast included?", "Can I change my dates?", "Any pool?"]
+    results = await asyncio.gather(*(service.analyze_sentiment(text) for text in texts))
+
+    assert batches == [texts]
+    assert all(r["source"] == "llm" for r in results)
@@ -0,0 +1,122 @@
+"""
+Test the agent step graph executor
+"""
+import asyncio
+import time
+import pytest
+from app.agents.step_graph import Checkpoint, Step, StepGraph, StepTimeout, wait_for_background
+
+
+async def _after(delay, value):
+    await asyncio.sleep(delay)
+    return value
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently():
+    graph = StepGraph([
+        Step("a", lambda: _after(0.1, 1)),
+        Step("b", lambda: _after(0.1, 2)),
+        Step("sum", lambda a, b: _after(0, a + b), after=("a", "b")),
+    ])
+
+    started = time.perf_counter()
+    results = await graph.run()
+
+    assert results["sum"] == 3
+    assert time.perf_counter() - started < 0.18
+
+
+@pytest.mark.asyncio
+async def test_optional_step_timeout_passes_default_on():
+    graph = StepGraph([
+        Step("slow", lambda: _after(1, "late"), timeout=0.05, optional=True, default="fallback"),
+        Step("use", lambda slow: _after(0, slow.upper()), after=("slow",)),
+    ])
+
+    results = await graph.run()
+
+    assert results["use"] == "FALLBACK"
+    assert "slow" in graph.skipped
+
+
+@pytest.mark.asyncio
+async def test_required_failure_cancels_the_rest():
+    cancelled = asyncio.Event()
+
+    async def long_running():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    graph = StepGraph([
+        Step("slow", lambda: _after(1, None), timeout=0.05),
+        Step("other", long_running),
+    ])
+
+    with pytest.raises(StepTimeout):
+        await graph.run()
+    await asyncio.sleep(0)
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_background_step_is_not_awaited():
+    written = []
+
+    async def write(value):
+        await asyncio.sleep(0.1)
+        written.append(value)
+
+    graph = StepGraph([
+        Step("value", lambda: _after(0, 42)),
+        Step("write", write, after=("value",), background=True),
+    ])
+
+    await graph.run()
+    assert written == []
+
+    await wait_for_background()
+    assert written == [42]
+
+
+@pytest.mark.asyncio
+async def test_rerun_resumes_from_checkpoint():
+    calls = []
+    fail = {"book": True}
+
+    async def step(name, value):
+        calls.append(name)
+        if fail.get(name):
+            raise RuntimeError(f"{name} failed")
+        return value
+
+    def steps():
+        return [
+            Step("understand", lambda: step("understand", {"destination": "Rome"})),
+            Step("plan", lambda understand: step("plan", [understand["destination"]]), after=("understand",)),
+            Step("book", lambda plan: step("book", "booked"), after=("plan",)),
+        ]
+
+    checkpoint = Checkpoint()
+    with pytest.raises(RuntimeError):
+        await StepGraph(steps(), checkpoint=checkpoint).run()
+    assert set(checkpoint.completed) == {"understand", "plan"}
+
+    fail["book"] = False
+    calls.clear()
+    graph = StepGraph(steps(), checkpoint=checkpoint)
+    results = await graph.run()
+
+    assert calls == ["book"]
+    assert graph.resumed == ["understand", "plan"]
+    assert results["plan"] == ["Rome"]
+
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    with pytest.raises(ValueError):
+        StepGraph([Step("a", _after, after=("b",)), Step("b", _after, after=("a",))])
+    with pytest.raises(ValueError):
+        StepGraph([Step("a", _after, after=("missing",))])
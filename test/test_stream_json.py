@@ -0,0 +1,26 @@
+"""
+Test incremental JSON parser
+"""
+import json
+from app.services.stream_json import IncrementalJSONParser, parse_json_response
+
+
+def test_days_are_emitted_as_they_close():
+    doc = {"daily_itinerary": [{"day": 1, "note": "a, {b}"}, {"day": 2}], "tips": ["x"]}
+    text = "Here you go:\n```json\n" + json.dumps(doc) + "\n```"
+
+    parser = IncrementalJSONParser()
+    events = []
+    for i in range(0, len(text), 3):
+        events.extend(parser.feed(text[i:i + 3]))
+
+    days = [e.value for e in events if e.kind == "item" and e.key == "daily_itinerary"]
+    assert days == doc["daily_itinerary"]
+    assert parser.close() == doc
+
+
+def test_truncated_output_is_repaired():
+    assert parse_json_response('{"a": [1, 2, {"b": "hel') == {"a": [1, 2, {"b": "hel"}]}
+    assert parse_json_response('{"a": 1, "b": tr') == {"a": 1}
+    assert parse_json_response('{"a": [1, 2,], }') == {"a": [1, 2]}
+    assert parse_json_response("no json here") is None
@@ -0,0 +1,125 @@
+"""
+Test checkpointed task execution and the retry endpoint
+"""
+from types import SimpleNamespace
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.agents.step_graph import Step, StepGraph
+from app.api.endpoints import task as task_endpoints
+from app.core.database import Base
+from app.core.dependencies import get_current_user
+from app.models import user  # noqa: F401  (tasks reference users)
+from app.models.task import Task, TaskStatus
+from app.schemas.task import TaskCreate
+from app.services import task_service
+from app.services.task_service import TaskCheckpoint, TaskService
+
+
+class FlakyAgent:
+    """Two steps; the second fails until `fail` is cleared"""
+
+    def __init__(self):
+        self.checkpoint = None
+        self.calls = []
+        self.fail = True
+
+    async def execute(self, task):
+        async def understand():
+            self.calls.append("understand")
+            return {"destination": task["destination"]}
+
+        async def plan(understand):
+            self.calls.append("plan")
+            if self.fail:
+                raise RuntimeError("LLM timed out")
+            return {"days": 3, **understand}
+
+        graph = StepGraph([Step("understand", understand), Step("plan", plan, after=("understand",))],
+                          checkpoint=self.checkpoint)
+        try:
+            await graph.run()
+        except RuntimeError as e:
+            return {"status": "error", "error": str(e)}
+        return {"status": "success", "plan": graph.results["plan"]}
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(task_service, "SessionLocal", sessionmaker(bind=engine))
+    agent = FlakyAgent()
+    monkeypatch.setattr(TaskService, "_agent_for", lambda self, task_type: agent)
+    return agent
+
+
+async def _create(service):
+    return await service.create_task(TaskCreate(task_type="travel", description="Rome",
+                                                input_data={"destination": "Rome"}))
+
+
+@pytest.mark.asyncio
+async def test_failed_task_resumes_after_completed_steps(agent):
+    service = TaskService(user_id=1)
+    task_id = await _create(service)
+
+    await service.process_task(task_id)
+    failed = await service.get_task(task_id)
+    assert failed["status"] == "failed" and failed["error_message"] == "LLM timed out"
+    assert failed["result_data"]["checkpoints"] == {"understand": {"destination": "Rome"}}
+    assert 0 < failed["progress"] < 100
+
+    agent.fail = False
+    await service.process_task(task_id)
+    done = await service.get_task(task_id)
+    assert done["status"] == "completed" and done["progress"] == 100
+    assert done["result_data"]["result"]["plan"] == {"days": 3, "destination": "Rome"}
+    assert agent.calls == ["understand", "plan", "plan"]  # understand came from the checkpoint
+
+    # Completed tasks are not run again
+    await service.process_task(task_id)
+    assert len(agent.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_unserializable_results_are_not_checkpointed(agent):
+    task_id = await _create(TaskService(user_id=1))
+    checkpoint = TaskCheckpoint(task_id)
+    await checkpoint.save("raw", object(), 50)
+    await checkpoint.save("ok", [1, 2], 60)
+
+    assert TaskCheckpoint.load(task_id).completed == {"ok": [1, 2]}
+
+
+def test_retry_endpoint(agent):
+    app = FastAPI()
+    app.include_router(task_endpoints.router, prefix="/tasks")
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    client = TestClient(app)
+
+    created = client.post("/tasks/", json={"task_type": "travel", "description": "Rome",
+                                           "input_data": {"destination": "Rome"}})
+    assert created.status_code == 200
+    task_id = created.json()["id"]
+    assert client.get(f"/tasks/{task_id}").json()["status"] == "failed"
+
+    agent.fail = False
+    retried = client.post(f"/tasks/{task_id}/retry")
+    assert retried.status_code == 200
+    assert retried.json()["status"] == "pending" and retried.json()["error_message"] is None
+    # The background run resumed and finished
+    assert client.get(f"/tasks/{task_id}").json()["status"] == "completed"
+    assert agent.calls == ["understand", "plan", "plan"]
+
+    assert client.post(f"/tasks/{task_id}/retry").status_code == 409
+    assert client.post("/tasks/999/retry").status_code == 404
+
+    db = task_service.SessionLocal()
+    db.query(Task).filter(Task.id == task_id).update({"status": TaskStatus.PROCESSING})
+    db.commit()
+    db.close()
+    assert client.post(f"/tasks/{task_id}/retry").status_code == 409
@@ -0,0 +1,72 @@
+"""
+Test the agent tool-calling runtime
+"""
+import asyncio
+import json
+import time
+import pytest
+from app.agents.tools import Tool, ToolRegistry, ToolResultCache
+
+PARAMS = {"type": "object", "properties": {"city": {"type": "string"}}}
+
+
+def _call(call_id, name, **arguments):
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+
+
+def _registry(**tools):
+    registry = ToolRegistry(cache=ToolResultCache())
+    for name, (func, kwargs) in tools.items():
+        registry.register(Tool(name, name, PARAMS, func, **kwargs))
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_calls_in_one_turn_run_concurrently():
+    async def slow(city):
+        await asyncio.sleep(0.1)
+        return {"city": city}
+
+    registry = _registry(flights=(slow, {}), hotels=(slow, {}))
+    started = time.perf_counter()
+    messages = await registry.run_calls([_call("a", "flights", city="Rome"), _call("b", "hotels", city="Oslo")])
+
+    assert time.perf_counter() - started < 0.18
+    assert [m["tool_call_id"] for m in messages] == ["a", "b"]
+    assert json.loads(messages[1]["content"]) == {"city": "Oslo"}
+
+
+@pytest.mark.asyncio
+async def test_timeouts_and_errors_are_returned_to_the_model():
+    async def hang(city):
+        await asyncio.sleep(5)
+
+    async def broken(city):
+        raise RuntimeError("upstream down")
+
+    registry = _registry(hang=(hang, {"timeout": 0.05}), broken=(broken, {}))
+    messages = await registry.run_calls([
+        _call("a", "hang", city="Rome"), _call("b", "broken", city="Rome"), _call("c", "missing")
+    ])
+
+    errors = [json.loads(m["content"])["error"] for m in messages]
+    assert "timed out" in errors[0]
+    assert "upstream down" in errors[1]
+    assert "Unknown tool" in errors[2]
+
+
+@pytest.mark.asyncio
+async def test_cacheable_results_are_reused_and_coalesced():
+    calls = []
+
+    async def search(city):
+        calls.append(city)
+        await asyncio.sleep(0.05)
+        return {"city": city}
+
+    registry = _registry(search=(search, {"cache_ttl": 60}))
+    await asyncio.gather(registry.call("search", {"city": "Rome"}), registry.call("search", '{"city": "Rome"}'))
+    await registry.call("search", {"city": "Rome"})
+    await registry.call("search", {"city": "Oslo"})
+
+    assert calls == ["Rome", "Oslo"]
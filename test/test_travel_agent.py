@@ -21,4 +21,28 @@ async def test_travel_planning():
     assert result["status"] in ["success", "error"]
     if result["status"] == "success":
         assert "itinerary" in result
-        assert "bookings" in result
\ No newline at end of file
+        assert "bookings" in result
+
+@pytest.mark.asyncio
+async def test_bookings_keep_the_search_that_succeeded():
+    """One failed search is reported next to the one that worked"""
+    agent = TravelAgent(user_id=1)
+
+    async def search_flights(**kwargs):
+        return [{"flight": "AF123"}]
+
+    async def search_hotels(**kwargs):
+        raise RuntimeError("hotel provider down")
+
+    agent.travel_service.search_flights = search_flights
+    agent.travel_service.search_hotels = search_hotels
+
+    bookings = await agent._book_components({
+        "flights": True, "accommodation": True,
+        "origin": "NYC", "destination": "Paris", "dates": {"start": "2024-06-01"}
+    })
+
+    assert bookings == [
+        {"type": "flight", "status": "ok", "data": [{"flight": "AF123"}]},
+        {"type": "hotel", "status": "error", "error": "hotel provider down"},
+    ]
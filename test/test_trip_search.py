@@ -0,0 +1,115 @@
+"""
+Test the combined trip search
+"""
+import asyncio
+import threading
+import time
+import pytest
+from app.services import travel_service
+from app.services.travel_service import TravelService
+from app.services.trip_search import TripSearch
+
+
+class _Slow:
+    def __init__(self, delay, result=None, error=None):
+        self.delay, self.result, self.error = delay, result, error
+        self.calls = []
+
+    async def __call__(self, *args, **kwargs):
+        self.calls.append(args)
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class _Flights:
+    search_flights = _Slow(0.15, {"flights": ["FL001"]})
+
+
+class _Hotels:
+    search_hotels = _Slow(0.05, {"hotels": ["HT001"]})
+
+
+class _Travel:
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.saved = []
+
+    def plan_trip(self, destination, days, user_id=None, cancelled=None):
+        time.sleep(self.delay)
+        if not cancelled.is_set():
+            self.saved.append(destination)
+        return {"destination": destination, "days": days}
+
+
+@pytest.mark.asyncio
+async def test_sections_arrive_as_each_source_finishes():
+    search = TripSearch(flights=_Flights(), hotels=_Hotels(), travel=_Travel())
+    started = time.perf_counter()
+    arrivals = []
+    async for section in search.stream("Tokyo", "2025-06-15", "2025-06-19", origin="Heathrow"):
+        arrivals.append((section["source"], time.perf_counter() - started))
+
+    assert [source for source, _ in arrivals] == ["hotels", "plan", "flights"]
+    assert arrivals[0][1] < 0.09
+    assert arrivals[-1][1] < 0.25  # the slowest source, not the sum
+    assert _Flights.search_flights.calls[-1][:2] == ("LHR", "HND")
+
+
+@pytest.mark.asyncio
+async def test_slow_or_failing_sources_do_not_hold_up_the_rest():
+    hotels = type("Hotels", (), {"search_hotels": _Slow(0.01, error=RuntimeError("upstream 503"))})()
+    search = TripSearch(flights=_Flights(), hotels=hotels, travel=_Travel())
+
+    sections = {s["source"]: s async for s in search.stream(
+        "Paris", "2025-06-15", "2025-06-17", origin="JFK", budgets={"flights": 0.05}
+    )}
+
+    assert sections["hotels"]["status"] == "error" and "503" in sections["hotels"]["error"]
+    assert sections["flights"]["status"] == "timeout"
+    assert sections["plan"]["status"] == "ok" and sections["plan"]["data"]["days"] == 2
+
+
+@pytest.mark.asyncio
+async def test_timed_out_plan_is_not_saved(monkeypatch):
+    travel = _Travel(delay=0.15)
+    search = TripSearch(flights=_Flights(), hotels=_Hotels(), travel=travel)
+
+    sections = {s["source"]: s async for s in search.stream(
+        "Rome", "2025-06-15", "2025-06-17", budgets={"plan": 0.05}
+    )}
+    await asyncio.sleep(0.2)  # let the worker thread finish
+
+    assert sections["plan"]["status"] == "timeout"
+    assert travel.saved == []
+
+    # TravelService itself skips the database write once told to
+    monkeypatch.setattr(travel_service, "SessionLocal", lambda: pytest.fail("trip was saved"))
+    cancelled = threading.Event()
+    cancelled.set()
+    assert TravelService().plan_trip("Rome", 2, cancelled=cancelled)["saved"] is False
+
+
+@pytest.mark.asyncio
+async def test_three_letter_city_is_not_taken_for_a_code():
+    flights = type("Flights", (), {"search_flights": _Slow(0, {"flights": []})})()
+    search = TripSearch(flights=flights, hotels=_Hotels(), travel=_Travel(delay=0))
+
+    [_ async for _ in search.stream("Rio", "2025-06-15", "2025-06-17", origin="jfk")]
+
+    assert flights.search_flights.calls[-1][:2] == ("JFK", "GIG")
+
+
+@pytest.mark.asyncio
+async def test_flight_error_payload_is_an_error_section():
+    flights = type("Flights", (), {"search_flights": _Slow(0, {"status": "error", "message": "bad date"})})()
+    search = TripSearch(flights=flights, hotels=_Hotels(), travel=_Travel(delay=0))
+
+    sections = {s["source"]: s async for s in search.stream(
+        "Paris", "2025-06-15", "2025-06-17", origin="JFK"
+    )}
+
+    assert sections["flights"]["status"] == "error" and sections["flights"]["error"] == "bad date"
+    assert "data" not in sections["flights"]
+    assert sections["hotels"]["status"] == "ok"